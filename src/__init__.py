@@ -1,4 +1,10 @@
-from .core import describe, mean, median, mode, data_range 
+from .core import (
+    describe, describe_partial, mean, median, mode, data_range,
+    StreamingStats, OrderStatistics,
+)
 
-__all__ = ["describe", "mean", "median", "mode", "data_range"]
-__version__ = "0.1.0"
\ No newline at end of file
+__all__ = [
+    "describe", "describe_partial", "mean", "median", "mode", "data_range",
+    "StreamingStats", "OrderStatistics",
+]
+__version__ = "0.1.0"
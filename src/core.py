@@ -1,4 +1,9 @@
 import statistics as _stats
+import math
+from bisect import bisect_right
+from collections import Counter, deque
+from itertools import compress, islice
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
 def mean(values):
     return _stats.mean(values)
@@ -12,16 +17,407 @@ def mode(values):
 def data_range(values): 
     return max(values) - min(values)
 
+# ---------------New: sort-once order statistics----------------------------
+class OrderStatistics:
+    """Sorts a column once and reads median, mode, range and quantiles from it.
+
+    Mode is found by run-length counting over the sorted values (jumping from
+    one distinct value to the next with bisect), so ties go to the smallest value.
+    Unsorted input is copied; pass presorted=True to reuse a sorted list.
+    """
+
+    def __init__(self, values: Iterable, presorted: bool = False) -> None:
+        # The caller's list is only used as-is when it is already sorted
+        vals = values if presorted and isinstance(values, list) else sorted(values)
+        self.values: List = vals
+        self.count = len(vals)
+
+    def minimum(self):
+        return self.values[0] if self.count else None
+
+    def maximum(self):
+        return self.values[-1] if self.count else None
+
+    def data_range(self):
+        return self.values[-1] - self.values[0] if self.count else None
+
+    def median(self):
+        if not self.count:
+            return None
+        mid = self.count // 2
+        if self.count % 2:
+            return self.values[mid]
+        return (self.values[mid - 1] + self.values[mid]) / 2
+
+    def quantile(self, q: float):
+        """Linearly interpolated quantile, 0 <= q <= 1"""
+        if not self.count:
+            return None
+        if not 0.0 <= q <= 1.0:
+            raise ValueError("quantile must be between 0 and 1")
+        pos = q * (self.count - 1)
+        lo = math.floor(pos)
+        frac = pos - lo
+        if frac == 0:
+            return self.values[lo]
+        return self.values[lo] + (self.values[lo + 1] - self.values[lo]) * frac
+
+    def mode(self):
+        vals = self.values
+        best, best_n = None, 0
+        i = 0
+        while i < self.count:
+            j = bisect_right(vals, vals[i], i)
+            if j - i > best_n:
+                best, best_n = vals[i], j - i
+            i = j
+        return best
+
+
+# ---------------New: streaming accumulator----------------------------
+class StreamingStats:
+    """Single-pass, mergeable summary of a stream of numbers.
+
+    Moments use Welford's online update (merged with Chan's formula), and the
+    order statistics come from an exact frequency table. Only count, mean,
+    variance and range are O(1) in memory; median, mode and quantiles keep
+    one counter per *distinct* value, which is small for weather readings
+    but unbounded in general. For a constant-memory summary use
+    sketches.ColumnSketch, which answers median and mode approximately.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self.minimum: Optional[float] = None
+        self.maximum: Optional[float] = None
+        # Counter keeps first-seen order, which is what statistics.mode uses for ties
+        self._freq: Counter = Counter()
+
+    def update(self, x) -> "StreamingStats":
+        self.count += 1
+        delta = x - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (x - self._mean)
+        if self.minimum is None or x < self.minimum:
+            self.minimum = x
+        if self.maximum is None or x > self.maximum:
+            self.maximum = x
+        self._freq[x] += 1
+        return self
+
+    def update_many(self, values: Iterable) -> "StreamingStats":
+        """Add a batch at once: moments and counts are taken over the whole batch, then merged"""
+        vals = values if isinstance(values, list) else list(values)
+        if not vals:
+            return self
+        batch = StreamingStats()
+        batch.count = len(vals)
+        batch._mean = math.fsum(vals) / batch.count
+        batch._m2 = math.fsum((x - batch._mean) ** 2 for x in vals)
+        batch.minimum = min(vals)
+        batch.maximum = max(vals)
+        batch._freq = Counter(vals)
+        return self.merge(batch)
+
+    def merge(self, other: "StreamingStats") -> "StreamingStats":
+        """Fold another partial summary into this one (in place)"""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self._mean, self._m2 = other.count, other._mean, other._m2
+            self.minimum, self.maximum = other.minimum, other.maximum
+            self._freq = Counter(other._freq)
+            return self
+        n = self.count + other.count
+        delta = other._mean - self._mean
+        self._mean += delta * other.count / n
+        self._m2 += other._m2 + delta * delta * self.count * other.count / n
+        self.count = n
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self._freq.update(other._freq)
+        return self
+
+    # --------------- Results ------------------------------
+    def mean(self) -> Optional[float]:
+        return self._mean if self.count else None
+
+    def variance(self) -> Optional[float]:
+        """Sample variance (same as statistics.variance)"""
+        return self._m2 / (self.count - 1) if self.count > 1 else None
+
+    def stdev(self) -> Optional[float]:
+        var = self.variance()
+        return math.sqrt(var) if var is not None else None
+
+    def data_range(self) -> Optional[float]:
+        return self.maximum - self.minimum if self.count else None
+
+    def mode(self, ties: str = "first") -> Optional[float]:
+        """Most common value; ties go to the first seen (like statistics.mode) or the smallest"""
+        if not self.count:
+            return None
+        if ties == "smallest":
+            top = max(self._freq.values())
+            return min(v for v, c in self._freq.items() if c == top)
+        return self._freq.most_common(1)[0][0]
+
+    def _kth_pair(self, k: int):
+        """Values at sorted positions k and k+1 (0-based), walking the table once"""
+        first = None
+        seen = 0
+        for value in sorted(self._freq):
+            seen += self._freq[value]
+            if first is None and seen > k:
+                first = value
+            if seen > k + 1:
+                return first, value
+        return first, first
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Linearly interpolated quantile, 0 <= q <= 1"""
+        if not self.count:
+            return None
+        if not 0.0 <= q <= 1.0:
+            raise ValueError("quantile must be between 0 and 1")
+        pos = q * (self.count - 1)
+        lo = math.floor(pos)
+        low_val, high_val = self._kth_pair(lo)
+        frac = pos - lo
+        return low_val if frac == 0 else low_val + (high_val - low_val) * frac
+
+    def median(self) -> Optional[float]:
+        if not self.count:
+            return None
+        mid = self.count // 2
+        if self.count % 2:
+            return self._kth_pair(mid)[0]
+        low_val, high_val = self._kth_pair(mid - 1)
+        return (low_val + high_val) / 2
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            'mean': self.mean(),
+            'median': self.median(),
+            'mode': self.mode(),
+            'data_range': self.data_range(),
+            'count': self.count,
+        }
+
+    # --------------- Serializable partial state ------------------------------
+    def to_state(self) -> Dict[str, Any]:
+        """Plain-data snapshot so partial summaries can cross processes or files"""
+        return {
+            'count': self.count,
+            'mean': self._mean,
+            'm2': self._m2,
+            'min': self.minimum,
+            'max': self.maximum,
+            'freq': [[v, c] for v, c in self._freq.items()],
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "StreamingStats":
+        acc = cls()
+        acc.count = state['count']
+        acc._mean = state['mean']
+        acc._m2 = state['m2']
+        acc.minimum = state['min']
+        acc.maximum = state['max']
+        acc._freq = Counter({v: c for v, c in state['freq']})
+        return acc
+
+
+# ---------------New: pairwise co-moments----------------------------
+def _pair_moments(xs: List[float], ys: List[float]) -> List[float]:
+    n = len(xs)
+    mx = math.fsum(xs) / n
+    my = math.fsum(ys) / n
+    return [n, mx, my,
+            math.fsum((x - mx) ** 2 for x in xs),
+            math.fsum((y - my) ** 2 for y in ys),
+            math.fsum((x - mx) * (y - my) for x, y in zip(xs, ys))]
+
+
+class CoMoments:
+    """Single-pass, mergeable covariance and correlation of every pair of columns.
+
+    Missing values are handled pairwise: each pair (i, j) keeps its own count,
+    means, second moments and co-moment over the rows where both are present,
+    so a gap in one column does not discard rows for the others. Batches are
+    reduced with fsum and folded in with Chan's formula, like StreamingStats.
+    """
+
+    def __init__(self, columns: Sequence[Any]) -> None:
+        self.columns = list(columns)
+        k = len(self.columns)
+        # Upper triangle including the diagonal: [n, mean_i, mean_j, m2_i, m2_j, c_ij]
+        self._pairs: Dict[Tuple[int, int], List[float]] = {
+            (i, j): [0, 0.0, 0.0, 0.0, 0.0, 0.0] for i in range(k) for j in range(i, k)
+        }
+
+    def _fold(self, pair: Tuple[int, int], other: List[float]) -> None:
+        mine = self._pairs[pair]
+        na, nb = mine[0], other[0]
+        if nb == 0:
+            return
+        if na == 0:
+            self._pairs[pair] = list(other)
+            return
+        n = na + nb
+        dx = other[1] - mine[1]
+        dy = other[2] - mine[2]
+        w = na * nb / n
+        self._pairs[pair] = [n, mine[1] + dx * nb / n, mine[2] + dy * nb / n,
+                             mine[3] + other[3] + dx * dx * w,
+                             mine[4] + other[4] + dy * dy * w,
+                             mine[5] + other[5] + dx * dy * w]
+
+    def update_columns(self, batch: Sequence[Tuple[Sequence[float], Sequence[int]]]) -> "CoMoments":
+        """Add a batch of aligned rows given as one (values, nulls) pair per column, in column order"""
+        # Keep-masks only for columns that have gaps in this batch
+        masks = [[not m for m in nulls] if any(nulls) else None for _, nulls in batch]
+        for (i, j) in self._pairs:
+            xs, ys = batch[i][0], batch[j][0]
+            mi, mj = masks[i], masks[j]
+            if mi is None and mj is None:
+                xs, ys = list(xs), list(ys)
+            else:
+                keep = mi if mj is None else mj if mi is None else [a and b for a, b in zip(mi, mj)]
+                xs, ys = list(compress(xs, keep)), list(compress(ys, keep))
+            if xs:
+                self._fold((i, j), _pair_moments(xs, ys))
+        return self
+
+    def merge(self, other: "CoMoments") -> "CoMoments":
+        """Fold another partial result over the same columns into this one (in place)"""
+        if other.columns != self.columns:
+            raise ValueError("cannot merge co-moments over different columns")
+        for pair, moments in other._pairs.items():
+            self._fold(pair, moments)
+        return self
+
+    # --------------- Results ------------------------------
+    def _pair(self, a: Any, b: Any) -> List[float]:
+        i, j = sorted((self.columns.index(a), self.columns.index(b)))
+        return self._pairs[(i, j)]
+
+    def count(self, a: Any, b: Any) -> int:
+        """Rows where both columns are present"""
+        return self._pair(a, b)[0]
+
+    def covariance(self, a: Any, b: Any) -> Optional[float]:
+        """Sample covariance over the rows where both are present (a == b gives the variance)"""
+        n, _, _, _, _, c = self._pair(a, b)
+        return c / (n - 1) if n > 1 else None
+
+    def correlation(self, a: Any, b: Any) -> Optional[float]:
+        """Pearson correlation over the rows where both are present; None if either is constant"""
+        n, _, _, m2x, m2y, c = self._pair(a, b)
+        if n < 2 or m2x <= 0 or m2y <= 0:
+            return None
+        return max(-1.0, min(1.0, c / math.sqrt(m2x * m2y)))
+
+    # --------------- Serializable partial state ------------------------------
+    def to_state(self) -> Dict[str, Any]:
+        return {'columns': self.columns, 'pairs': [[i, j] + list(m) for (i, j), m in self._pairs.items()]}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "CoMoments":
+        acc = cls(state['columns'])
+        for i, j, *moments in state['pairs']:
+            acc._pairs[(i, j)] = moments
+        return acc
+
+
+# ---------------New: sliding window----------------------------
+class RollingWindow:
+    """Count, sum, mean, min and max of the last `size` observations, each push O(1) amortized.
+
+    Missing observations (None) take a slot in the window but are not counted.
+    Min and max come from monotonic deques of (position, value); the running
+    sum is recomputed with fsum once per `size` evictions to stop drift.
+    """
+
+    def __init__(self, size: int) -> None:
+        if size < 1:
+            raise ValueError("window size must be at least 1")
+        self.size = size
+        self.count = 0
+        self.total = 0.0
+        self._seen = 0
+        self._evicted = 0
+        self._window: deque = deque()
+        self._mins: deque = deque()
+        self._maxs: deque = deque()
+
+    def push(self, x: Optional[float]) -> "RollingWindow":
+        i = self._seen
+        self._seen += 1
+        self._window.append(x)
+        if x is not None:
+            self.count += 1
+            self.total += x
+            while self._mins and self._mins[-1][1] >= x:
+                self._mins.pop()
+            self._mins.append((i, x))
+            while self._maxs and self._maxs[-1][1] <= x:
+                self._maxs.pop()
+            self._maxs.append((i, x))
+        if len(self._window) > self.size:
+            old = self._window.popleft()
+            if old is not None:
+                self.count -= 1
+                self.total -= old
+                self._evicted += 1
+                if self._evicted >= self.size:
+                    self._evicted = 0
+                    self.total = math.fsum(v for v in self._window if v is not None)
+            first = self._seen - self.size
+            for ends in (self._mins, self._maxs):
+                if ends and ends[0][0] < first:
+                    ends.popleft()
+        return self
+
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def minimum(self) -> Optional[float]:
+        return self._mins[0][1] if self._mins else None
+
+    def maximum(self) -> Optional[float]:
+        return self._maxs[0][1] if self._maxs else None
+
+    def data_range(self) -> Optional[float]:
+        return self._maxs[0][1] - self._mins[0][1] if self._mins else None
+
+
+# Values read from the input per update_many call in describe_partial
+DESCRIBE_BATCH = 8192
+
+def describe_partial(values: Iterable) -> StreamingStats:
+    """Summarize one chunk; merge the results with StreamingStats.merge.
+
+    The input is read in fixed-size batches, so only the distinct-value
+    table grows with it.
+    """
+    acc = StreamingStats()
+    it = iter(values)
+    while batch := list(islice(it, DESCRIBE_BATCH)):
+        acc.update_many(batch)
+    return acc
+
 # ---------------New----------------------------
-def describe(values):
+def describe(values, backend: str = "python"):
     # Added to describe to make it a one stop summary
-    vals = list(values)
-    if not vals:
-        return {'mean': None, 'median': None, 'mode': None, 'data_range': None, 'count': 0}
-    return {
-        'mean': mean(vals),
-        'median': median(vals),
-        'mode': mode(vals),
-        'data_range': data_range(vals),
-        'count': len(vals),
-    }
+    # Reads the input in fixed-size batches instead of materializing it
+    if backend == "numpy":
+        try:
+            from . import vector_backend
+        except ImportError:
+            import vector_backend
+        vector_backend.check_backend(backend)
+        return vector_backend.describe(values)
+    return describe_partial(values).describe()
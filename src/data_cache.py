@@ -0,0 +1,195 @@
+from pathlib import Path
+import hashlib, json, logging, mmap, os, struct, tempfile
+from array import array
+from typing import Any, Callable, Dict, Optional, Union
+
+log = logging.getLogger(__name__)
+
+try:
+    from .models import WeatherTable, NumericColumn, StringColumn
+except ImportError:
+    from models import WeatherTable, NumericColumn, StringColumn
+
+PathLike = Union[str, Path]
+
+MAGIC = b"WXTBL1\n"
+# Bytes hashed from each end of the source file for the content fingerprint
+SAMPLE_BYTES = 1 << 20
+
+
+def _sample_hash(path: Path, length: int) -> str:
+    """Hash of the first and last MiB of the first `length` bytes of path"""
+    h = hashlib.blake2b(digest_size=16)
+    with path.open("rb") as f:
+        h.update(f.read(min(SAMPLE_BYTES, length)))
+        if length > SAMPLE_BYTES:
+            f.seek(max(SAMPLE_BYTES, length - SAMPLE_BYTES))
+            h.update(f.read(length - f.tell()))
+    return h.hexdigest()
+
+
+def fingerprint(path: PathLike) -> Dict[str, Any]:
+    """Identity of a source file: path, size, mtime and a hash of its first and last MiB"""
+    path = Path(path).resolve()
+    st = path.stat()
+    return {"path": str(path), "size": st.st_size, "mtime_ns": st.st_mtime_ns, "hash": _sample_hash(path, st.st_size)}
+
+
+def prefix_fingerprint(path: PathLike, length: int) -> Dict[str, Any]:
+    """Identity of the first `length` bytes of a file, unchanged by appends after them"""
+    path = Path(path).resolve()
+    return {"path": str(path), "length": length, "hash": _sample_hash(path, length)}
+
+
+def _pad(n: int) -> int:
+    return (-n) % 8
+
+
+def _as_bytes(seq, typecode: str) -> bytes:
+    # arrays, bytearrays and memoryviews expose a buffer; anything else is packed
+    try:
+        return bytes(memoryview(seq).cast("B"))
+    except TypeError:
+        return array(typecode, seq).tobytes()
+
+
+class ParsedCache:
+    """On-disk cache of parsed WeatherTables, keyed by source file fingerprint.
+
+    Entries are a small JSON header followed by the raw column buffers, so a
+    hit is just an mmap: numeric columns come back as zero-copy memoryviews.
+    An entry whose source file changed is dropped and re-parsed, and the
+    directory is trimmed least-recently-used first to stay under max_bytes.
+    By default entries live in a .descstats_cache folder next to the CSV.
+    """
+
+    def __init__(self, cache_dir: Optional[PathLike] = None, max_bytes: int = 512 * 1024 * 1024) -> None:
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.max_bytes = max_bytes
+
+    def _entry_path(self, source: Path) -> Path:
+        source = source.resolve()
+        base = self.cache_dir if self.cache_dir is not None else source.parent / ".descstats_cache"
+        key = hashlib.sha1(str(source).encode("utf-8")).hexdigest()
+        return base / f"{key}.tbl"
+
+    # --------------- Reading ------------------------------
+    def load(self, source: PathLike) -> Optional[WeatherTable]:
+        """Memory-map the cached table for source, or None on a miss or stale entry"""
+        source = Path(source)
+        entry = self._entry_path(source)
+        if not entry.exists():
+            return None
+        try:
+            with entry.open("rb") as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            if mm[:len(MAGIC)] != MAGIC:
+                raise ValueError("not a table cache file")
+            (header_len,) = struct.unpack_from("<Q", mm, len(MAGIC))
+            start = len(MAGIC) + 8
+            header = json.loads(mm[start:start + header_len].decode("utf-8"))
+        except (OSError, ValueError, struct.error):
+            log.warning("Discarding unreadable cache entry %s", entry)
+            entry.unlink(missing_ok=True)
+            return None
+
+        if header["fingerprint"] != fingerprint(source):
+            log.info("Cache entry for %s is stale; re-parsing", source)
+            mm.close()
+            entry.unlink(missing_ok=True)
+            return None
+
+        view = memoryview(mm)
+        data = start + header_len + _pad(start + header_len)
+        columns = {}
+        for col in header["columns"]:
+            offset = data + col["offset"]
+            if col["kind"] == "numeric":
+                n_vals, n_nulls = col["sizes"]
+                values = view[offset:offset + n_vals].cast("d")
+                nulls = view[offset + n_vals + _pad(n_vals):offset + n_vals + _pad(n_vals) + n_nulls]
+                raw = {int(i): text for i, text in col["raw"]} if col.get("raw") else None
+                columns[col["name"]] = NumericColumn(values=values, nulls=nulls, raw=raw)
+            else:
+                (n_codes,) = col["sizes"]
+                codes = view[offset:offset + n_codes].cast("i")
+                columns[col["name"]] = StringColumn(categories=col["categories"], codes=codes)
+        os.utime(entry)  # mark as recently used for LRU eviction
+        log.info("Loaded %s from cache %s", source, entry)
+        return WeatherTable(columns)
+
+    # --------------- Writing ------------------------------
+    def store(self, source: PathLike, table: WeatherTable, source_fingerprint: Optional[Dict[str, Any]] = None) -> Path:
+        """Write table as the cache entry for source (fingerprint taken now unless given)"""
+        source = Path(source)
+        entry = self._entry_path(source)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+
+        columns, buffers, offset = [], [], 0
+        for name, col in table.columns.items():
+            if isinstance(col, NumericColumn):
+                parts = [_as_bytes(col.values, "d"), _as_bytes(col.nulls, "B")]
+                meta = {"name": name, "kind": "numeric", "offset": offset, "sizes": [len(p) for p in parts]}
+                if col.raw:
+                    # source text of the cells a number cannot render back ("10.0", "NA")
+                    meta["raw"] = sorted(col.raw.items())
+            else:
+                codes = _as_bytes(col.codes, "i")
+                parts = [codes]
+                meta = {"name": name, "kind": "text", "offset": offset, "sizes": [len(codes)], "categories": col.categories}
+            for p in parts:
+                buffers.append(p + b"\0" * _pad(len(p)))
+                offset += len(p) + _pad(len(p))
+            columns.append(meta)
+
+        header = json.dumps({"fingerprint": source_fingerprint or fingerprint(source), "n_rows": len(table), "columns": columns}).encode("utf-8")
+        start = len(MAGIC) + 8 + len(header)
+        tmp = None
+        try:
+            # A unique temp name per writer, so concurrent stores cannot clobber each other's file
+            with tempfile.NamedTemporaryFile(dir=entry.parent, prefix=entry.name + ".", suffix=".tmp", delete=False) as f:
+                tmp = Path(f.name)
+                f.write(MAGIC)
+                f.write(struct.pack("<Q", len(header)))
+                f.write(header)
+                f.write(b"\0" * _pad(start))
+                for b in buffers:
+                    f.write(b)
+            tmp.replace(entry)
+        except OSError:
+            log.exception("Failed to write cache entry %s", entry)
+            if tmp is not None:
+                tmp.unlink(missing_ok=True)
+            raise
+        self.evict(keep=entry)
+        return entry
+
+    def get_or_parse(self, source: PathLike, parse: Callable[[Path], WeatherTable]) -> WeatherTable:
+        """Cached table for source, calling parse(source) and storing the result on a miss"""
+        table = self.load(source)
+        if table is not None:
+            return table
+        # Fingerprint before parsing so a file changed mid-parse is not cached as current
+        fp = fingerprint(source)
+        table = parse(Path(source))
+        try:
+            self.store(source, table, fp)
+        except OSError:
+            pass  # a cache that cannot be written should not fail the run
+        return table
+
+    def evict(self, keep: Optional[Path] = None) -> None:
+        """Delete least recently used entries until the directory fits in max_bytes"""
+        base = keep.parent if keep is not None else self.cache_dir
+        if base is None or not base.exists():
+            return
+        entries = sorted(base.glob("*.tbl"), key=lambda p: p.stat().st_mtime)
+        total = sum(p.stat().st_size for p in entries)
+        for p in entries:
+            if total <= self.max_bytes:
+                break
+            if keep is not None and p == keep:
+                continue
+            total -= p.stat().st_size
+            p.unlink(missing_ok=True)
+            log.info("Evicted cache entry %s", p)
@@ -1,13 +1,25 @@
 from abc import ABC, abstractmethod
 from pathlib import Path
-import csv, logging
+import asyncio, bz2, codecs, contextlib, csv, glob, gzip, io, logging, lzma, mmap, queue, re, threading
 import aiofiles
-from typing import List, Dict, Iterator, Union
+from array import array
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from multiprocessing import shared_memory
+from operator import itemgetter
+from typing import Any, Callable, List, Dict, Iterable, Iterator, AsyncIterator, Optional, Sequence, Tuple, Union, TYPE_CHECKING
 
 try:
-    from .models import WeatherRecord
+    from .models import WeatherRecord, WeatherTable, NumericColumn, StringColumn
+    from .executor import SummaryExecutor, default_executor, default_workers
 except ImportError:
-    from models import WeatherRecord
+    from models import WeatherRecord, WeatherTable, NumericColumn, StringColumn
+    from executor import SummaryExecutor, default_executor, default_workers
+
+if TYPE_CHECKING:
+    from data_cache import ParsedCache
+    from models import ResultSummary
 
 class BaseFetcher(ABC):
     @abstractmethod
@@ -15,15 +27,22 @@ class BaseFetcher(ABC):
         pass
 
 class CSVFetcher(BaseFetcher):
-    def __init__(self, path: str | Path, encoding: str = "utf-8") -> None:
+    def __init__(self, path: str | Path, encoding: str = "utf-8", cache: Optional["ParsedCache"] = None) -> None:
         self.path = Path(path)
         self.encoding = encoding
+        # Optional data_cache.ParsedCache; when set, unchanged files are memory-mapped instead of parsed
+        self.cache = cache
 
-    def fetch(self) -> List[WeatherRecord]:
+    def fetch(self, columns: Optional[Sequence[str]] = None) -> List[WeatherRecord]:
+        """All rows, or only the named columns when columns= is given"""
         if not self.path.exists():
             raise FileNotFoundError(f"CSV not found: {self.path}")
+        if self.cache is not None:
+            return list(self.fetch_table(columns))
+        if columns is not None:
+            return [WeatherRecord(row=row) for row in iter_csv_records(self.path, encoding=self.encoding, columns=columns)]
         records: List[WeatherRecord] = []
-        with self.path.open("r", encoding=self.encoding, newline="") as f:
+        with open_csv_text(self.path, self.encoding) as f:
             reader = csv.DictReader(f)
             if reader.fieldnames is None:
                 raise ValueError("CSV has no header row.")
@@ -31,31 +50,202 @@ class CSVFetcher(BaseFetcher):
                 records.append(WeatherRecord(row=row))
         return records
 
+    def fetch_table(self, columns: Optional[Sequence[str]] = None) -> WeatherTable:
+        """Columnar version of fetch(): every column parsed once into typed arrays"""
+        if self.cache is not None:
+            # The cache holds every column; projecting a cached table is free
+            parse = lambda p: WeatherTable.from_rows(iter_csv_records(p, encoding=self.encoding))
+            table = self.cache.get_or_parse(self.path, parse)
+            return table.select(columns) if columns is not None else table
+        return WeatherTable.from_rows(iter_csv_records(self.path, encoding=self.encoding, columns=columns), columns=columns)
+
 #--------------------New--------------------
 log = logging.getLogger(__name__)
 PathLike = Union[str, Path]
+
+#--------------------New: transparent decompression--------------------
+_MAGIC_BYTES = ((b"\x1f\x8b", "gzip"), (b"BZh", "bz2"), (b"\xfd7zXZ\x00", "xz"))
+_OPENERS = {"gzip": gzip.open, "bz2": bz2.open, "xz": lzma.open}
+
+def detect_compression(path: PathLike) -> Optional[str]:
+    """'gzip', 'bz2' or 'xz' from the file's magic bytes, None for plain text"""
+    with open(path, "rb") as f:
+        head = f.read(6)
+    for magic, kind in _MAGIC_BYTES:
+        if head.startswith(magic):
+            return kind
+    return None
+
+class _ThreadedDecompressor(io.RawIOBase):
+    """Raw stream whose bytes are decompressed ahead by a background thread.
+
+    zlib, bz2 and lzma release the GIL while they work, so decompression of
+    the next blocks overlaps with CSV parsing of the current one. The queue
+    is bounded, so at most `depth` blocks are ever buffered.
+    """
+
+    def __init__(self, path: PathLike, kind: str, block_size: int = 256 * 1024, depth: int = 8) -> None:
+        super().__init__()
+        self._src = _OPENERS[kind](path, "rb")
+        self._block_size = block_size
+        self._queue: "queue.Queue" = queue.Queue(maxsize=depth)
+        self._stop = threading.Event()
+        self._view = memoryview(b"")
+        self._eof = False
+        self._thread = threading.Thread(target=self._pump, name=f"decompress-{Path(path).name}", daemon=True)
+        self._thread.start()
+
+    def _put(self, item) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _pump(self) -> None:
+        try:
+            while True:
+                block = self._src.read(self._block_size)
+                if not self._put(block) or not block:
+                    break
+        except Exception as e:  # handed to the reading thread
+            self._put(e)
+        finally:
+            self._src.close()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        if not self._view:
+            if self._eof:
+                return 0
+            item = self._queue.get()
+            if isinstance(item, Exception):
+                raise item
+            if not item:
+                self._eof = True
+                return 0
+            self._view = memoryview(item)
+        n = min(len(b), len(self._view))
+        b[:n] = self._view[:n]
+        self._view = self._view[n:]
+        return n
+
+    def close(self) -> None:
+        if not self.closed:
+            self._stop.set()
+            while self._thread.is_alive():
+                try:
+                    self._queue.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+        super().close()
+
+def open_csv_text(path: PathLike, encoding: str = "utf-8") -> io.TextIOBase:
+    """Open a CSV for reading, stream-decompressing gzip/bz2/xz inputs in a worker thread"""
+    kind = detect_compression(path)
+    if kind is None:
+        return open(path, "r", encoding=encoding, newline="")
+    log.info("Decompressing %s input %s while parsing", kind, path)
+    return io.TextIOWrapper(io.BufferedReader(_ThreadedDecompressor(path, kind)), encoding=encoding, newline="")
+
+@contextlib.asynccontextmanager
+async def _open_async_text(path: Path, encoding: str):
+    """Yields an async read(n): aiofiles for plain files, a decompressing stream otherwise"""
+    if detect_compression(path) is None:
+        async with aiofiles.open(path, 'r', encoding=encoding, newline='') as f:
+            yield f.read
+        return
+    f = await asyncio.to_thread(open_csv_text, path, encoding)
+    try:
+        yield lambda n: asyncio.to_thread(f.read, n)
+    finally:
+        f.close()
+
+class _ColumnProjector:
+    """Turns csv.reader rows into stripped dicts holding only the requested columns"""
+
+    def __init__(self, header: List[str], columns: Sequence[str]) -> None:
+        missing = [c for c in columns if c not in header]
+        if missing:
+            raise ValueError(f"CSV is missing requested columns: {', '.join(missing)}")
+        self.columns = list(columns)
+        self.indexes = [header.index(c) for c in self.columns]
+        self.width = max(self.indexes, default=-1) + 1
+        get = itemgetter(*self.indexes) if self.indexes else (lambda row: ())
+        self._get = get if len(self.indexes) != 1 else (lambda row: (get(row),))
+
+    def __call__(self, row: List[str]) -> Optional[Dict[str, str]]:
+        # short-circuits on the first non-blank field, so this is cheap for real rows
+        if not any(v.strip() for v in row):
+            return None
+        if len(row) >= self.width:
+            values = self._get(row)
+        else:
+            values = [row[j] if j < len(row) else None for j in self.indexes]
+        return {c: (v.strip() if v is not None else None) for c, v in zip(self.columns, values)}
+
 # Added generator to yield one row at a time
-def iter_csv_records(path: PathLike, *, encoding: str ='utf-8', dialect: str ='excel') -> Iterator[Dict[str, str]]:
+def iter_csv_records(path: PathLike, *, encoding: str ='utf-8', dialect: str ='excel',
+                     cache: Optional["ParsedCache"] = None,
+                     columns: Optional[Sequence[str]] = None,
+                     where: Optional[Callable[[Dict[str, str]], bool]] = None) -> Iterator[Dict[str, str]]:
+    """Yield stripped rows; with columns= only those fields are copied, stripped and stored.
+
+    where= is a row predicate applied as each row is parsed, so rejected rows
+    are never handed back (the lazy query API pushes its filters in here).
+    """
     path = Path(path)
     if not path.exists():
         log.error("CSV file not found: %s", path)
         raise FileNotFoundError(f"CSV not found: {path}")
+
+    if cache is not None:
+        # Rows come from the cached typed columns, which keep each cell's source text
+        table = cache.get_or_parse(path, lambda p: WeatherTable.from_rows(iter_csv_records(p, encoding=encoding, dialect=dialect)))
+        if columns is not None:
+            table = table.select(columns)
+        for rec in table:
+            row = dict(rec.row)
+            if where is None or where(row):
+                yield row
+        return
     
     try:
-        with path.open('r', encoding=encoding, newline='') as f:
+        with open_csv_text(path, encoding) as f:
+            if columns is not None:
+                reader = csv.reader(f, dialect=dialect)
+                header = next(reader, None)
+                if not header:
+                    raise ValueError("CSV header row is missing or unreadable.")
+                project = _ColumnProjector([h.strip() for h in header], columns)
+                for row in reader:
+                    if not row:
+                        continue  # blank line, DictReader skips these silently too
+                    clean = project(row)
+                    if clean is None:
+                        log.warning("Skipping empty row at line %d", reader.line_num)
+                        continue
+                    if where is None or where(clean):
+                        yield clean
+                return
+
             reader = csv.DictReader(f, dialect=dialect)
             if not reader.fieldnames:
                 raise ValueError("CSV header row is missing or unreadable.")
             
             reader.fieldnames = [h.strip() if isinstance(h, str) else h for h in reader.fieldnames]
             
-            for i, row in enumerate(reader, start=2):
-                if not any((v or "").strip() for v in row.values()):
-                    log.warning("Skipping empty row at line %d", i)
+            for row in reader:
+                clean = _clean_row(row)
+                if clean is None:
+                    log.warning("Skipping empty row at line %d", reader.line_num)
                     continue
-                
-                clean = {k: (v.strip() if isinstance(v, str) else v) for k, v in row.items()}
-                yield clean
+                if where is None or where(clean):
+                    yield clean
                 
     except UnicodeDecodeError:
         log.exception("Encoding error reading %s", path)
@@ -65,43 +255,436 @@ def iter_csv_records(path: PathLike, *, encoding: str ='utf-8', dialect: str ='e
         raise
     
 # ------------------------- New for phase 7----------------------------------------
-async def async_read_csv_records(path: PathLike, *, encoding: str ='utf-8', dialect: str ='excel') -> Iterator[Dict[str, str]]:
-    """Added the async version for reading a csv file"""
+# Size of each aiofiles read; peak memory is a few of these, not the whole file
+ASYNC_CHUNK_SIZE = 64 * 1024
+
+def _clean_row(row: Dict[str, str]) -> Optional[Dict[str, str]]:
+    """Stripped copy of a DictReader row, or None if every field is blank"""
+    if not any((v or "").strip() for v in row.values()):
+        return None
+    return {k: (v.strip() if isinstance(v, str) else v) for k, v in row.items()}
+
+_RECORD_MARKS: Dict[str, "re.Pattern[str]"] = {}
+
+def _scan_records(text: str, start: int, quoted: bool, quotechar: str = '"') -> Tuple[int, bool]:
+    """One forward scan of text[start:] for record-ending line breaks.
+
+    quoted is whether text[start] is inside a quoted field. Returns the index
+    just past the last line break outside quotes (0 if none) and the quote
+    state at the end, so the next chunk's scan resumes instead of restarting.
+    A doubled "" toggles twice, which leaves the parity right.
+    """
+    marks = _RECORD_MARKS.get(quotechar)
+    if marks is None:
+        marks = _RECORD_MARKS[quotechar] = re.compile("[\r\n" + re.escape(quotechar) + "]")
+    cut = 0
+    for m in marks.finditer(text, start):
+        if m.group() == quotechar:
+            quoted = not quoted
+        elif not quoted:
+            cut = m.end()
+    return cut, quoted
+
+async def aiter_csv_records(path: PathLike, *, encoding: str ='utf-8', dialect: str ='excel',
+                            chunk_size: int = ASYNC_CHUNK_SIZE,
+                            batch_size: Optional[int] = None,
+                            columns: Optional[Sequence[str]] = None) -> AsyncIterator[Union[Dict[str, str], List[Dict[str, str]]]]:
+    """Async generator that streams cleaned rows (or lists of batch_size rows) from a CSV.
+
+    The file is read in fixed-size chunks; only the complete records in the
+    buffer are parsed, and a quoted field that spans a chunk boundary stays in
+    the buffer until its closing quote arrives. columns= projects each row
+    to just those fields, as in iter_csv_records.
+    """
     path = Path(path)
     if not path.exists():
         log.error("CSV file not found: %s", path)
         raise FileNotFoundError(f"CSV not found: {path}")
-    
+
+    quotechar = csv.get_dialect(dialect).quotechar or '"'
+    fieldnames: Optional[List[str]] = None
+    project: Optional[_ColumnProjector] = None
+    line = 0  # physical lines handed to earlier readers
+    batch: List[Dict[str, str]] = []
+    buffer = ""
+    scanned, quoted = 0, False  # buffer[:scanned] is already scanned; quoted is the state there
+
     try:
-        async with aiofiles.open(path, 'r', encoding=encoding, newline='') as f:
-            contents = await f.read()
-        
-        # Splitting the contents into lines and parse as CSV
-        lines = contents.splitlines()
-        reader = csv.DictReader(lines, dialect=dialect)
-        
-        #Validate header row
-        if not reader.fieldnames:
+        async with _open_async_text(path, encoding) as read:
+            while True:
+                chunk = await read(chunk_size)
+                if chunk:
+                    buffer += chunk
+                    # only the new text is scanned; the carried-over tail holds no record break
+                    cut, quoted = _scan_records(buffer, scanned, quoted, quotechar)
+                    scanned = len(buffer)
+                else:
+                    cut = len(buffer)  # end of file: whatever is left is the last record
+
+                if cut:
+                    complete, buffer = buffer[:cut], buffer[cut:]
+                    scanned -= cut
+                    lines = complete.splitlines(keepends=True)
+                    if columns is not None:
+                        reader = csv.reader(lines, dialect=dialect)
+                        if project is None:
+                            header = next(reader, None)
+                            if not header:
+                                raise ValueError("CSV header row is missing or unreadable")
+                            fieldnames = [h.strip() for h in header]
+                            project = _ColumnProjector(fieldnames, columns)
+                        cleaned = (project(row) for row in reader if row)
+                    else:
+                        reader = csv.DictReader(lines, fieldnames=fieldnames, dialect=dialect)
+                        if fieldnames is None:
+                            # Validate header row
+                            if not reader.fieldnames:
+                                raise ValueError("CSV header row is missing or unreadable")
+                            fieldnames = [h.strip() if isinstance(h, str) else h for h in reader.fieldnames]
+                            reader.fieldnames = fieldnames
+                        cleaned = (_clean_row(row) for row in reader)
+
+                    for clean in cleaned:
+                        if clean is None:
+                            log.warning("Skipping empty row at line %d", line + reader.line_num)
+                            continue
+                        if batch_size is None:
+                            yield clean
+                            continue
+                        batch.append(clean)
+                        if len(batch) >= batch_size:
+                            yield batch
+                            batch = []
+                    line += len(lines)
+
+                if not chunk:
+                    break
+
+        if fieldnames is None:
             raise ValueError("CSV header row is missing or unreadable")
-            
-        reader.fieldnames = [h.strip() if isinstance(h, str) else h for h in reader.fieldnames]
-        
-        records = []
-            
-        for i, row in enumerate(reader, start=2):
-            if not any((v or "").strip() for v in row.values()):
-                log.warning("Skipping empty row at line %d", i)
-                continue
-            
-            clean = {k: (v.strip() if isinstance(v, str) else v) for k, v in row.items()}
-            records.append(clean)
-        
-        log.info("Successfully read %d records from %s, len(records), path")
-        return records
-                
+        if batch:
+            yield batch
+
     except UnicodeDecodeError:
         log.exception("Encoding error reading %s", path)
         raise
     except csv.Error as e:
         log.exception("CSV parse error in %s: %s", path, e)
-        raise
\ No newline at end of file
+        raise
+
+async def async_read_csv_records(path: PathLike, *, encoding: str ='utf-8', dialect: str ='excel',
+                                 columns: Optional[Sequence[str]] = None) -> List[Dict[str, str]]:
+    """Added the async version for reading a csv file (collects aiter_csv_records into a list)"""
+    records = [row async for row in aiter_csv_records(path, encoding=encoding, dialect=dialect, columns=columns)]
+    log.info("Successfully read %d records from %s", len(records), path)
+    return records
+
+#--------------------New: parallel mmap ingest--------------------
+# Below this many bytes per worker, process startup costs more than it saves
+MIN_RANGE_BYTES = 1 << 20
+
+def _split_byte_ranges(mm: mmap.mmap, start: int, parts: int) -> List[Tuple[int, int]]:
+    """Cut [start, EOF) into about `parts` ranges that each end just after a newline"""
+    size = len(mm)
+    step = max(1, (size - start) // parts)
+    bounds = [start]
+    for k in range(1, parts):
+        nl = mm.find(b"\n", start + k * step)
+        cut = size if nl < 0 else nl + 1
+        if cut > bounds[-1] and cut < size:
+            bounds.append(cut)
+    bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+def _read_table_streaming(path: Path, encoding: str, dialect: str) -> WeatherTable:
+    """Typed table straight from the decompressed stream, one row at a time"""
+    with open_csv_text(path, encoding) as f:
+        reader = csv.reader(f, dialect=dialect)
+        header = next(reader, None)
+        if not header:
+            raise ValueError("CSV header row is missing or unreadable.")
+        rows = (r for r in reader if any(v.strip() for v in r))
+        return WeatherTable.from_sequences([h.strip() for h in header], rows)
+
+def _parse_range(path: str, start: int, end: int, fieldnames: List[str], encoding: str, dialect: str) -> WeatherTable:
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        text = mm[start:end].decode(encoding)
+    rows = (r for r in csv.reader(text.splitlines(keepends=True), dialect=dialect) if any(v.strip() for v in r))
+    return WeatherTable.from_sequences(fieldnames, rows)
+
+def _parse_range_to_shm(path: str, start: int, end: int, fieldnames: List[str], encoding: str, dialect: str) -> tuple:
+    """Worker: parse one byte range and hand the typed columns back through shared memory"""
+    table = _parse_range(path, start, end, fieldnames, encoding, dialect)
+    buffers, layout, offset = [], [], 0
+    for name, col in table.columns.items():
+        if isinstance(col, NumericColumn):
+            parts = [col.values.tobytes(), bytes(col.nulls)]
+            meta = ("numeric", col.raw)  # raw: only the cells whose text cannot be re-rendered
+        else:
+            parts = [col.codes.tobytes()]
+            meta = ("text", col.categories)  # small: one entry per distinct string
+        sizes = [len(b) for b in parts]
+        layout.append((name, offset, sizes, meta))
+        buffers.extend(parts)
+        offset += sum(sizes)
+
+    shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+    pos = 0
+    for b in buffers:
+        shm.buf[pos:pos + len(b)] = b
+        pos += len(b)
+    shm.close()
+    return shm.name, layout
+
+def _table_from_shm(name: str, layout: list) -> WeatherTable:
+    """Copy a worker's columns out of its shared memory block (the caller unlinks it)"""
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        columns = {}
+        for col, offset, sizes, (kind, meta) in layout:
+            if kind == "numeric":
+                values = array('d')
+                values.frombytes(shm.buf[offset:offset + sizes[0]])
+                nulls = bytearray(shm.buf[offset + sizes[0]:offset + sizes[0] + sizes[1]])
+                columns[col] = NumericColumn(values=values, nulls=nulls, raw=meta)
+            else:
+                codes = array('i')
+                codes.frombytes(shm.buf[offset:offset + sizes[0]])
+                columns[col] = StringColumn(categories=meta, codes=codes)
+        return WeatherTable(columns)
+    finally:
+        shm.close()
+
+def _unlink_shm(name: str) -> None:
+    try:
+        shm = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return
+    shm.close()
+    shm.unlink()
+
+def read_csv_table_parallel(path: PathLike, *, workers: Optional[int] = None,
+                            encoding: str = 'utf-8', dialect: str = 'excel',
+                            executor: Optional[SummaryExecutor] = None) -> WeatherTable:
+    """Parse a CSV into a WeatherTable, one byte range per worker of the shared pool.
+
+    The file is memory-mapped and cut on newlines; each worker parses its
+    range into typed columns and returns them through shared memory instead
+    of pickling row dicts. Ranges can only be cut safely when no quoted field
+    contains a newline, so files with any quote characters are parsed in a
+    single range.
+
+    workers= caps the number of ranges, so at most that many run at once.
+    Without an executor it also sizes a dedicated pool, closed on return,
+    in place of the shared one.
+    """
+    path = Path(path)
+    if not path.exists():
+        log.error("CSV file not found: %s", path)
+        raise FileNotFoundError(f"CSV not found: {path}")
+
+    if path.stat().st_size and detect_compression(path) is not None:
+        # Compressed bytes cannot be split on newlines; stream-decompress instead
+        return _read_table_streaming(path, encoding, dialect)
+
+    with path.open("rb") as f:
+        if path.stat().st_size == 0:
+            raise ValueError("CSV header row is missing or unreadable.")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            header_end = mm.find(b"\n")
+            header_end = len(mm) if header_end < 0 else header_end + 1
+            header = next(csv.reader([mm[:header_end].decode(encoding)], dialect=dialect), None)
+            if not header:
+                raise ValueError("CSV header row is missing or unreadable.")
+            fieldnames = [h.strip() for h in header]
+
+            quotechar = (csv.get_dialect(dialect).quotechar or '"').encode(encoding)
+            owned = executor is None and workers is not None
+            if executor is None:
+                executor = SummaryExecutor(workers) if owned else default_executor()
+            workers = min(workers or executor.workers, executor.workers)
+            parts = min(workers, max(1, (len(mm) - header_end) // MIN_RANGE_BYTES))
+            if parts > 1 and mm.find(quotechar, header_end) >= 0:
+                # A quoted field may hold a newline, so cutting on newlines is not safe
+                log.warning("%s contains quote characters; parsing it in a single range instead of %d", path, parts)
+                parts = 1
+            ranges = _split_byte_ranges(mm, header_end, parts)
+
+    if len(ranges) == 1:
+        return _parse_range(str(path), ranges[0][0], ranges[0][1], fieldnames, encoding, dialect)
+
+    log.info("Parsing %s in %d byte ranges", path, len(ranges))
+    tasks = [(str(path), start, end, fieldnames, encoding, dialect) for start, end in ranges]
+    try:
+        handles = executor.starmap(_parse_range_to_shm, tasks)
+    finally:
+        if owned:
+            executor.close()
+    try:
+        return WeatherTable.concat([_table_from_shm(name, layout) for name, layout in handles])
+    finally:
+        # Every block is released even if copying one of them failed
+        for name, _ in handles:
+            _unlink_shm(name)
+
+#--------------------New: reading only the appended tail--------------------
+def read_csv_tail(path: PathLike, offset: int = 0, *, encoding: str = 'utf-8', dialect: str = 'excel',
+                  chunk_size: int = ASYNC_CHUNK_SIZE) -> Tuple[List[str], Iterator[Tuple[List[Dict[str, str]], Optional[int]]]]:
+    """Header, and a lazy iterator over the records after byte offset.
+
+    offset=0 reads from the first data row. The tail is read chunk_size bytes
+    at a time and cut on record boundaries as in aiter_csv_records; each step
+    yields that chunk's cleaned rows and the offset just past its last
+    complete record. A last record without a line break is yielded on its
+    own with offset None: it is not consumed, so the next call reads it again
+    (it may still be being written). An open quoted field at the end of the
+    file is left for the next call.
+    """
+    path = Path(path)
+    if not path.exists():
+        log.error("CSV file not found: %s", path)
+        raise FileNotFoundError(f"CSV not found: {path}")
+    if detect_compression(path) is not None:
+        raise ValueError(f"Byte offsets need an uncompressed CSV: {path}")
+
+    with path.open("rb") as f:
+        header = next(csv.reader([f.readline().decode(encoding)], dialect=dialect), None)
+        if not header:
+            raise ValueError("CSV header row is missing or unreadable.")
+        start = max(offset, f.tell())
+    fieldnames = [h.strip() for h in header]
+    return fieldnames, _iter_tail(path, start, fieldnames, encoding, dialect, chunk_size)
+
+def _iter_tail(path: Path, start: int, fieldnames: List[str], encoding: str, dialect: str,
+               chunk_size: int) -> Iterator[Tuple[List[Dict[str, str]], Optional[int]]]:
+    quotechar = csv.get_dialect(dialect).quotechar or '"'
+    # The incremental decoder holds back a multi-byte character split across reads
+    decoder = codecs.getincrementaldecoder(encoding)()
+    buffer, scanned, quoted, end = "", 0, False, start
+    with path.open("rb") as f:
+        f.seek(start)
+        while chunk := f.read(chunk_size):
+            buffer += decoder.decode(chunk)
+            cut, quoted = _scan_records(buffer, scanned, quoted, quotechar)
+            scanned = len(buffer)
+            if not cut:
+                continue
+            complete, buffer = buffer[:cut], buffer[cut:]
+            scanned -= cut
+            end += len(complete.encode(encoding))
+            reader = csv.DictReader(io.StringIO(complete, newline=""), fieldnames=fieldnames, dialect=dialect)
+            yield [clean for clean in map(_clean_row, reader) if clean is not None], end
+    if buffer.strip() and not quoted:
+        reader = csv.DictReader(io.StringIO(buffer, newline=""), fieldnames=fieldnames, dialect=dialect)
+        yield [clean for clean in map(_clean_row, reader) if clean is not None], None
+
+#--------------------New: partitioned datasets--------------------
+def is_dataset_path(source: PathLike) -> bool:
+    """True for a directory or a glob pattern rather than a single file"""
+    return Path(source).is_dir() or glob.has_magic(str(source))
+
+def _ordered_window(executor: Executor, fn: Callable, items: Iterable, window: int) -> Iterator[Any]:
+    """executor.map that keeps at most `window` tasks in flight and yields in input order"""
+    pending: deque = deque()
+    items = iter(items)
+    for item in items:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= window:
+            break
+    while pending:
+        result = pending.popleft().result()
+        nxt = next(items, None)
+        if nxt is not None:
+            pending.append(executor.submit(fn, nxt))
+        yield result
+
+def _read_partition(path: Path, encoding: str, columns: Optional[Sequence[str]]) -> List[Dict[str, str]]:
+    return list(iter_csv_records(path, encoding=encoding, columns=columns))
+
+def _read_partition_table(path: Path, encoding: str, columns: Optional[Sequence[str]]) -> WeatherTable:
+    # Typed columns pickle back from a worker process far smaller than a list of row dicts
+    return WeatherTable.from_rows(iter_csv_records(path, encoding=encoding, columns=columns), columns=columns)
+
+def _table_rows(table: WeatherTable) -> Iterator[Dict[str, str]]:
+    for rec in table:
+        yield dict(rec.row)
+
+def _summarize_partition(path: Path, encoding: str, numeric_columns: Sequence[Union[str, int]],
+                         columns: Optional[Sequence[str]] = None) -> dict:
+    try:
+        from .data_processor import partial_summary
+    except ImportError:
+        from data_processor import partial_summary
+    return partial_summary(iter_csv_records(path, encoding=encoding, columns=columns), numeric_columns)
+
+# Files picked up from a dataset directory: plain and compressed CSVs
+PARTITION_PATTERNS = ("*.csv", "*.csv.gz", "*.csv.bz2", "*.csv.xz")
+
+class DatasetFetcher(BaseFetcher):
+    """Reads a directory or glob of CSVs, treating each file as one partition.
+
+    Partitions are ingested concurrently in a bounded pool (processes by
+    default, since parsing is CPU-bound) and come back in sorted file order.
+    Worker processes send back typed tables or per-column StreamingStats,
+    never lists of row dicts. Process work runs on the executor passed in,
+    or the shared default_executor(), so no second pool is started.
+    """
+
+    def __init__(self, source: PathLike, *, pattern: Union[str, Sequence[str]] = PARTITION_PATTERNS, encoding: str = "utf-8",
+                 columns: Optional[Sequence[str]] = None, max_workers: Optional[int] = None,
+                 use_processes: bool = True, executor: Optional[SummaryExecutor] = None) -> None:
+        self.source = Path(source)
+        self.pattern = pattern
+        self.encoding = encoding
+        self.columns = columns
+        self.max_workers = max_workers or default_workers()
+        self.use_processes = use_processes
+        self.executor = executor
+
+    @property
+    def partitions(self) -> List[Path]:
+        if self.source.is_dir():
+            patterns = [self.pattern] if isinstance(self.pattern, str) else self.pattern
+            paths = sorted({p for pat in patterns for p in self.source.glob(pat)})
+        elif glob.has_magic(str(self.source)):
+            paths = sorted(Path(p) for p in glob.glob(str(self.source)))
+        else:
+            paths = [self.source] if self.source.exists() else []
+        paths = [p for p in paths if p.is_file()]
+        if not paths:
+            raise FileNotFoundError(f"No CSV partitions found for: {self.source}")
+        return paths
+
+    def _run(self, fn: Callable, parts: List[Path], *args: Any) -> Iterator[Any]:
+        """fn(part, *args) for each partition in file order, at most max_workers files in flight"""
+        if self.use_processes:
+            executor = self.executor or default_executor()
+            return executor.istarmap(fn, ((part, *args) for part in parts), window=self.max_workers)
+        return self._run_threads(fn, parts, args)
+
+    def _run_threads(self, fn: Callable, parts: List[Path], args: tuple) -> Iterator[Any]:
+        with ThreadPoolExecutor(min(self.max_workers, len(parts))) as pool:
+            yield from _ordered_window(pool, lambda part: fn(part, *args), parts, self.max_workers)
+
+    def iter_records(self) -> Iterator[Dict[str, str]]:
+        """Stream rows of every partition, reading up to max_workers files ahead"""
+        parts = self.partitions
+        if len(parts) == 1:
+            yield from iter_csv_records(parts[0], encoding=self.encoding, columns=self.columns)
+            return
+        read = _read_partition_table if self.use_processes else _read_partition
+        for rows in self._run(read, parts, self.encoding, self.columns):
+            yield from _table_rows(rows) if isinstance(rows, WeatherTable) else rows
+
+    def fetch(self) -> List[WeatherRecord]:
+        return [WeatherRecord(row=row) for row in self.iter_records()]
+
+    def summarize(self, numeric_columns: Sequence[Union[str, int]]) -> "ResultSummary":
+        """Summarize each partition where it is read and merge the small partial states"""
+        try:
+            from .data_processor import merge_partials
+        except ImportError:
+            from data_processor import merge_partials
+        numeric_columns = list(numeric_columns)
+        return merge_partials(self._run(_summarize_partition, self.partitions, self.encoding,
+                                        numeric_columns, self.columns))
@@ -1,32 +1,141 @@
-from typing import List, Dict, Iterable, Iterator, Any, Mapping, Sequence, Union, Optional
-from statistics import mean, median, mode, StatisticsError
+from typing import List, Dict, Iterable, Iterator, Any, Mapping, Sequence, Tuple, Union, Optional, TYPE_CHECKING
+from pathlib import Path
+import heapq
 import math
 import logging
-from multiprocessing import Pool, cpu_count
-from functools import partial
+import pickle
+import tempfile
+from itertools import chain, groupby, islice
+from operator import itemgetter
+from array import array
+from multiprocessing import shared_memory, cpu_count
+from concurrent.futures import ThreadPoolExecutor
 
 try:
-    from .models import WeatherRecord, ResultSummary, ColumnStats
+    from .models import WeatherRecord, WeatherTable, ResultSummary, ColumnStats, GroupedSummary, NumericColumn, CorrelationMatrix
+    from . import vector_backend
+    from .core import OrderStatistics, StreamingStats, RollingWindow, CoMoments
+    from .executor import SummaryExecutor, default_executor, CostModel
+    from .sketches import ColumnSketch, DEFAULT_K, DEFAULT_HEAVY_HITTERS, DEFAULT_PERCENTILES, percentile_name
+    from .parsing import parse_number, parser_for
+    from .external_sort import ExternalSorter
 except ImportError:
-    from models import WeatherRecord, ResultSummary, ColumnStats
+    from models import WeatherRecord, WeatherTable, ResultSummary, ColumnStats, GroupedSummary, NumericColumn, CorrelationMatrix
+    import vector_backend
+    from core import OrderStatistics, StreamingStats, RollingWindow, CoMoments
+    from executor import SummaryExecutor, default_executor, CostModel
+    from sketches import ColumnSketch, DEFAULT_K, DEFAULT_HEAVY_HITTERS, DEFAULT_PERCENTILES, percentile_name
+    from parsing import parse_number, parser_for
+    from external_sort import ExternalSorter
+
+if TYPE_CHECKING:
+    from data_store import FileStore
+
+def _column_stats(vals: List[float], percentiles: Optional[Sequence[float]] = None) -> ColumnStats:
+    """Sorts the column once (in place; callers pass lists they own) and reads every order statistic from it"""
+    if not vals:
+        return ColumnStats(None, None, None, None, 0)
+    vals.sort()
+    order = OrderStatistics(vals, presorted=True)
+    return ColumnStats(
+        mean=math.fsum(order.values) / order.count,
+        median=order.median(),
+        mode=order.mode(),
+        data_range=order.data_range(),
+        count=order.count,
+        percentiles={percentile_name(q): order.quantile(q) for q in percentiles} if percentiles else None,
+    )
 
-def _to_float_or_none(x: str):
-    try:
-        return float(x)
-    except (TypeError, ValueError):
-        return None
+def _sketch_stats(sk: ColumnSketch, percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+                  top_k: Optional[int] = None) -> ColumnStats:
+    """ColumnStats from a merged ColumnSketch; sketched fields are listed in `approximate`"""
+    if not sk.count:
+        return ColumnStats(None, None, None, None, 0)
+    kll = sk.quantiles
+    names = [percentile_name(q) for q in percentiles]
+    approximate = () if kll.is_exact else ("median", *names)
+    if not sk.frequent.is_exact:
+        approximate += ("mode",)
+    return ColumnStats(
+        mean=sk.mean(),
+        median=kll.median(),
+        mode=sk.mode(),
+        data_range=sk.data_range(),
+        count=sk.count,
+        percentiles={name: kll.quantile(q) for name, q in zip(names, percentiles)},
+        top_values=sk.frequent.top(top_k) if top_k else None,
+        approximate=approximate,
+    )
+
+def _external_stats(sorter: ExternalSorter, percentiles: Optional[Sequence[float]] = None) -> ColumnStats:
+    """ColumnStats from an ExternalSorter, equal to _column_stats over the same values"""
+    if not sorter.count:
+        return ColumnStats(None, None, None, None, 0)
+    desc = sorter.describe(percentiles or ())
+    return ColumnStats(
+        mean=desc['mean'],
+        median=desc['median'],
+        mode=desc['mode'],
+        data_range=desc['data_range'],
+        count=desc['count'],
+        percentiles={percentile_name(q): v for q, v in desc['percentiles'].items()} if percentiles else None,
+    )
+
+def _column_values(records: Any, col: Union[str, int]) -> List[float]:
+    """Numeric values of one column, read straight from typed arrays for a WeatherTable"""
+    if isinstance(records, WeatherTable):
+        return records.numeric_values(col)
+    values: List[float] = []
+    for batch in NumericColumnIterator(records, col).batches():
+        values.extend(batch.present())
+    return values
 
 class StatsProcessor:
-    def summarize(self, records: List[WeatherRecord]) -> ResultSummary:
+    def __init__(self, backend: str = "python", columns: Optional[Sequence[str]] = None,
+                 sketch: bool = False, percentiles: Optional[Sequence[float]] = None,
+                 top_k: Optional[int] = None, bin_width: Optional[float] = None,
+                 memory_limit: Optional[int] = None) -> None:
+        # "numpy" opts into the vectorized float64 path in vector_backend
+        self.backend = vector_backend.check_backend(backend)
+        # Columns to summarize; pass them to the fetcher's columns= so nothing else is parsed
+        self.columns = list(columns) if columns is not None else None
+        # sketch=True: fixed memory per column, median and percentiles from a KLL sketch
+        self.sketch = sketch
+        self.percentiles = tuple(percentiles) if percentiles is not None else None
+        # Sketch mode only: report the top_k most frequent values (binned to bin_width)
+        self.top_k = top_k
+        self.bin_width = bin_width
+        # Exact statistics with at most about this many bytes of values in RAM, the rest spilled to disk
+        self.memory_limit = memory_limit
+
+    def summarize(self, records: Union[List[WeatherRecord], WeatherTable]) -> ResultSummary:
         if not records:
             return ResultSummary(stats_by_column={})
 
-        columns = list(records[0].row.keys())
+        if self.sketch or self.memory_limit is not None:
+            columns = self.columns or (records.column_names if isinstance(records, WeatherTable) else list(records[0].row.keys()))
+            summary = summarize_columns(records, columns, sketch=self.sketch, percentiles=self.percentiles,
+                                        top_k=self.top_k, bin_width=self.bin_width, memory_limit=self.memory_limit)
+            return ResultSummary(stats_by_column={c: st for c, st in summary.stats_by_column.items() if st.count})
+
+        if isinstance(records, WeatherTable):
+            # Columns are already typed, no per-row parsing needed
+            return ResultSummary(stats_by_column={
+                col: _column_stats(vals, self.percentiles)
+                for col in (self.columns or records.column_names)
+                if (vals := records.numeric_values(col))
+            })
+
+        columns = self.columns or list(records[0].row.keys())
+        if self.backend == "numpy":
+            return self._summarize_vectorized(records, columns)
         numeric_data: Dict[str, List[float]] = {c: [] for c in columns}
 
+        parsers = [(c, parser_for(c).parse) for c in columns]
         for rec in records:
-            for c in columns:
-                val = _to_float_or_none(rec.row.get(c, ""))
+            row = rec.row
+            for c, parse in parsers:
+                val = parse(row.get(c, ""))
                 if val is not None:
                     numeric_data[c].append(val)
 
@@ -34,20 +143,17 @@ class StatsProcessor:
         for col, values in numeric_data.items():
             if not values:
                 continue
-            values.sort()
-            n = len(values)
-            try:
-                m = mode(values)
-            except StatisticsError:
-                m = None
-            data_range = values[-1] - values[0] if n else None
-            stats_by_column[col] = ColumnStats(
-                mean=mean(values) if n else None,
-                median=median(values) if n else None,
-                mode=m,
-                data_range=data_range,
-                count=n,
-            )
+            stats_by_column[col] = _column_stats(values, self.percentiles)
+        return ResultSummary(stats_by_column=stats_by_column)
+
+    def _summarize_vectorized(self, records: List[WeatherRecord], columns: List[str]) -> ResultSummary:
+        arrays = vector_backend.columns_to_arrays([rec.row for rec in records], columns)
+        stats_by_column: Dict[str, ColumnStats] = {}
+        for col, arr in arrays.items():
+            # values are sorted in the python path, so mode ties go to the smallest
+            desc = vector_backend.describe_array(arr, ties="smallest")
+            if desc['count']:
+                stats_by_column[col] = ColumnStats(**desc)
         return ResultSummary(stats_by_column=stats_by_column)
 
 # ---------------------------- New --------------------------------------
@@ -59,6 +165,7 @@ class NumericColumnIterator:
     def __init__(self, records: Iterable[Any], column: Union[str, int]):
         self._records = iter(records)
         self._column = column
+        self._parse = parser_for(column).parse
         self._use_mapping: Optional[bool] = None
         self._index: Optional[int] = None
         self._primed = False
@@ -127,111 +234,655 @@ class NumericColumnIterator:
             else:
                 value = rec
 
-            num = _to_float(value)
-            if num is None or (isinstance(num, float) and math.isnan(num)):
+            num = self._parse(value)
+            if num is None:
                 continue
             return num
 
+    # --------------- Batch mode ------------------------------
+    def batches(self, size: Optional[int] = None) -> Iterator[NumericColumn]:
+        """Yield the column as NumericColumn batches of up to `size` rows (values + null mask).
+
+        The row shape is detected once from the first record and turned into a
+        specialized extractor, so rows are assumed to share that shape. Unlike
+        iterating, missing values are kept as masked slots, one per row.
+        """
+        size = size or BATCH_SIZE
+        if self._primed:
+            raise RuntimeError("batches() must be called before iterating values")
+        self._primed = True
+        first = next(self._records, None)
+        if first is None:
+            return
+        extract, skip_header = _cell_extractor(first, self._column)
+        rows = self._records if skip_header else chain([first], self._records)
+        while chunk := list(islice(rows, size)):
+            yield _parse_floats(extract(chunk), self._column)
+
 # created a function to remove ","
 def _to_float(v: Any) -> float | None:
-    if v is None:
-        return None
-
-    if isinstance(v, (int, float)):
-        try:
-            return float(v)
-        except Exception:
-            return None
-
-    if isinstance(v, str):
-        s = v.strip()
-        if s == "" or s.lower() in {"nan", "na", "null"}:
-            return None
-
-        s = s.replace(",", "")
-        try:
-            return float(s)
-        except Exception:
-            return None
-    return None 
+    # Null tokens, commas and NaN are handled by the shared parsing rules
+    return parse_number(v)
+
+#--------------------New: batched parsing----------------------------------
+BATCH_SIZE = 4096
+
+def _parse_floats(raw: Sequence[Any], column: Union[str, int, None] = None) -> NumericColumn:
+    """Parse a batch of one column's cells into values and a null mask, through that column's memo"""
+    values, nulls = parser_for(column).parse_many(raw)
+    return NumericColumn(values=values, nulls=nulls)
+
+def _cell_extractor(first: Any, column: Union[str, int]) -> tuple:
+    """(function mapping a chunk of rows to the column's raw cells, whether the first row is a header)"""
+    spec = _row_spec(first, [column])
+    if spec[0] == "mapping":
+        if hasattr(first, "row"):
+            return (lambda chunk: [r.row.get(column, "") for r in chunk]), False
+        return (lambda chunk: [r.get(column, "") for r in chunk]), False
+    if spec[0] == "sequence":
+        idx = spec[1][column]
+        return (lambda chunk: [r[idx] if idx < len(r) else "" for r in chunk]), column in spec[2]
+    return (lambda chunk: chunk), False
+
+#--------------------New: one pass over the records for every column--------------------
+def _is_sequence_row(rec: Any) -> bool:
+    return isinstance(rec, Sequence) and not isinstance(rec, (str, bytes, bytearray))
+
+def _row_spec(first: Any, columns: List[Union[str, int]]) -> tuple:
+    """Row shape, detected once from the first record with NumericColumnIterator's rules"""
+    if (hasattr(first, "row") and isinstance(first.row, Mapping)) or isinstance(first, Mapping):
+        return ("mapping",)
+    if _is_sequence_row(first):
+        header = list(first)
+        index: Dict[Union[str, int], int] = {}
+        has_header = set()
+        for col in columns:
+            if isinstance(col, int):
+                index[col] = max(0, col)
+            elif isinstance(col, str) and col in header:
+                index[col] = header.index(col)
+                has_header.add(col)  # the first row is this column's header
+            else:
+                index[col] = 0
+        return ("sequence", index, has_header)
+    return ("scalar",)
+
+def _route_rows(rows: Iterable[Any], spec: tuple, columns: List[Union[str, int]], first_row: bool) -> Dict[Union[str, int], List[float]]:
+    """Every column's parsed values for a chunk of rows; first_row marks a possible header"""
+    rows = rows if isinstance(rows, list) else list(rows)
+    if spec[0] == "mapping":
+        maps = [rec.row if hasattr(rec, "row") else rec for rec in rows]
+        return {col: _parse_floats([m.get(col, "") for m in maps], col).present() for col in columns}
+    if spec[0] == "sequence":
+        _, index, has_header = spec
+        values = {}
+        for col in columns:
+            idx = index[col]
+            body = rows[1:] if first_row and col in has_header else rows
+            cells = [(r[idx] if idx < len(r) else "") if _is_sequence_row(r) else r for r in body]
+            values[col] = _parse_floats(cells, col).present()
+        return values
+    # Bare values: every column sees the record itself
+    parsed = _parse_floats(rows).present()
+    return {col: list(parsed) for col in columns}
+
+def _iter_column_batches(records: Iterable[Any], columns: Sequence[Union[str, int]],
+                         batch_rows: Optional[int] = None) -> Iterator[Dict[Union[str, int], List[float]]]:
+    """Walk the records once, yielding each column's parsed values batch_rows records at a time.
+
+    The row shape is detected from the first record only, with the same rules
+    as NumericColumnIterator (mapping rows, sequence rows with an optional
+    header row, or bare values), so the results match one iterator per column.
+    With batch_rows=None everything comes back as a single batch.
+    """
+    columns = list(dict.fromkeys(columns))
+    if isinstance(records, WeatherTable):
+        yield {c: records.numeric_values(c) for c in columns}
+        return
+    it = iter(records)
+    first = next(it, None)
+    if first is None or not columns:
+        yield {c: [] for c in columns}
+        return
+    spec = _row_spec(first, columns)
+    rows = chain([first], it)
+    if batch_rows is None:
+        yield _route_rows(rows, spec, columns, True)
+        return
+    first_row = True
+    while chunk := list(islice(rows, batch_rows)):
+        yield _route_rows(chunk, spec, columns, first_row)
+        first_row = False
+
+def _collect_columns(records: Iterable[Any], columns: Sequence[Union[str, int]]) -> Dict[Union[str, int], List[float]]:
+    """Every requested column's parsed values, from a single pass over the records"""
+    return next(_iter_column_batches(records, columns))
 
 # -----------------------------New----------------------------------
-# Optional helper that uses the iterator to produce a ResultSummary
-def summarize_columns(records: Iterable[Any], numeric_columns: Iterable[Union[str, int]]) -> ResultSummary:
-    records_list = list(records) if not isinstance(records, list) else records
+# Optional helper that produces a ResultSummary (one pass over records for all columns)
+def summarize_columns(records: Iterable[Any], numeric_columns: Iterable[Union[str, int]], *,
+                      sketch: bool = False, percentiles: Optional[Sequence[float]] = None,
+                      top_k: Optional[int] = None, bin_width: Optional[float] = None,
+                      memory_limit: Optional[int] = None, tmp_dir: Optional[str] = None) -> ResultSummary:
+    """Summarize each column exactly, or with sketch=True in fixed memory per column.
+
+    Sketch mode streams the records in batches into mergeable ColumnSketches,
+    so the values are never all held at once; median and percentiles (p5,
+    p95 and p99 unless given) are then KLL estimates within
+    sketches.rank_error(k) in rank, and mode comes from a Misra-Gries
+    heavy-hitters summary (optionally over bins of bin_width). Estimated
+    fields are listed in ColumnStats.approximate; top_k adds the most
+    frequent values with their count bounds.
+
+    memory_limit (bytes, shared by all columns) keeps the results exact but
+    caps the values held in RAM: each column goes to an ExternalSorter that
+    spills sorted runs to tmp_dir and reads its statistics from a merge of them.
+    """
+    columns = list(numeric_columns)
+    if sketch:
+        sketches = sketch_summary(records, columns, heavy_hitters=max(top_k or 0, DEFAULT_HEAVY_HITTERS), bin_width=bin_width)
+        pct = DEFAULT_PERCENTILES if percentiles is None else percentiles
+        return ResultSummary(stats_by_column={col: _sketch_stats(sketches[col], pct, top_k) for col in columns})
+
+    if memory_limit is not None:
+        return external_summary(records, columns, memory_limit, percentiles=percentiles, tmp_dir=tmp_dir)
+
+    values = _collect_columns(records, columns)
 
     stats_by_column: Dict[str, ColumnStats] = {}
-    for col in numeric_columns:
-        vals = list(NumericColumnIterator(records_list, col))
-        if not vals:
-            stats_by_column[col] = ColumnStats(None, None, None, None, 0)
-            continue
-
-        vals.sort()
-        n = len(vals)
-        try:
-            m = mode(vals)
-        except StatisticsError:
-            m = None
-        data_rng = vals[-1] - vals[0] if n else None
-
-        stats_by_column[col] = ColumnStats(
-            mean=mean(vals) if n else None,
-            median=median(vals) if n else None,
-            mode=m,
-            data_range=data_rng,
-            count=n,
-        )
+    for col in columns:
+        stats_by_column[col] = _column_stats(values[col], percentiles)
     return ResultSummary(stats_by_column=stats_by_column)
+
+SKETCH_BATCH_ROWS = 50_000
+
+def sketch_summary(records: Iterable[Any], numeric_columns: Iterable[Union[str, int]], *,
+                   k: int = DEFAULT_K, heavy_hitters: int = DEFAULT_HEAVY_HITTERS, bin_width: Optional[float] = None,
+                   batch_rows: int = SKETCH_BATCH_ROWS) -> Dict[Union[str, int], ColumnSketch]:
+    """Per-column sketches for one chunk of records; they merge like partial_summary's accumulators"""
+    columns = list(numeric_columns)
+    sketches = {col: ColumnSketch(k, heavy_hitters, bin_width) for col in columns}
+    for batch in _iter_column_batches(records, columns, batch_rows):
+        for col, vals in batch.items():
+            sketches[col].update_many(vals)
+    return sketches
+
+def external_summary(records: Iterable[Any], numeric_columns: Iterable[Union[str, int]], memory_limit: int, *,
+                     percentiles: Optional[Sequence[float]] = None, tmp_dir: Optional[str] = None,
+                     batch_rows: int = SKETCH_BATCH_ROWS) -> ResultSummary:
+    """Exact summary holding at most about memory_limit bytes of values, split evenly across the columns"""
+    columns = list(dict.fromkeys(numeric_columns))
+    per_column = max(1, memory_limit // max(1, len(columns)))
+    sorters = {col: ExternalSorter(per_column, tmp_dir) for col in columns}
+    try:
+        for batch in _iter_column_batches(records, columns, batch_rows):
+            for col, vals in batch.items():
+                sorters[col].update_many(vals)
+        spilled = sum(s.spilled for s in sorters.values())
+        if spilled:
+            log.info("Summarizing from %d sorted runs spilled to disk", spilled)
+        return ResultSummary(stats_by_column={col: _external_stats(sorters[col], percentiles) for col in columns})
+    finally:
+        for sorter in sorters.values():
+            sorter.close()
+
 #--------------------New helper function phase 7----------------------------------
-def _process_single_column(records_list: list, col: Union[str, int]) -> tuple:
-    """Processing statistics for a single column"""
-    
-    # Extract values for this column using the iterator
-    vals = list(NumericColumnIterator(records_list, col))
-    
-    if not vals:
-        return (col, ColumnStats(None, None, None, None, 0))
-    
-    # Calculate statistics
-    vals.sort()
-    n = len(vals)
-    
+# count, fsum of the values, then the distinct values in ascending order with their counts
+SortedRun = Tuple[int, float, array, array]
+
+def _sort_shm_chunk(name: str, layout: list, chunk: int, n_chunks: int) -> Dict[Union[str, int], SortedRun]:
+    """Worker: sort this chunk's slice of every column straight from shared memory into a run-length encoded run"""
+    shm = shared_memory.SharedMemory(name=name)
     try:
-        m = mode(vals)
-    except StatisticsError:
-        m = None
-    
-    data_rng = vals[-1] - vals[0] if n else None
-    
-    stats = ColumnStats(
-        mean=mean(vals) if n else None,
-        median=median(vals) if n else None,
-        mode=m,
-        data_range=data_rng,
+        runs = {}
+        for col, offset, n in layout:
+            lo, hi = n * chunk // n_chunks, n * (chunk + 1) // n_chunks
+            with shm.buf[offset + lo * 8:offset + hi * 8] as raw, raw.cast("d") as vals:
+                ordered = sorted(vals.tolist())
+            distinct, counts = array("d"), array("q")
+            for value, group in groupby(ordered):
+                distinct.append(value)
+                counts.append(sum(1 for _ in group))
+            runs[col] = (len(ordered), math.fsum(ordered), distinct, counts)
+        return runs
+    finally:
+        shm.close()
+
+def _merge_sorted_runs(runs: Sequence[SortedRun]) -> ColumnStats:
+    """Exact ColumnStats from one k-way merge of the chunks' sorted runs (mode ties go to the smallest value)"""
+    n = sum(run[0] for run in runs)
+    if not n:
+        return ColumnStats(None, None, None, None, 0)
+    mid = n // 2
+    wanted = {(n - 1) // 2, mid}
+    at: Dict[int, float] = {}
+    seen, first, last, mode, mode_count = 0, None, None, None, 0
+    merged = heapq.merge(*(zip(run[2], run[3]) for run in runs))
+    for value, group in groupby(merged, key=itemgetter(0)):
+        count = sum(c for _, c in group)
+        if first is None:
+            first = value
+        last = value
+        if count > mode_count:
+            mode, mode_count = value, count
+        for k in wanted:
+            if seen <= k < seen + count:
+                at[k] = value
+        seen += count
+    return ColumnStats(
+        mean=math.fsum(run[1] for run in runs) / n,
+        median=at[mid] if n % 2 else (at[mid - 1] + at[mid]) / 2,
+        mode=mode,
+        data_range=last - first,
         count=n,
     )
-    return (col, stats)
 
-def summarize_columns_parallel(records: Iterable[Any], numeric_columns: Iterable[Union[str, int]]) -> ResultSummary:
-    """Parallel version using multiprocessing"""
-    
-    # Convert to list if needed
-    records_list = list(records) if not isinstance(records, list) else records
+def summarize_columns_parallel(records: Iterable[Any], numeric_columns: Iterable[Union[str, int]],
+                               executor: Optional[SummaryExecutor] = None) -> ResultSummary:
+    """Parallel version using multiprocessing.
+
+    Columns are parsed once into float64 buffers in a single shared memory
+    block; each worker sorts one row chunk of every column and returns it as
+    a run-length encoded sorted run, and one k-way merge of the runs gives
+    the exact order statistics. Only a block name is pickled to the workers
+    and the parallelism is not capped at the column count.
+    Work runs on the shared default executor unless one is passed in.
+    """
     numeric_columns_list = list(numeric_columns)
-    
-    # Determine number of worker processes
-    num_workers = max(1, cpu_count() - 1)
-    
-    print(f"Multiprocessing: Using {num_workers} CPU cores to process {len(numeric_columns_list)} columns")
-    
-    # Creating a process pool
-    with Pool(processes=num_workers) as pool:
-        worker_func = partial(_process_single_column, records_list)
-        results = pool.map(worker_func, numeric_columns_list)
-    
-    stats_by_column = {col: stats for col, stats in results}
-    
-    print(f"Multiprocessing: Completed processing {len(stats_by_column)} columns")
-
-    return ResultSummary(stats_by_column=stats_by_column)
\ No newline at end of file
+    values = _collect_columns(records, numeric_columns_list)
+
+    executor = executor or default_executor()
+    num_workers = executor.workers
+
+    log.info("Multiprocessing: using %d CPU cores for %d columns", num_workers, len(numeric_columns_list))
+
+    stats_by_column = _summarize_on_pool(values, executor, num_workers)
+
+    log.info("Multiprocessing: completed %d columns", len(stats_by_column))
+
+    return ResultSummary(stats_by_column=stats_by_column)
+
+def _summarize_on_pool(values: Dict[Union[str, int], List[float]], executor: SummaryExecutor,
+                       num_workers: int) -> Dict[Union[str, int], ColumnStats]:
+    """Copy parsed columns into one shared memory block and summarize it in num_workers row chunks"""
+    layout, offset = [], 0
+    for col, vals in values.items():
+        layout.append((col, offset, len(vals)))
+        offset += 8 * len(vals)
+    shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+    try:
+        for (col, start, n) in layout:
+            shm.buf[start:start + 8 * n] = array("d", values[col]).tobytes()
+        # Workers attach to the block by name and send back only their sorted, run-length encoded chunks
+        partials = executor.starmap(_sort_shm_chunk, [(shm.name, layout, i, num_workers) for i in range(num_workers)])
+    finally:
+        shm.close()
+        shm.unlink()
+
+    return {col: _merge_sorted_runs([part[col] for part in partials]) for col in values}
+
+#--------------------New: cost-based plan selection----------------------------------
+_cost_model: Optional[CostModel] = None
+
+def default_cost_model() -> CostModel:
+    """CostModel calibrated once per process against the serial summary of one column"""
+    global _cost_model
+    if _cost_model is None:
+        _cost_model = CostModel.calibrated(_column_stats)
+    return _cost_model
+
+def summarize_auto(records: Iterable[Any], numeric_columns: Iterable[Union[str, int]], *,
+                   executor: Optional[SummaryExecutor] = None, cost_model: Optional[CostModel] = None,
+                   cores: Optional[int] = None) -> ResultSummary:
+    """Same result as summarize_columns, run serially, on threads or on the process pool.
+
+    The columns are parsed first; the plan is then chosen by the cost model
+    from the number of values and columns, the core count and whether the
+    worker pool is already warm, and logged with its estimated time.
+    """
+    columns = list(numeric_columns)
+    values = _collect_columns(records, columns)
+    n_values = sum(len(v) for v in values.values())
+    executor = executor or default_executor()
+    model = cost_model or default_cost_model()
+    plan = model.choose(n_values, len(values), cores or cpu_count(), executor.running, executor.workers)
+    log.info("Summarizing %d values in %d columns with plan %s", n_values, len(values), plan)
+
+    if plan.kind == "process":
+        stats_by_column = _summarize_on_pool(values, executor, plan.workers)
+    elif plan.kind == "thread":
+        with ThreadPoolExecutor(max_workers=plan.workers) as pool:
+            stats_by_column = dict(zip(values, pool.map(_column_stats, values.values())))
+    else:
+        stats_by_column = {col: _column_stats(vals) for col, vals in values.items()}
+    return ResultSummary(stats_by_column={col: stats_by_column[col] for col in columns})
+
+#--------------------New: mergeable partial summaries----------------------------------
+def _accumulator_stats(acc: StreamingStats) -> ColumnStats:
+    """ColumnStats from a merged accumulator, with the same tie rule as _column_stats"""
+    if not acc.count:
+        return ColumnStats(None, None, None, None, 0)
+    return ColumnStats(
+        mean=acc.mean(),
+        median=acc.median(),
+        mode=acc.mode(ties="smallest"),
+        data_range=acc.data_range(),
+        count=acc.count,
+    )
+
+def partial_summary(records: Iterable[Any], numeric_columns: Iterable[Union[str, int]]) -> Dict[Union[str, int], StreamingStats]:
+    """Per-column accumulators for one chunk of records; combine them with merge_partials"""
+    values = _collect_columns(records, list(numeric_columns))
+    return {col: StreamingStats().update_many(vals) for col, vals in values.items()}
+
+def merge_partials(partials: Iterable[Dict[Union[str, int], StreamingStats]]) -> ResultSummary:
+    """Fold per-chunk accumulators (from files, chunks or processes) into one ResultSummary"""
+    merged: Dict[Union[str, int], StreamingStats] = {}
+    for part in partials:
+        for col, acc in part.items():
+            merged.setdefault(col, StreamingStats()).merge(acc)
+    return ResultSummary(stats_by_column={col: _accumulator_stats(acc) for col, acc in merged.items()})
+
+#--------------------New: covariance and correlation----------------------------------
+def _table_column(table: WeatherTable, name: Union[str, int]) -> NumericColumn:
+    column = table.columns.get(name)
+    if column is None:
+        return NumericColumn(values=array('d', bytes(8 * len(table))), nulls=bytearray(b"\x01" * len(table)))
+    if isinstance(column, NumericColumn):
+        return column
+    # Text column: parse each category once
+    parsed = _parse_floats(column.categories, name)
+    return NumericColumn(values=array('d', (parsed.values[c] for c in column.codes)),
+                         nulls=bytearray(parsed.nulls[c] for c in column.codes))
+
+def _aligned_batches(records: Iterable[Any], columns: Sequence[Union[str, int]], batch_rows: int) -> Iterator[List[NumericColumn]]:
+    """Every column parsed batch_rows records at a time, keeping one slot per row so rows line up across columns"""
+    if isinstance(records, WeatherTable):
+        full = [_table_column(records, c) for c in columns]
+        for start in range(0, len(records) if columns else 0, batch_rows):
+            end = start + batch_rows
+            yield [NumericColumn(values=c.values[start:end], nulls=c.nulls[start:end]) for c in full]
+        return
+    it = iter(records)
+    first = next(it, None)
+    if first is None or not columns:
+        return
+    extractors = [_cell_extractor(first, c) for c in columns]
+    rows = chain([first], it)
+    if any(has_header for _, has_header in extractors):
+        next(rows)
+    while chunk := list(islice(rows, batch_rows)):
+        yield [_parse_floats(extract(chunk), c) for (extract, _), c in zip(extractors, columns)]
+
+def _comoment_batch(columns: List[Union[str, int]], batch: List[NumericColumn]) -> CoMoments:
+    return CoMoments(columns).update_columns([(c.values, c.nulls) for c in batch])
+
+def partial_comoments(records: Iterable[Any], numeric_columns: Iterable[Union[str, int]], *,
+                      batch_rows: int = SKETCH_BATCH_ROWS) -> CoMoments:
+    """Pairwise co-moments for one chunk of records; combine them with CoMoments.merge"""
+    columns = list(dict.fromkeys(numeric_columns))
+    acc = CoMoments(columns)
+    for batch in _aligned_batches(records, columns, batch_rows):
+        acc.merge(_comoment_batch(columns, batch))
+    return acc
+
+def comoments_matrix(acc: CoMoments) -> CorrelationMatrix:
+    cols = acc.columns
+    return CorrelationMatrix(
+        columns=list(cols),
+        counts=[[acc.count(a, b) for b in cols] for a in cols],
+        covariance=[[acc.covariance(a, b) for b in cols] for a in cols],
+        correlation=[[acc.correlation(a, b) for b in cols] for a in cols],
+    )
+
+def correlation_matrix(records: Iterable[Any], numeric_columns: Iterable[Union[str, int]], *,
+                       parallel: bool = False, executor: Optional[SummaryExecutor] = None,
+                       batch_rows: int = SKETCH_BATCH_ROWS) -> CorrelationMatrix:
+    """Covariance and correlation of every pair of columns from a single pass over the records.
+
+    Each pair uses the rows where both of its columns are present. Records are
+    parsed batch_rows at a time and each batch is reduced to co-moments (on the
+    worker pool when parallel=True) before the batches are merged.
+    """
+    columns = list(dict.fromkeys(numeric_columns))
+    if not parallel:
+        return comoments_matrix(partial_comoments(records, columns, batch_rows=batch_rows))
+    executor = executor or default_executor()
+    acc = CoMoments(columns)
+    # Batches are parsed only as workers free up, and each result is merged as it arrives
+    tasks = ((columns, batch) for batch in _aligned_batches(records, columns, batch_rows))
+    for part in executor.starmap_unordered(_comoment_batch, tasks):
+        acc.merge(part)
+    return comoments_matrix(acc)
+
+#--------------------New: group-by hash aggregation----------------------------------
+GROUP_CHUNK_ROWS = 50_000
+# Merged groups kept in memory before they are spilled to temp files
+GROUP_SPILL_LIMIT = 100_000
+
+def _group_chunk(rows: List[tuple], n_keys: int, columns: Sequence[Union[str, int]]) -> Dict[tuple, Dict[Union[str, int], StreamingStats]]:
+    """Hash-aggregate one chunk of (key..., value...) tuples into per-group accumulators"""
+    groups: Dict[tuple, List[List[float]]] = {}
+    n_cols = len(columns)
+    parsers = [parser_for(c).parse for c in columns]
+    for row in rows:
+        key = row[:n_keys]
+        vals = groups.get(key)
+        if vals is None:
+            vals = groups[key] = [[] for _ in range(n_cols)]
+        for lst, parse, v in zip(vals, parsers, row[n_keys:]):
+            num = parse(v)
+            if num is not None:
+                lst.append(num)
+    return {
+        key: {col: StreamingStats().update_many(lst) for col, lst in zip(columns, vals)}
+        for key, vals in groups.items()
+    }
+
+class _GroupTable:
+    """Merged per-group accumulators that spill to disk past `limit` groups.
+
+    A spill hash-partitions the groups into temp files, so at the end each
+    partition is merged on its own and only one partition is held at a time.
+    """
+
+    def __init__(self, limit: int, partitions: int = 16) -> None:
+        self.limit = limit
+        self.partitions = partitions
+        self.groups: Dict[tuple, Dict[Union[str, int], StreamingStats]] = {}
+        self._files: Optional[list] = None
+
+    def merge(self, partial: Dict[tuple, Dict[Union[str, int], StreamingStats]]) -> None:
+        for key, accs in partial.items():
+            target = self.groups.get(key)
+            if target is None:
+                self.groups[key] = accs
+            else:
+                for col, acc in accs.items():
+                    target[col].merge(acc)
+        if len(self.groups) > self.limit:
+            self._spill()
+
+    def _spill(self) -> None:
+        if self._files is None:
+            self._files = [tempfile.TemporaryFile() for _ in range(self.partitions)]
+        for key, accs in self.groups.items():
+            states = {col: acc.to_state() for col, acc in accs.items()}
+            pickle.dump((key, states), self._files[hash(key) % self.partitions])
+        log.info("Spilled %d groups to disk", len(self.groups))
+        self.groups = {}
+
+    def items(self) -> Iterator[tuple]:
+        if self._files is None:
+            yield from self.groups.items()
+            return
+        self._spill()
+        for f in self._files:
+            f.seek(0)
+            merged: Dict[tuple, Dict[Union[str, int], StreamingStats]] = {}
+            while True:
+                try:
+                    key, states = pickle.load(f)
+                except EOFError:
+                    break
+                accs = {col: StreamingStats.from_state(st) for col, st in states.items()}
+                target = merged.get(key)
+                if target is None:
+                    merged[key] = accs
+                else:
+                    for col, acc in accs.items():
+                        target[col].merge(acc)
+            f.close()
+            yield from merged.items()
+        self._files = None
+
+def _group_rows(records: Iterable[Any], by: Sequence[str], columns: Sequence[Union[str, int]], chunk_rows: int) -> Iterator[List[tuple]]:
+    """Project each record to a (key..., value...) tuple, in chunks of chunk_rows"""
+    chunk: List[tuple] = []
+    for rec in records:
+        get = (rec.row if hasattr(rec, "row") else rec).get
+        chunk.append(tuple([(get(k) or "").strip() for k in by] + [get(c, "") for c in columns]))
+        if len(chunk) >= chunk_rows:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def summarize_groups(records: Iterable[Any], by: Union[str, Sequence[str]], numeric_columns: Iterable[Union[str, int]], *,
+                     parallel: bool = False, executor: Optional[SummaryExecutor] = None,
+                     chunk_rows: int = GROUP_CHUNK_ROWS, spill_limit: int = GROUP_SPILL_LIMIT) -> GroupedSummary:
+    """Summarize numeric columns per distinct value of the `by` column(s) in one pass.
+
+    Rows are hash-aggregated chunk by chunk into mergeable accumulators (on the
+    worker pool when parallel=True), and the merged group table spills to disk
+    once it holds more than spill_limit groups. Groups come back sorted by key.
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    columns = list(numeric_columns)
+    chunks = _group_rows(records, by, columns, chunk_rows)
+    table = _GroupTable(spill_limit)
+    if parallel:
+        executor = executor or default_executor()
+        # Chunks are read lazily, a few per worker at a time, and each partial is merged as it lands
+        tasks = ((chunk, len(by), columns) for chunk in chunks)
+        for partial in executor.starmap_unordered(_group_chunk, tasks):
+            table.merge(partial)
+    else:
+        for chunk in chunks:
+            table.merge(_group_chunk(chunk, len(by), columns))
+
+    groups = {
+        key: ResultSummary(stats_by_column={col: _accumulator_stats(acc) for col, acc in accs.items()})
+        for key, accs in table.items()
+    }
+    return GroupedSummary(by=by, groups=dict(sorted(groups.items())))
+
+#--------------------New: rolling windows----------------------------------
+def _window_stats(win: RollingWindow) -> ColumnStats:
+    return ColumnStats(
+        mean=win.mean(),
+        median=None,
+        mode=None,
+        data_range=win.data_range(),
+        count=win.count,
+        minimum=win.minimum(),
+        maximum=win.maximum(),
+        total=win.total if win.count else None,
+    )
+
+def rolling_stats(records: Iterable[Any], numeric_columns: Iterable[Union[str, int]], window: int, *,
+                  by: Optional[str] = "Location") -> Iterator[Tuple[str, Dict[Union[str, int], ColumnStats]]]:
+    """Statistics over the last `window` rows of each `by` value, one result per input row.
+
+    Streams the records once, in order, yielding (key, {column: ColumnStats})
+    where the stats cover the current row and the window - 1 rows before it
+    with the same key (all rows when by is None). Each row costs O(1) per
+    column; median and mode are not kept and are always None.
+    """
+    columns = list(numeric_columns)
+    parsers = [parser_for(c).parse for c in columns]
+    windows: Dict[str, List[RollingWindow]] = {}
+    for rec in records:
+        get = (rec.row if hasattr(rec, "row") else rec).get
+        key = (get(by) or "").strip() if by is not None else ""
+        wins = windows.get(key)
+        if wins is None:
+            wins = windows[key] = [RollingWindow(window) for _ in columns]
+        yield key, {c: _window_stats(win.push(parse(get(c, "")))) for c, win, parse in zip(columns, wins, parsers)}
+
+#--------------------New: incremental summaries of append-only files----------------------------------
+def summarize_incremental(path: Union[str, Path], store: "FileStore", numeric_columns: Optional[Sequence[str]] = None, *,
+                          sketch: bool = False, encoding: str = 'utf-8') -> ResultSummary:
+    """Summary of a growing CSV that only parses the rows appended since the last call.
+
+    The accumulators (StreamingStats, or ColumnSketches with sketch=True), the
+    byte offset reached and a fingerprint of the consumed prefix are saved
+    with store.save_state. If the prefix no longer matches (the file was
+    rewritten rather than appended to), or the columns or mode changed, the
+    summary is rebuilt from the first row. Compressed inputs cannot be
+    resumed at a byte offset and are always summarized in full.
+    """
+    try:
+        from .data_fetcher import read_csv_tail, iter_csv_records, detect_compression
+        from .data_cache import prefix_fingerprint
+    except ImportError:
+        from data_fetcher import read_csv_tail, iter_csv_records, detect_compression
+        from data_cache import prefix_fingerprint
+
+    path = Path(path)
+    if detect_compression(path) is not None:
+        log.info("%s is compressed; summarizing it in full", path)
+        records = iter_csv_records(path, encoding=encoding)
+        first = next(records, None)
+        columns = list(numeric_columns or (first.keys() if first else []))
+        return summarize_columns(chain([first], records) if first else [], columns, sketch=sketch)
+
+    kind = "sketch" if sketch else "exact"
+    acc_type = ColumnSketch if sketch else StreamingStats
+    state = store.load_state()
+    accs, offset = None, 0
+    if state and state.get("kind") == kind and (numeric_columns is None or list(numeric_columns) == state["columns"]):
+        consumed = state["offset"]
+        if path.stat().st_size >= consumed and prefix_fingerprint(path, consumed) == state["prefix"]:
+            accs = {col: acc_type.from_state(st) for col, st in zip(state["columns"], state["accumulators"])}
+            offset = consumed
+        else:
+            log.info("%s changed before the saved offset; summarizing from the start", path)
+
+    header, chunks = read_csv_tail(path, offset, encoding=encoding)
+    if accs is None:
+        columns = list(numeric_columns or header)
+        accs = {col: acc_type() for col in columns}
+    columns = list(accs)
+    # Each chunk of the tail is folded in as it is read, so the appended rows are never all held at once
+    summarize = sketch_summary if sketch else partial_summary
+    end, n_rows, unterminated = offset, 0, []
+    for rows, chunk_end in chunks:
+        if chunk_end is None:
+            unterminated = rows
+            continue
+        end = chunk_end
+        if not rows:
+            continue
+        new = summarize(rows, columns)
+        for col in columns:
+            accs[col].merge(new[col])
+        n_rows += len(rows)
+    log.info("Folded %d new rows from %s (bytes %d-%d)", n_rows, path, offset, end)
+
+    store.save_state({
+        "kind": kind,
+        "columns": columns,
+        "offset": end,
+        "prefix": prefix_fingerprint(path, end),
+        # a list, not a dict, so integer column keys survive the JSON round trip
+        "accumulators": [accs[col].to_state() for col in columns],
+    })
+    if unterminated:
+        # Counted like summarize_columns would, but left out of the saved state so the next run re-reads it
+        log.info("Counted %d row(s) after the last line break of %s without consuming them", len(unterminated), path)
+        new = summarize(unterminated, columns)
+        for col in columns:
+            accs[col].merge(new[col])
+    to_stats = _sketch_stats if sketch else _accumulator_stats
+    return ResultSummary(stats_by_column={col: to_stats(accs[col]) for col in columns})
@@ -1,14 +1,14 @@
 from pathlib import Path
 import json, logging
-from typing import Union
+from typing import Any, Dict, Optional, Union
 import aiofiles
 
 log = logging.getLogger(__name__)
 
 try:
-    from .models import ResultSummary
+    from .models import ResultSummary, CorrelationMatrix
 except ImportError:
-    from models import ResultSummary
+    from models import ResultSummary, CorrelationMatrix
 
 
 class FileStore:
@@ -54,4 +54,51 @@ class FileStore:
         except OSError:
             log.exception("Failed to write summary to %s", out)
             raise
-        
\ No newline at end of file
+
+#------------------------------New: correlation matrix-----------------------------------------
+    @property
+    def correlation_file(self) -> Path:
+        return self.out_file.with_name(self.out_file.stem + ".correlation.json")
+
+    def save_correlation(self, matrix: CorrelationMatrix) -> Path:
+        out = self.correlation_file
+        tmp = out.with_name(out.name + ".tmp")
+        try:
+            with tmp.open('w', encoding='utf-8') as f:
+                json.dump(matrix.to_dict(), f, indent=2)
+            tmp.replace(out)
+            log.info("Wrote correlation matrix to %s", out.resolve())
+            return out
+        except OSError:
+            log.exception("Failed to write correlation matrix to %s", out)
+            raise
+
+#------------------------------New: incremental state-----------------------------------------
+    @property
+    def state_file(self) -> Path:
+        """Accumulator state for incremental runs, saved next to the summary"""
+        return self.out_file.with_name(self.out_file.stem + ".state.json")
+
+    def save_state(self, state: Dict[str, Any]) -> Path:
+        out = self.state_file
+        tmp = out.with_name(out.name + ".tmp")
+        try:
+            with tmp.open('w', encoding='utf-8') as f:
+                json.dump(state, f)
+            tmp.replace(out)
+            log.info("Wrote summary state to %s", out.resolve())
+            return out
+        except OSError:
+            log.exception("Failed to write summary state to %s", out)
+            raise
+
+    def load_state(self) -> Optional[Dict[str, Any]]:
+        """Saved state, or None if there is none or it cannot be read"""
+        try:
+            with self.state_file.open('r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            log.warning("Ignoring unreadable summary state %s", self.state_file)
+            return None
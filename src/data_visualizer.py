@@ -1,90 +1,122 @@
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Optional, Sequence, Union
 from functools import reduce
+from itertools import compress
+from array import array
 import matplotlib.pyplot as plt 
 import os
 import asyncio
 
 try:
-    from.models import WeatherRecord
+    from.models import WeatherRecord, WeatherTable, NumericColumn
+    from .query import Query, col
+    from .parsing import parser_for
 except ImportError:
-    from models import WeatherRecord
+    from models import WeatherRecord, WeatherTable, NumericColumn
+    from query import Query, col
+    from parsing import parser_for
+
     
+HOT_THRESHOLD = 25.0
+COLD_THRESHOLD = 15.0
+
+#---------- New: shared analysis view--------------------------------
+def _table_numbers(table: WeatherTable, name: str) -> List[Optional[float]]:
+    column = table.columns.get(name)
+    if column is None:
+        return [None] * len(table)
+    if isinstance(column, NumericColumn):
+        return [None if missing else v for v, missing in zip(column.values, column.nulls)]
+    parse = parser_for(name).parse
+    parsed = [parse(c) for c in column.categories]
+    return [parsed[c] for c in column.codes]
+
+def _table_text(table: WeatherTable, name: str) -> List[str]:
+    column = table.columns.get(name)
+    if column is None:
+        return [""] * len(table)
+    if isinstance(column, NumericColumn):
+        return [column.text(i) for i in range(len(column))]
+    stripped = [c.strip() for c in column.categories]
+    return [stripped[c] for c in column.codes]
+
+
+class AnalysisView:
+    """Typed MaxTemp/MinTemp/Rainfall columns and hot, cold, rainy and dry day masks.
+
+    Built in one pass over the records (or straight from a WeatherTable's typed
+    columns), so the charts and the summary never re-parse cells. Values follow
+    the extract_* rules (missing reads as 0.0) and masks the filter_* rules
+    (a missing MaxTemp is neither hot nor cold).
+    """
+
+    def __init__(self, records: Union[Sequence[WeatherRecord], WeatherTable],
+                 hot_threshold: float = HOT_THRESHOLD, cold_threshold: float = COLD_THRESHOLD) -> None:
+        self.hot_threshold = hot_threshold
+        self.cold_threshold = cold_threshold
+        if isinstance(records, WeatherTable):
+            rows = zip(_table_numbers(records, 'MaxTemp'), _table_numbers(records, 'MinTemp'),
+                       _table_numbers(records, 'Rainfall'), _table_text(records, 'RainToday'))
+        else:
+            max_p, min_p, rain_p = (parser_for(c).parse for c in ('MaxTemp', 'MinTemp', 'Rainfall'))
+            rows = ((max_p(r.get('MaxTemp', "")), min_p(r.get('MinTemp', "")), rain_p(r.get('Rainfall', "")),
+                     (r.get('RainToday') or "").strip())
+                    for r in (rec.row if hasattr(rec, "row") else rec for rec in records))
+        self.max_temps, self.min_temps, self.rainfall = array('d'), array('d'), array('d')
+        self.hot, self.cold, self.rainy, self.dry = bytearray(), bytearray(), bytearray(), bytearray()
+        for mx, mn, rain, today in rows:
+            self.max_temps.append(0.0 if mx is None else mx)
+            self.min_temps.append(0.0 if mn is None else mn)
+            self.rainfall.append(0.0 if rain is None else rain)
+            self.hot.append(mx is not None and mx > hot_threshold)
+            self.cold.append(mx is not None and mx < cold_threshold)
+            self.rainy.append(today == "Yes")
+            self.dry.append(today == "No")
+
+    def __len__(self) -> int:
+        return len(self.max_temps)
+
+    @staticmethod
+    def select(values: Sequence[float], mask: Optional[bytearray] = None) -> List[float]:
+        """Values of the rows in mask (every row when mask is None)"""
+        return list(values) if mask is None else list(compress(values, mask))
+
+
+def analysis_view(records: Union[Sequence[WeatherRecord], WeatherTable], view: Optional[AnalysisView] = None) -> AnalysisView:
+    return view if view is not None else AnalysisView(records)
+
 #---------- Data Filtering Function--------------------------------
 
+# Filters and extractors are lazy queries; the Query API parses each cell once per pass.
+# Cells follow parsing.parse_number: "1,200" reads as 1200.0, and "nan"/"NA" count as missing
 def filter_hot_days(records: List[WeatherRecord], threshold: float = 25.0) -> List[WeatherRecord]:
     # Filter through the weather record to find the max temp threshold 🔥
-    
-    def is_hot(record: WeatherRecord) -> bool:
-        try:
-            # Get the max temp from the records row dictionary
-            max_temp_string = record.row.get('MaxTemp', '')
-            if not max_temp_string: 
-                return False
-            max_temp = float(max_temp_string)
-            return max_temp > threshold # True if its hot, otherwise its False
-        except (ValueError, TypeError):
-            return False
-    return list(filter(is_hot, records))
+    # Missing or unreadable MaxTemp never counts as hot
+    return Query(records).where(col('MaxTemp') > threshold).records()
 
 def filter_cold_days(records: List[WeatherRecord], threshold: float = 15.0) -> List[WeatherRecord]:
     # Filter through the weather record to find the lowest temp threshold 🥶
-    
-    def is_cold(record: WeatherRecord) -> bool:
-        try:
-            # Get the lowest temp from the records row dictionary
-            max_temp_string = record.row.get('MaxTemp', '')
-            if not max_temp_string: 
-                return False
-            max_temp = float(max_temp_string)
-            return max_temp < threshold # True if its cold, otherwise its False
-        except (ValueError, TypeError):
-            return False
-    return list(filter(is_cold, records))
+    return Query(records).where(col('MaxTemp') < threshold).records()
         
 def filter_rainy_days(records: List[WeatherRecord]) -> List[WeatherRecord]:
     # Filter through to find the nice rainy days
-    return list(filter(lambda rec: rec.row.get('RainToday', '').strip() =="Yes", records))
+    return Query(records).where(col('RainToday') == "Yes").records()
 
 def filter_dry_days(records: List[WeatherRecord]) -> List[WeatherRecord]:
     # Filter through to find the dry days
-    return list(filter(lambda rec: rec.row.get('RainToday', '').strip() == 'No', records))
+    return Query(records).where(col('RainToday') == 'No').records()
 
 #-------------------- Data Extraction Functions --------------------------
 def extract_max_temps(records: List[WeatherRecord]) -> List[float]:
-    # Use map to extract the MaxTemp from each of the records
-    def get_max_temp(record: WeatherRecord) -> float:
-        try:
-            temp_string = record.row.get('MaxTemp', '')
-            if not temp_string:
-                return 0.0 #Default in case its missing
-            return float(temp_string)
-        except (ValueError, TypeError):
-            return 0.0
-    return list(map(get_max_temp, records))
+    # Extract the MaxTemp from each of the records, 0.0 is the default in case its missing
+    return Query(records).values('MaxTemp', default=0.0)
 
 def extract_min_temps(records: List[WeatherRecord]) -> List[float]:
-    # Use map to extract the MinTemp from each of the records
-    def get_min_temp(record: WeatherRecord) -> float:
-        try:
-            temp_string = record.row.get('MinTemp', '')
-            if not temp_string:
-                return 0.0 #Default in case its missing
-            return float(temp_string)
-        except (ValueError, TypeError):
-            return 0.0
-    return list(map(get_min_temp, records))
+    # Extract the MinTemp from each of the records
+    return Query(records).values('MinTemp', default=0.0)
 
 def extract_rainfall(records: List[WeatherRecord]) -> List[float]:
-    # Use map to extract rain fall from each of the records
-    def get_rainfall(record: List[WeatherRecord]) -> float:
-        try:
-            rain_string = record.row.get('Rainfall', '')
-            if not rain_string:
-                return 0.0 #Default in case its missing
-            return float(rain_string)
-        except (ValueError, TypeError):
-            return 0.0
-    return list(map(get_rainfall, records))
+    # Extract rain fall from each of the records
+    return Query(records).values('Rainfall', default=0.0)
 
 #----------------------Aggregation Functions------------------------------------
 
@@ -124,15 +156,13 @@ async def async_save_plot(output_path: str, fig=None, dpi: int = 300) -> str:
     
 #----------------Visualization Functions (edited for phase 7 async) 🙂----------------------------------------
 
-def plot_hot_vs_cold_comparison(records: List[WeatherRecord], output_path: str = "hot_vs_cold.png") -> Dict[str, Any]:
+def plot_hot_vs_cold_comparison(records: List[WeatherRecord], output_path: str = "hot_vs_cold.png", view: Optional[AnalysisView] = None) -> Dict[str, Any]:
     # This creates a line chart comparing the hot and cold days
     print("Creating Hot vs Cold comparison chart:  ")
     
-    hot_days = filter_hot_days(records, threshold=25.0)
-    cold_days = filter_cold_days(records, threshold=15.0)
-    
-    hot_temps = extract_max_temps(hot_days)
-    cold_temps = extract_max_temps(cold_days)
+    view = analysis_view(records, view)
+    hot_temps = view.select(view.max_temps, view.hot)
+    cold_temps = view.select(view.max_temps, view.cold)
     
     average_hot = calculate_average_temp(hot_temps) if hot_temps else 0
     average_cold = calculate_average_temp(cold_temps) if cold_temps else 0
@@ -181,26 +211,24 @@ def plot_hot_vs_cold_comparison(records: List[WeatherRecord], output_path: str =
     
     # Return the statistics results
     return {
-        "hot_day_count": len(hot_days),
-        "cold_day_count": len(cold_days),
+        "hot_day_count": len(hot_temps),
+        "cold_day_count": len(cold_temps),
         "average_hot_temp": average_hot,
         "average_cold_days": average_cold,
         "chart_path": output_path
     }
     
-def plot_rainy_vs_dry_comparison(records: List[WeatherRecord], output_path: str = "rain_vs_dry.png") -> Dict[str, Any]:
+def plot_rainy_vs_dry_comparison(records: List[WeatherRecord], output_path: str = "rain_vs_dry.png", view: Optional[AnalysisView] = None) -> Dict[str, Any]:
     # This will show patterns and temperature differences between
     # rainy vs dry periods
     
     print("Creating rainy vs dry comparison chart:  ")
     
-    rainy_days = filter_rainy_days(records)
-    dry_days = filter_dry_days(records)
-    
-    rainy_amounts = extract_rainfall(rainy_days)
+    view = analysis_view(records, view)
+    rainy_amounts = view.select(view.rainfall, view.rainy)
     
-    rainy_temps = extract_max_temps(rainy_days)
-    dry_temps = extract_max_temps(dry_days)
+    rainy_temps = view.select(view.max_temps, view.rainy)
+    dry_temps = view.select(view.max_temps, view.dry)
     
     total_rainfall = calculate_total_rainfall(rainy_amounts)
     average_rainy_temp = calculate_average_temp(rainy_temps) if rainy_temps else 0
@@ -245,8 +273,8 @@ def plot_rainy_vs_dry_comparison(records: List[WeatherRecord], output_path: str
     
     
     return {
-        'rainy_day_count': len(rainy_days),
-        'dry_day_count': len(dry_days),
+        'rainy_day_count': len(rainy_temps),
+        'dry_day_count': len(dry_temps),
         'total_rainfall': total_rainfall,
         'average_rainy_temp': average_rainy_temp,
         "average_dry_temp": average_dry_temp,
@@ -265,15 +293,16 @@ def analyze_and_visualize(records: List[WeatherRecord], output_directory: str =
     
     #Chart 1. Hot vs cold days
     print("Analyzing hot vs cold temperature patterns:  ")
-    hot_cold_stats = plot_hot_vs_cold_comparison(records, hot_cold_path)
+    view = AnalysisView(records)
+    hot_cold_stats = plot_hot_vs_cold_comparison(records, hot_cold_path, view)
     
     # Chart 2. rainy vs dry days
     print("\n Analyzing rainy vs dry weather patterns:  ")
-    rainy_dry_stats = plot_rainy_vs_dry_comparison(records, rainy_dry_path)
+    rainy_dry_stats = plot_rainy_vs_dry_comparison(records, rainy_dry_path, view)
     
     print("\n Computing additional statistics using map/filter/reduce")
     
-    all_max_temps = extract_max_temps(records)
+    all_max_temps = view.select(view.max_temps)
     overall_average = calculate_average_temp(all_max_temps)
     
     very_hot_count = count_days_above_threshold(all_max_temps, 30.0)
@@ -315,15 +344,13 @@ def analyze_and_visualize(records: List[WeatherRecord], output_directory: str =
 
 #================================ASYNC VERSION PHASE 7===============================================================
 
-async def async_plot_hot_vs_cold_comparison(records: List[WeatherRecord], output_path: str = "hot_vs_cold.png") -> Dict[str, Any]:
+async def async_plot_hot_vs_cold_comparison(records: List[WeatherRecord], output_path: str = "hot_vs_cold.png", view: Optional[AnalysisView] = None) -> Dict[str, Any]:
     # This creates a line chart comparing the hot and cold days
     print("Creating Hot vs Cold comparison chart:  ")
     
-    hot_days = filter_hot_days(records, threshold=25.0)
-    cold_days = filter_cold_days(records, threshold=15.0)
-    
-    hot_temps = extract_max_temps(hot_days)
-    cold_temps = extract_max_temps(cold_days)
+    view = analysis_view(records, view)
+    hot_temps = view.select(view.max_temps, view.hot)
+    cold_temps = view.select(view.max_temps, view.cold)
     
     average_hot = calculate_average_temp(hot_temps) if hot_temps else 0
     average_cold = calculate_average_temp(cold_temps) if cold_temps else 0
@@ -372,26 +399,24 @@ async def async_plot_hot_vs_cold_comparison(records: List[WeatherRecord], output
     
     # Return the statistics results
     return {
-        "hot_day_count": len(hot_days),
-        "cold_day_count": len(cold_days),
+        "hot_day_count": len(hot_temps),
+        "cold_day_count": len(cold_temps),
         "average_hot_temp": average_hot,
         "average_cold_days": average_cold,
         "chart_path": output_path
     }
     
-async def async_plot_rainy_vs_dry_comparison(records: List[WeatherRecord], output_path: str = "rain_vs_dry.png") -> Dict[str, Any]:
+async def async_plot_rainy_vs_dry_comparison(records: List[WeatherRecord], output_path: str = "rain_vs_dry.png", view: Optional[AnalysisView] = None) -> Dict[str, Any]:
     # This will show patterns and temperature differences between
     # rainy vs dry periods
     
     print("Creating rainy vs dry comparison chart:  ")
     
-    rainy_days = filter_rainy_days(records)
-    dry_days = filter_dry_days(records)
-    
-    rainy_amounts = extract_rainfall(rainy_days)
+    view = analysis_view(records, view)
+    rainy_amounts = view.select(view.rainfall, view.rainy)
     
-    rainy_temps = extract_max_temps(rainy_days)
-    dry_temps = extract_max_temps(dry_days)
+    rainy_temps = view.select(view.max_temps, view.rainy)
+    dry_temps = view.select(view.max_temps, view.dry)
     
     total_rainfall = calculate_total_rainfall(rainy_amounts)
     average_rainy_temp = calculate_average_temp(rainy_temps) if rainy_temps else 0
@@ -435,8 +460,8 @@ async def async_plot_rainy_vs_dry_comparison(records: List[WeatherRecord], outpu
     await async_save_plot(output_path)
     
     return {
-        'rainy_day_count': len(rainy_days),
-        'dry_day_count': len(dry_days),
+        'rainy_day_count': len(rainy_temps),
+        'dry_day_count': len(dry_temps),
         'total_rainfall': total_rainfall,
         'average_rainy_temp': average_rainy_temp,
         "average_dry_temp": average_dry_temp,
@@ -456,15 +481,16 @@ async def async_analyze_and_visualize(records: List[WeatherRecord], output_direc
     
     # Creating both charts concurrently
     print("Creating both charts concurrently...")
+    view = AnalysisView(records)
     hot_cold_stats, rainy_dry_stats = await asyncio.gather(
-        async_plot_hot_vs_cold_comparison(records, hot_cold_path),
-        async_plot_rainy_vs_dry_comparison(records, rainy_dry_path)
+        async_plot_hot_vs_cold_comparison(records, hot_cold_path, view),
+        async_plot_rainy_vs_dry_comparison(records, rainy_dry_path, view)
     )
     
     
     print("\n Computing additional statistics using map/filter/reduce")
     
-    all_max_temps = extract_max_temps(records)
+    all_max_temps = view.select(view.max_temps)
     overall_average = calculate_average_temp(all_max_temps)
     
     very_hot_count = count_days_above_threshold(all_max_temps, 30.0)
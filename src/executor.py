@@ -0,0 +1,229 @@
+import atexit
+import logging
+import multiprocessing
+import queue
+import random
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from multiprocessing import Pool, cpu_count, resource_tracker
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence
+
+log = logging.getLogger(__name__)
+
+
+def default_workers() -> int:
+    """Leave one core for the parent process"""
+    return max(1, cpu_count() - 1)
+
+
+_END = object()
+
+
+class SummaryExecutor:
+    """Long-lived process pool shared by the parallel parse and summarize steps.
+
+    The pool is started on first use and then reused, so repeated calls (many
+    small files, a long-running service) pay process start-up only once. Every
+    call takes an optional timeout; a call that times out terminates the pool,
+    which is started afresh by the next call.
+    """
+
+    def __init__(self, workers: Optional[int] = None, timeout: Optional[float] = None) -> None:
+        if workers is not None and workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.workers = workers or default_workers()
+        self.timeout = timeout
+        self._pool = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._pool is not None
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                # Start the tracker before forking so workers and parent share it
+                # and shared memory unlinked by the parent is not reported as leaked
+                resource_tracker.ensure_running()
+                self._pool = Pool(processes=self.workers)
+                log.info("Started worker pool with %d processes", self.workers)
+            return self._pool
+
+    def _wait(self, pending, timeout: Optional[float]):
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            return pending.get(timeout)
+        except multiprocessing.TimeoutError:
+            log.error("Worker task timed out after %ss; restarting the pool", timeout)
+            self.terminate()
+            raise TimeoutError(f"worker task did not finish within {timeout}s") from None
+
+    # --------------- Running work ------------------------------
+    def apply(self, fn: Callable, args: Sequence = (), timeout: Optional[float] = None) -> Any:
+        return self._wait(self._get_pool().apply_async(fn, tuple(args)), timeout)
+
+    def map(self, fn: Callable, items: Iterable, timeout: Optional[float] = None) -> List[Any]:
+        return self._wait(self._get_pool().map_async(fn, items), timeout)
+
+    def starmap(self, fn: Callable, tasks: Iterable[Sequence], timeout: Optional[float] = None) -> List[Any]:
+        return self._wait(self._get_pool().starmap_async(fn, tasks), timeout)
+
+    def istarmap(self, fn: Callable, tasks: Iterable[Sequence], window: Optional[int] = None,
+                 timeout: Optional[float] = None) -> Iterator[Any]:
+        """fn(*task) results in input order, pulling tasks lazily with at most `window` in flight"""
+        window = window or 2 * self.workers
+        pool = self._get_pool()
+        tasks = iter(tasks)
+        pending: deque = deque()
+        for task in tasks:
+            pending.append(pool.apply_async(fn, tuple(task)))
+            if len(pending) >= window:
+                break
+        while pending:
+            result = self._wait(pending.popleft(), timeout)
+            task = next(tasks, _END)
+            if task is not _END:
+                pending.append(pool.apply_async(fn, tuple(task)))
+            yield result
+
+    def starmap_unordered(self, fn: Callable, tasks: Iterable[Sequence], window: Optional[int] = None,
+                          timeout: Optional[float] = None) -> Iterator[Any]:
+        """fn(*task) results in completion order, pulling tasks lazily with at most `window` in flight.
+
+        window defaults to two tasks per worker, so a large or unbounded task
+        generator is never materialized and each result can be consumed (and
+        freed) as soon as it arrives. timeout applies to each result.
+        """
+        window = window or 2 * self.workers
+        timeout = self.timeout if timeout is None else timeout
+        pool = self._get_pool()
+        done: queue.Queue = queue.Queue()
+        tasks = iter(tasks)
+        in_flight = 0
+        while True:
+            while in_flight < window:
+                task = next(tasks, _END)
+                if task is _END:
+                    break
+                pool.apply_async(fn, tuple(task), callback=lambda r: done.put((True, r)),
+                                 error_callback=lambda e: done.put((False, e)))
+                in_flight += 1
+            if not in_flight:
+                return
+            try:
+                ok, result = done.get(timeout=timeout)
+            except queue.Empty:
+                log.error("Worker task timed out after %ss; restarting the pool", timeout)
+                self.terminate()
+                raise TimeoutError(f"worker task did not finish within {timeout}s") from None
+            in_flight -= 1
+            if not ok:
+                raise result
+            yield result
+
+    # --------------- Shutdown ------------------------------
+    def close(self) -> None:
+        """Let queued work finish, then stop the workers"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    def terminate(self) -> None:
+        """Stop the workers immediately, abandoning queued work"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+    def __enter__(self) -> "SummaryExecutor":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+_default: Optional[SummaryExecutor] = None
+_default_lock = threading.Lock()
+
+
+def default_executor() -> SummaryExecutor:
+    """Process-wide shared executor, closed automatically at interpreter exit"""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = SummaryExecutor()
+            atexit.register(_default.close)
+        return _default
+
+
+#--------------------New: choosing serial, thread or process execution--------------------
+def _gil_enabled() -> bool:
+    return getattr(sys, "_is_gil_enabled", lambda: True)()
+
+
+@dataclass(frozen=True)
+class ExecutionPlan:
+    kind: str  # "serial", "thread" or "process"
+    workers: int
+    estimated_seconds: float
+
+    def __str__(self) -> str:
+        return f"{self.kind} x{self.workers} (~{self.estimated_seconds * 1000:.1f} ms)"
+
+
+@dataclass(frozen=True)
+class CostModel:
+    """Predicts the wall time of summarizing n values on each kind of executor.
+
+    value_cost is the serial per-value time, best measured on this machine
+    with calibrated(). The other costs are fixed overheads: starting a
+    process pool (skipped when it is already running), copying values into
+    shared memory, and dispatching one task to a process or a thread.
+    """
+    value_cost: float = 1e-6
+    process_startup: float = 0.05
+    transfer_cost: float = 2e-8
+    process_task_cost: float = 1e-3
+    thread_task_cost: float = 1e-4
+    # Share of the work that runs concurrently on threads; 0 while the GIL serializes it
+    thread_efficiency: float = 0.0 if _gil_enabled() else 0.9
+
+    @classmethod
+    def calibrated(cls, work: Callable[[List[float]], Any], sample_size: int = 20_000, **overrides) -> "CostModel":
+        """A model whose value_cost is measured by timing work() on random floats"""
+        rng = random.Random(0)
+        sample = [round(rng.gauss(20, 8), 1) for _ in range(sample_size)]
+        start = time.perf_counter()
+        work(sample)
+        return cls(value_cost=(time.perf_counter() - start) / sample_size, **overrides)
+
+    def estimate(self, kind: str, workers: int, n_values: int, n_columns: int, pool_running: bool = False) -> float:
+        compute = n_values * self.value_cost
+        if kind == "serial":
+            return compute
+        if kind == "thread":
+            share = 1 - self.thread_efficiency + self.thread_efficiency / workers
+            return compute * share + n_columns * self.thread_task_cost
+        startup = 0.0 if pool_running else self.process_startup
+        return startup + n_values * self.transfer_cost + compute / workers + workers * self.process_task_cost
+
+    def choose(self, n_values: int, n_columns: int, cores: Optional[int] = None,
+               pool_running: bool = False, max_workers: Optional[int] = None) -> ExecutionPlan:
+        """Cheapest plan for this much data; ties go to the simpler executor"""
+        cores = cores or cpu_count()
+        candidates = [ExecutionPlan("serial", 1, self.estimate("serial", 1, n_values, n_columns))]
+        if n_columns > 1 and cores > 1:
+            workers = min(cores, n_columns)
+            candidates.append(ExecutionPlan("thread", workers, self.estimate("thread", workers, n_values, n_columns)))
+        if cores > 1:
+            workers = max_workers or max(1, cores - 1)
+            candidates.append(ExecutionPlan("process", workers,
+                                            self.estimate("process", workers, n_values, n_columns, pool_running)))
+        return min(candidates, key=lambda p: p.estimated_seconds)
@@ -0,0 +1,134 @@
+"""Exact order statistics for columns larger than memory.
+
+ExternalSorter buffers values up to a memory budget, then sorts the buffer
+and writes it to a temporary file as a run of raw float64s. Results come
+from a k-way merge of the runs (heapq.merge, reading each run in blocks),
+so only about one block per run is held while median, quantiles and mode
+are read off the merged order in a single pass. Nothing is estimated: the
+results equal those of sorting the whole column in memory.
+"""
+import heapq
+import logging
+import math
+import tempfile
+from array import array
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Sequence
+
+log = logging.getLogger(__name__)
+
+DEFAULT_MEMORY_LIMIT = 256 * 1024 * 1024
+# Sorting the buffer briefly holds a list of Python floats: an 8-byte pointer
+# plus a 24-byte float object per value, on top of the 8-byte array slot
+BYTES_PER_VALUE = 40
+READ_BLOCK_VALUES = 8192
+
+
+def _read_run(f: BinaryIO) -> Iterator[float]:
+    f.seek(0)
+    while raw := f.read(8 * READ_BLOCK_VALUES):
+        block = array('d')
+        block.frombytes(raw)
+        yield from block
+
+
+class ExternalSorter:
+    """Collects one column's values in at most about memory_limit bytes, spilling sorted runs to temp files"""
+
+    def __init__(self, memory_limit: int = DEFAULT_MEMORY_LIMIT, tmp_dir: Optional[str] = None) -> None:
+        if memory_limit <= 0:
+            raise ValueError("memory_limit must be positive")
+        self.memory_limit = memory_limit
+        self.capacity = max(1, memory_limit // BYTES_PER_VALUE)
+        self.tmp_dir = tmp_dir
+        self.count = 0
+        self._buffer = array('d')
+        self._runs: List[BinaryIO] = []
+
+    @property
+    def spilled(self) -> int:
+        """Number of sorted runs written to disk so far"""
+        return len(self._runs)
+
+    def update_many(self, values: Iterable[float]) -> "ExternalSorter":
+        vals = values if isinstance(values, (list, array)) else list(values)
+        start = 0
+        while start < len(vals):
+            room = self.capacity - len(self._buffer)
+            self._buffer.extend(vals[start:start + room])
+            start += room
+            if len(self._buffer) >= self.capacity:
+                self._spill()
+        self.count += len(vals)
+        return self
+
+    def _spill(self) -> None:
+        run = tempfile.TemporaryFile(dir=self.tmp_dir)
+        array('d', sorted(self._buffer)).tofile(run)
+        self._runs.append(run)
+        self._buffer = array('d')
+        log.debug("Spilled sorted run %d (%d values)", len(self._runs), self.capacity)
+
+    def __iter__(self) -> Iterator[float]:
+        """All values in ascending order"""
+        return heapq.merge(*(_read_run(f) for f in self._runs), sorted(self._buffer))
+
+    def describe(self, percentiles: Sequence[float] = ()) -> Dict[str, Any]:
+        """Mean, median, mode (ties to the smallest), range, count and percentiles from one merged pass"""
+        n = self.count
+        if not n:
+            return {'mean': None, 'median': None, 'mode': None, 'data_range': None, 'count': 0, 'percentiles': {}}
+        for q in percentiles:
+            if not 0.0 <= q <= 1.0:
+                raise ValueError("quantile must be between 0 and 1")
+        # Sorted positions whose values are needed, same interpolation as OrderStatistics
+        wanted = {(n - 1) // 2, n // 2}
+        for q in percentiles:
+            lo = math.floor(q * (n - 1))
+            wanted.update((lo, min(lo + 1, n - 1)))
+        at: Dict[int, float] = {}
+        run = {'value': None, 'length': 0, 'best': None, 'best_length': 0}
+
+        def walk() -> Iterator[float]:
+            for i, x in enumerate(self):
+                if i in wanted:
+                    at[i] = x
+                if x == run['value']:
+                    run['length'] += 1
+                else:
+                    run['value'], run['length'] = x, 1
+                if run['length'] > run['best_length']:
+                    run['best'], run['best_length'] = x, run['length']
+                if i == 0:
+                    run['first'] = x
+                run['last'] = x
+                yield x
+
+        total = math.fsum(walk())
+
+        def quantile(q: float) -> float:
+            pos = q * (n - 1)
+            lo = math.floor(pos)
+            frac = pos - lo
+            return at[lo] if frac == 0 else at[lo] + (at[lo + 1] - at[lo]) * frac
+
+        mid = n // 2
+        return {
+            'mean': total / n,
+            'median': at[mid] if n % 2 else (at[mid - 1] + at[mid]) / 2,
+            'mode': run['best'],
+            'data_range': run['last'] - run['first'],
+            'count': n,
+            'percentiles': {q: quantile(q) for q in percentiles},
+        }
+
+    def close(self) -> None:
+        for f in self._runs:
+            f.close()
+        self._runs = []
+        self._buffer = array('d')
+
+    def __enter__(self) -> "ExternalSorter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
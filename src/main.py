@@ -1,24 +1,33 @@
 
 from pathlib import Path
-import sys, logging
+import os, sys, logging
 from logging.handlers import RotatingFileHandler
 from models import WeatherRecord
 import asyncio
 import time
+from functools import partial
 
 #------------------------------------New-----------------------------------------------------
 
 # Imports that work both ways
 if __package__:
-    from .data_fetcher import iter_csv_records, async_read_csv_records
-    from .data_processor import summarize_columns, summarize_columns_parallel
+    from .data_fetcher import iter_csv_records, aiter_csv_records, read_csv_table_parallel, DatasetFetcher, is_dataset_path
+    from .data_processor import summarize_columns, summarize_columns_parallel, summarize_incremental, summarize_auto
     from .data_store import FileStore
     from .data_visualizer import analyze_and_visualize, async_analyze_and_visualize
+    from .data_cache import ParsedCache, fingerprint
+    from .models import WeatherTable
+    from .executor import default_executor
+    from .parsing import log_parse_stats
 else:
-    from data_fetcher import iter_csv_records, async_read_csv_records
-    from data_processor import summarize_columns, summarize_columns_parallel
+    from data_fetcher import iter_csv_records, aiter_csv_records, read_csv_table_parallel, DatasetFetcher, is_dataset_path
+    from data_processor import summarize_columns, summarize_columns_parallel, summarize_incremental, summarize_auto
     from data_store import FileStore
     from data_visualizer import analyze_and_visualize, async_analyze_and_visualize
+    from data_cache import ParsedCache, fingerprint
+    from models import WeatherTable
+    from executor import default_executor
+    from parsing import log_parse_stats
 
 
 def configure_logging(level = logging.INFO):
@@ -52,8 +61,33 @@ except ImportError:
 
 # Project root path finder
 ROOT = Path(__file__).resolve().parents[1]
-CSV_PATH = ROOT / "archive" / "Weather Training Data.csv"
+# WEATHER_DATA may point at one CSV, a directory of CSVs or a glob like "data/*.csv"
+CSV_PATH = Path(os.environ.get("WEATHER_DATA", ROOT / "archive" / "Weather Training Data.csv"))
 OUT_PATH = ROOT / "dist" / "summary.json"
+# Parsed columns of unchanged CSVs are memory-mapped from here instead of re-parsed
+PARSE_CACHE = ParsedCache(ROOT / ".cache")
+
+def _load_dataset(path: Path) -> WeatherTable:
+    """Every partition of a directory/glob, ingested concurrently by DatasetFetcher"""
+    return WeatherTable.from_rows(DatasetFetcher(path).iter_records())
+
+def _load_table(path: Path) -> WeatherTable:
+    if is_dataset_path(path):
+        return _load_dataset(path)
+    return PARSE_CACHE.get_or_parse(path, lambda p: WeatherTable.from_rows(iter_csv_records(p)))
+
+async def _async_load_table(path: Path) -> WeatherTable:
+    """Cached table for path, or stream it in batches and cache the result"""
+    if is_dataset_path(path):
+        return await asyncio.to_thread(_load_dataset, path)
+    table = await asyncio.to_thread(PARSE_CACHE.load, path)
+    if table is not None:
+        return table
+    fp = await asyncio.to_thread(fingerprint, path)
+    parts = [WeatherTable.from_rows(batch) async for batch in aiter_csv_records(path, batch_size=10_000)]
+    table = WeatherTable.concat(parts)
+    await asyncio.to_thread(PARSE_CACHE.store, path, table, fp)
+    return table
 
 def main_sync() -> None:
     print("Reading CSV, computing stats, and saving JSON…")
@@ -64,8 +98,8 @@ def main_sync() -> None:
 
     # 1) Read 📚
     try:
-        raw_records = list(iter_csv_records(CSV_PATH))  # list so we can iterate multiple times in summarize
-        records = [WeatherRecord(row=row) for row in raw_records]
+        # typed table so we can iterate multiple times in summarize; cached between runs
+        records = _load_table(CSV_PATH)
         if not records:
             print("No rows found in the CSV.")
             sys.exit(0)
@@ -83,6 +117,7 @@ def main_sync() -> None:
         log.exception("Failed to summarize: %s", e)
         print("Something went wrong while summarizing.")
         sys.exit(1)
+    log_parse_stats()
 
     # 3) Save 💾
     try:
@@ -125,11 +160,18 @@ async def main_async_parallel() -> None:
     configure_logging()
     log = logging.getLogger(__name__)
     
-    # read CSV without blocking
-    print("\n[1 of 4] Reading CSV file asynchronously...")
+    # One warm worker pool serves both the parallel parse and the summary
+    executor = default_executor()
+
+    # parse CSV across processes without blocking the event loop
+    print("\n[1 of 4] Parsing CSV file in parallel...")
     try:
-        raw_records = await async_read_csv_records(CSV_PATH)
-        records = [WeatherRecord(row=row) for row in raw_records]
+        loop = asyncio.get_running_loop()
+        if is_dataset_path(CSV_PATH):
+            records = await loop.run_in_executor(None, _load_dataset, CSV_PATH)
+        else:
+            parse = partial(read_csv_table_parallel, executor=executor)
+            records = await loop.run_in_executor(None, PARSE_CACHE.get_or_parse, CSV_PATH, parse)
         
         if not records:
             print("No rows found in the CSV")
@@ -144,14 +186,17 @@ async def main_async_parallel() -> None:
     NUMERIC_COLS = list(records[0].row.keys())
     
     #process
+    # Deliberately skips summarize_auto's cost model: this mode always runs the process pool
+    # (use the default async mode to let the cost model pick serial, threads or processes)
     print("\n[2 of 4] Computing statistics in parallel using multiprocessing...")
     try:
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         summary = await loop.run_in_executor(
             None, 
             summarize_columns_parallel,
             records, 
-            NUMERIC_COLS
+            NUMERIC_COLS,
+            executor
         )
         total = sum(s.count for s in summary.stats_by_column.values())
         print(f"✅ Processed {total} numeric values across {len(summary.stats_by_column)} columns")
@@ -207,8 +252,8 @@ async def main_async() -> None:
     # read CSV without blocking
     print("\n[1 of 4] Reading CSV file asynchronously...")
     try:
-        raw_records = await async_read_csv_records(CSV_PATH)
-        records = [WeatherRecord(row=row) for row in raw_records]
+        # Stream rows in batches into a typed table (or load it from the parse cache)
+        records = await _async_load_table(CSV_PATH)
         
         if not records:
             print("No rows found in the CSV")
@@ -225,7 +270,8 @@ async def main_async() -> None:
     #process
     print("\n[2 of 4] Computing statistics...")
     try:
-        summary = summarize_columns(records, NUMERIC_COLS)
+        # Serial, threads or the process pool, whichever the cost model predicts is fastest
+        summary = summarize_auto(records, NUMERIC_COLS)
         total = sum(s.count for s in summary.stats_by_column.values())
         print(f"✅ Processed {total} numeric values across {len(summary.stats_by_column)} columns")
         
@@ -268,6 +314,46 @@ async def main_async() -> None:
     print("="*60 + "\n")
 
 
+#--------------------------New incremental main function---------------------------------------
+def main_incremental() -> None:
+    """Fold only the rows appended since the last run into the saved summary state"""
+    print("Updating the summary with newly appended rows (INCREMENTAL)...")
+    print(f"CSV path: {CSV_PATH}")
+
+    configure_logging()
+    log = logging.getLogger(__name__)
+
+    if is_dataset_path(CSV_PATH):
+        print("Incremental mode needs a single CSV file; use --sync for directories and globs.")
+        sys.exit(1)
+
+    file_store = FileStore(OUT_PATH)
+    try:
+        summary = summarize_incremental(CSV_PATH, file_store)
+    except Exception as e:
+        log.exception("Failed to update summary: %s", e)
+        print("Could not update the summary. Check the file path and try again.")
+        sys.exit(1)
+    log_parse_stats()
+
+    try:
+        out_path = file_store.save_summary(summary)
+    except Exception as e:
+        log.exception("Failed to save summary: %s", e)
+        print("Could not save the summary file.")
+        sys.exit(1)
+
+    # Charts need every row, so incremental runs only refresh the JSON
+    total = sum(s.count for s in summary.stats_by_column.values())
+    cols = ", ".join(summary.stats_by_column.keys()) or "(no numeric columns found)"
+    print("="*60)
+    print(f"✅ Numeric values summarized: {total}")
+    print(f"✅ Columns summarized: {cols}")
+    print(f"✅ JSON saved to: {out_path.resolve()}")
+    print(f"✅ State saved to: {file_store.state_file.resolve()}")
+    print("="*60 + "\n")
+
+
 def main() -> None:
     """
     Changed main() to run the normal sync and new async versions
@@ -286,11 +372,26 @@ def main() -> None:
         print(f"   SYNC execution time: {elapsed:.2f} seconds")
         print(f"{'='*60}\n")
     
+    elif len(sys.argv) > 1 and sys.argv[1] == '--incremental':
+        # Only parse the rows appended since the last run
+        print("\n" + "="*60)
+        print("MODE: INCREMENTAL")
+        print("="*60 + "\n")
+        start_time = time.time()
+
+        main_incremental()
+
+        elapsed = time.time() - start_time
+        print(f"\n{'='*60}")
+        print(f"   INCREMENTAL execution time: {elapsed:.2f} seconds")
+        print(f"{'='*60}\n")
+
     elif len(sys.argv) > 1 and sys.argv[1] == '--parallel':
         # Run async and multiprocessing
         print("\n" + "="*60)
         print("MODE: ASYNC I/O + MULTIPROCESSING")
         print("Demonstrates parallel CPU processing")
+        print("(always uses the process pool, whatever the data size)")
         print("="*60 + "\n")
         start_time = time.time()
         
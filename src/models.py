@@ -1,5 +1,6 @@
-from dataclasses import dataclass, asdict
-from typing import Dict, Any, List, Optional
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Iterable, Iterator, Mapping, Sequence, Tuple, Union
+from array import array
 
 @dataclass
 class WeatherRecord:
@@ -16,14 +17,36 @@ class ColumnStats:
     #-------------New----------------        
     count: int = 0
 
+    #-------------New: optional extras----------------
+    # Extra quantiles keyed like "p95"; only reported when asked for
+    percentiles: Optional[Dict[str, float]] = None
+    # Most frequent values as {"value", "count_min", "count_max"}, from the sketch mode
+    top_values: Optional[List[Dict[str, float]]] = None
+    # Extremes and sum, reported by the rolling-window statistics
+    minimum: Optional[float] = None
+    maximum: Optional[float] = None
+    total: Optional[float] = None
+    # Names of the fields above that are estimates rather than exact values
+    approximate: Tuple[str, ...] = ()
+
     def asdict(self):
-        return {
+        d = {
             'mean': self.mean,
             'median': self.median,
             'mode': self.mode,
             'data_range': self.data_range,
             'count': self.count,
         }
+        if self.percentiles is not None:
+            d['percentiles'] = dict(self.percentiles)
+        if self.top_values is not None:
+            d['top_values'] = [dict(tv) for tv in self.top_values]
+        for name in ('minimum', 'maximum', 'total'):
+            if getattr(self, name) is not None:
+                d[name] = getattr(self, name)
+        if self.approximate:
+            d['approximate'] = list(self.approximate)
+        return d
     
 
 @dataclass
@@ -33,5 +56,313 @@ class ResultSummary:
     def to_dict(self) -> Dict[str, Any]:
         
         return {
-            col: asdict(stat) for col, stat in self.stats_by_column.items()
-        }  
+            col: stat.asdict() for col, stat in self.stats_by_column.items()
+        }
+
+
+#-------------New: grouped results----------------
+@dataclass
+class GroupedSummary:
+    """One ResultSummary per distinct combination of the group-by key columns"""
+    by: List[str]
+    groups: Dict[tuple, ResultSummary]
+
+    def __len__(self) -> int:
+        return len(self.groups)
+
+    def get(self, *key: str) -> Optional[ResultSummary]:
+        return self.groups.get(tuple(key))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'by': list(self.by),
+            'groups': [
+                {'key': dict(zip(self.by, key)), 'stats': summary.to_dict()}
+                for key, summary in self.groups.items()
+            ],
+        }
+
+
+#-------------New: pairwise results----------------
+@dataclass
+class CorrelationMatrix:
+    """Square matrices over `columns`; cell [i][j] uses the rows where both columns are present"""
+    columns: List[str]
+    counts: List[List[int]]
+    covariance: List[List[Optional[float]]]
+    correlation: List[List[Optional[float]]]
+
+    def get(self, a: str, b: str) -> Optional[float]:
+        """Correlation of two columns"""
+        return self.correlation[self.columns.index(a)][self.columns.index(b)]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'columns': list(self.columns),
+            'counts': [list(r) for r in self.counts],
+            'covariance': [list(r) for r in self.covariance],
+            'correlation': [list(r) for r in self.correlation],
+        }
+
+
+#-------------New: columnar table----------------
+try:
+    from .parsing import NULL_TOKENS, DEFAULT_MEMO_SIZE, parse_number as _parse_number
+except ImportError:
+    from parsing import NULL_TOKENS, DEFAULT_MEMO_SIZE, parse_number as _parse_number
+
+# Marks a cell that is text rather than a number or a null token
+_WORD = object()
+
+
+def _format_number(x: float) -> str:
+    """Shortest text for a parsed value: "10" for 10.0, repr otherwise"""
+    if x.is_integer() and abs(x) < 1e16:
+        return str(int(x))
+    return repr(x)
+
+
+@dataclass
+class NumericColumn:
+    """float64 values with a null mask (1 = missing, value slot holds 0.0).
+
+    raw keeps the source text of the few cells that _format_number would not
+    reproduce ("10.0", "1,200", "NA"), keyed by row, so text() is lossless.
+    """
+    values: Sequence[float]
+    nulls: Sequence[int]
+    raw: Optional[Dict[int, str]] = None
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def get(self, i: int) -> Optional[float]:
+        return None if self.nulls[i] else self.values[i]
+
+    def text(self, i: int) -> str:
+        if self.raw and i in self.raw:
+            return self.raw[i]
+        return "" if self.nulls[i] else _format_number(self.values[i])
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # memory-mapped buffers cannot be pickled, so ship plain copies
+        return {'values': array('d', self.values), 'nulls': bytearray(self.nulls), 'raw': self.raw}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.values, self.nulls = state['values'], state['nulls']
+        self.raw = state.get('raw')
+
+    def present(self) -> List[float]:
+        """Non-missing values in row order"""
+        vals, nulls = self.values, self.nulls
+        if not any(nulls):
+            return list(vals)
+        return [v for v, missing in zip(vals, nulls) if not missing]
+
+
+@dataclass
+class StringColumn:
+    """Dictionary-encoded text: each row stores an index into categories"""
+    categories: List[str]
+    codes: Sequence[int]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def get(self, i: int) -> str:
+        return self.categories[self.codes[i]]
+
+    text = get
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {'categories': self.categories, 'codes': array('i', self.codes)}
+
+    def present(self) -> List[float]:
+        """Values that parse as numbers, with each category parsed only once"""
+        parsed = [_parse_number(c) for c in self.categories]
+        return [parsed[c] for c in self.codes if parsed[c] is not None]
+
+
+Column = Union[NumericColumn, StringColumn]
+
+
+class _ColumnBuilder:
+    # Numeric until a cell proves otherwise; only then is the text dictionary-encoded
+    def __init__(self) -> None:
+        self.values = array('d')
+        self.nulls = bytearray()
+        self.raw: Dict[int, str] = {}
+        self.numeric = True
+        self.categories: Dict[str, int] = {}
+        self.codes = array('i')
+        # Bounded memo of cell text -> (parsed value, whether _format_number gives the text back)
+        self._memo: Dict[str, tuple] = {}
+
+    def _parse(self, s: str) -> tuple:
+        hit = self._memo.get(s)
+        if hit is None:
+            num = _parse_number(s)
+            if num is None:
+                hit = (_WORD, False) if s.lower() not in NULL_TOKENS else (None, s == "")
+            else:
+                hit = (num, _format_number(num) == s)
+            if len(self._memo) < DEFAULT_MEMO_SIZE:
+                self._memo[s] = hit
+        return hit
+
+    def _to_text(self) -> None:
+        column = NumericColumn(values=self.values, nulls=self.nulls, raw=self.raw)
+        for i in range(len(column)):
+            self._append_text(column.text(i))
+        self.numeric = False
+        self.values = self.nulls = self.raw = self._memo = None
+
+    def _append_text(self, s: str) -> None:
+        code = self.categories.get(s)
+        if code is None:
+            code = self.categories[s] = len(self.categories)
+        self.codes.append(code)
+
+    def append(self, s: str) -> None:
+        if not self.numeric:
+            self._append_text(s)
+            return
+        num, exact = self._parse(s)
+        if num is _WORD:
+            self._to_text()
+            self._append_text(s)
+            return
+        if not exact:
+            self.raw[len(self.values)] = s
+        self.values.append(0.0 if num is None else num)
+        self.nulls.append(num is None)
+
+    def build(self) -> Column:
+        if self.numeric:
+            return NumericColumn(values=self.values, nulls=self.nulls, raw=self.raw or None)
+        return StringColumn(categories=list(self.categories), codes=self.codes)
+
+
+class _RowView(Mapping):
+    """Read-only dict-like view of one table row, values rendered as text"""
+    __slots__ = ("_table", "_i")
+
+    def __init__(self, table: "WeatherTable", i: int) -> None:
+        self._table = table
+        self._i = i
+
+    def __getitem__(self, key: str) -> str:
+        return self._table.columns[key].text(self._i)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._table.columns)
+
+    def __len__(self) -> int:
+        return len(self._table.columns)
+
+
+class WeatherTable:
+    """Columnar, typed alternative to a list of WeatherRecord rows.
+
+    Each column is parsed once: numeric columns become float64 arrays with a
+    null mask, everything else is dictionary-encoded text. Iterating the
+    table still yields WeatherRecord objects (backed by row views) so code
+    written against List[WeatherRecord] keeps working.
+    """
+
+    def __init__(self, columns: Dict[str, Column]) -> None:
+        lengths = {len(c) for c in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("All columns in a WeatherTable must have the same length.")
+        self.columns = columns
+        self.n_rows = lengths.pop() if lengths else 0
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Any], columns: Optional[Sequence[str]] = None) -> "WeatherTable":
+        builders: Optional[Dict[str, _ColumnBuilder]] = None
+        for rec in rows:
+            row = rec.row if isinstance(rec, WeatherRecord) else rec
+            if builders is None:
+                builders = {c: _ColumnBuilder() for c in (columns or list(row.keys()))}
+            for c, b in builders.items():
+                v = row.get(c)
+                b.append(v.strip() if isinstance(v, str) else "")
+        if builders is None:
+            builders = {c: _ColumnBuilder() for c in (columns or [])}
+        return cls({c: b.build() for c, b in builders.items()})
+
+    @classmethod
+    def from_sequences(cls, fieldnames: Sequence[str], rows: Iterable[Sequence[str]]) -> "WeatherTable":
+        """Build from csv.reader-style rows without making a dict per row"""
+        builders = [_ColumnBuilder() for _ in fieldnames]
+        width = len(builders)
+        for row in rows:
+            if len(row) < width:
+                row = list(row) + [""] * (width - len(row))
+            for b, v in zip(builders, row):
+                b.append(v.strip())
+        return cls({name: b.build() for name, b in zip(fieldnames, builders)})
+
+    @classmethod
+    def concat(cls, tables: Sequence["WeatherTable"]) -> "WeatherTable":
+        """Stack tables with the same columns; a column that is text in any part stays text"""
+        if not tables:
+            return cls({})
+        names = tables[0].column_names
+        merged: Dict[str, Column] = {}
+        for name in names:
+            parts = [t.columns[name] for t in tables]
+            if all(isinstance(p, NumericColumn) for p in parts):
+                values, nulls, raw = array('d'), bytearray(), {}
+                for p in parts:
+                    if p.raw:
+                        raw.update((len(values) + i, text) for i, text in p.raw.items())
+                    values.extend(p.values)
+                    nulls.extend(p.nulls)
+                merged[name] = NumericColumn(values=values, nulls=nulls, raw=raw or None)
+                continue
+            categories: Dict[str, int] = {}
+            codes = array('i')
+            for p in parts:
+                if isinstance(p, NumericColumn):
+                    # text() gives back the source cell, so the numeric part is encoded losslessly
+                    codes.extend(categories.setdefault(p.text(i), len(categories)) for i in range(len(p)))
+                    continue
+                remap = [categories.setdefault(c, len(categories)) for c in p.categories]
+                codes.extend(remap[c] for c in p.codes)
+            merged[name] = StringColumn(categories=list(categories), codes=codes)
+        return cls(merged)
+
+    @property
+    def column_names(self) -> List[str]:
+        return list(self.columns)
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    def __iter__(self) -> Iterator[WeatherRecord]:
+        for i in range(self.n_rows):
+            yield WeatherRecord(row=_RowView(self, i))
+
+    def __getitem__(self, i: int) -> WeatherRecord:
+        return WeatherRecord(row=self.row(i))
+
+    def row(self, i: int) -> Mapping:
+        if not -self.n_rows <= i < self.n_rows:
+            raise IndexError("row index out of range")
+        return _RowView(self, i % self.n_rows)
+
+    def column(self, name: str) -> Column:
+        return self.columns[name]
+
+    def select(self, columns: Sequence[str]) -> "WeatherTable":
+        """Projection onto the named columns (shares the column buffers)"""
+        missing = [c for c in columns if c not in self.columns]
+        if missing:
+            raise ValueError(f"Table is missing requested columns: {', '.join(missing)}")
+        return WeatherTable({c: self.columns[c] for c in columns})
+
+    def numeric_values(self, name: str) -> List[float]:
+        """Non-missing numeric values of a column; empty if the column is absent"""
+        col = self.columns.get(name)
+        return col.present() if col is not None else []
@@ -0,0 +1,119 @@
+"""Shared number parsing for CSV cells, memoized per column.
+
+Weather columns repeat a small set of strings (temperatures in 0.1 degree
+steps, a few rainfall amounts), so each column gets a bounded memo of
+string -> float and most conversions become a dictionary lookup. The rules
+are the ones the processor has always used: surrounding whitespace is
+ignored, "", "na", "nan" and "null" (any case) are missing, thousands
+separators are stripped, and anything else that float() rejects is missing.
+"""
+import logging
+import threading
+from array import array
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+log = logging.getLogger(__name__)
+
+NULL_TOKENS = frozenset({"", "na", "nan", "null"})
+# Distinct strings remembered per column; later new strings are parsed but not stored
+DEFAULT_MEMO_SIZE = 4096
+
+_MISSING = object()
+
+
+def parse_number(v: Any) -> Optional[float]:
+    """One cell as a float, or None when it is missing or not a number"""
+    if isinstance(v, str):
+        s = v.strip()
+        if s.lower() in NULL_TOKENS:
+            return None
+        try:
+            x = float(s.replace(",", ""))
+        except ValueError:
+            return None
+    elif isinstance(v, (int, float)):
+        x = float(v)
+    else:
+        return None
+    return None if x != x else x  # x != x only for NaN
+
+
+class ColumnParser:
+    """parse_number with a bounded memo and hit/miss counters for one column"""
+
+    def __init__(self, column: Any = None, max_size: int = DEFAULT_MEMO_SIZE) -> None:
+        self.column = column
+        self.max_size = max_size
+        self.calls = 0
+        self.misses = 0
+        self._memo: Dict[str, Optional[float]] = {}
+
+    def _miss(self, v: Any) -> Optional[float]:
+        x = parse_number(v)
+        if type(v) is str:
+            self.misses += 1
+            if len(self._memo) < self.max_size:
+                self._memo[v] = x
+        return x
+
+    def parse(self, v: Any) -> Optional[float]:
+        self.calls += 1
+        x = self._memo.get(v, _MISSING) if type(v) is str else _MISSING
+        return self._miss(v) if x is _MISSING else x
+
+    def parse_many(self, raw: Sequence[Any]) -> Tuple[array, bytearray]:
+        """float64 values and a null mask (1 = missing, value slot holds 0.0) for a batch of cells"""
+        n = len(raw)
+        self.calls += n
+        values = array("d", bytes(8 * n))
+        nulls = bytearray(n)
+        get = self._memo.get
+        for i, v in enumerate(raw):
+            x = get(v, _MISSING) if type(v) is str else _MISSING
+            if x is _MISSING:
+                x = self._miss(v)
+            if x is None:
+                nulls[i] = 1
+            else:
+                values[i] = x
+        return values, nulls
+
+    @property
+    def hits(self) -> int:
+        return self.calls - self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.calls if self.calls else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {'calls': self.calls, 'hits': self.hits, 'hit_rate': self.hit_rate, 'memo_size': len(self._memo)}
+
+
+_parsers: Dict[Any, ColumnParser] = {}
+_lock = threading.Lock()
+
+
+def parser_for(column: Any) -> ColumnParser:
+    """The process-wide parser for a column name (or index), created on first use"""
+    parser = _parsers.get(column)
+    if parser is None:
+        with _lock:
+            parser = _parsers.setdefault(column, ColumnParser(column))
+    return parser
+
+
+def parse_stats() -> Dict[Any, Dict[str, Any]]:
+    """Hit rates of every column parser used so far in this process"""
+    return {col: p.stats() for col, p in list(_parsers.items()) if p.calls}
+
+
+def log_parse_stats(level: int = logging.INFO) -> None:
+    for col, st in parse_stats().items():
+        log.log(level, "Parsed %s: %d cells, %.1f%% memo hits, %d distinct strings kept",
+                col, st['calls'], 100 * st['hit_rate'], st['memo_size'])
+
+
+def reset_parsers() -> None:
+    with _lock:
+        _parsers.clear()
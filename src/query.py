@@ -0,0 +1,386 @@
+"""Lazy queries over weather rows, run locally in one fused pass.
+
+    Query.from_csv(path).where(col("MaxTemp") > 25).group_by("Location").agg(hot=("MaxTemp", "mean")).collect()
+
+Nothing is read until collect() (or records/values/count). The recorded
+steps are then planned together, in the spirit of Spark's lazy DataFrames:
+every where() before the first limit() is fused into a single predicate
+(later ones run after the limit, in order), only the columns that are
+selected, filtered, grouped or aggregated are read (projection pushdown),
+and for CSV sources the predicate runs inside the fetcher (predicate
+pushdown) so rejected rows are never materialized. explain() shows the plan.
+"""
+import math
+import operator
+from abc import ABC, abstractmethod
+from pathlib import Path
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+try:
+    from .core import StreamingStats
+    from .parsing import parser_for
+    from .data_fetcher import iter_csv_records, DatasetFetcher, is_dataset_path
+except ImportError:
+    from core import StreamingStats
+    from parsing import parser_for
+    from data_fetcher import iter_csv_records, DatasetFetcher, is_dataset_path
+
+PathLike = Union[str, Path]
+
+#--------------------Expressions--------------------
+_OPS = {
+    ">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le,
+    "==": operator.eq, "!=": operator.ne,
+}
+
+
+def _row_of(rec: Any) -> Dict[str, Any]:
+    return rec.row if hasattr(rec, "row") else rec
+
+
+class Expr(ABC):
+    """A row predicate that knows which columns it reads; combine with & | ~"""
+
+    columns: Tuple[str, ...] = ()
+
+    @abstractmethod
+    def __call__(self, row: Dict[str, Any]) -> bool:
+        ...
+
+    def __and__(self, other: "Expr") -> "Expr":
+        return And(self, other)
+
+    def __or__(self, other: "Expr") -> "Expr":
+        return Or(self, other)
+
+    def __invert__(self) -> "Expr":
+        return Not(self)
+
+
+class Compare(Expr):
+    """column <op> value: numeric when value is a number (unparseable cells never match),
+    otherwise the stripped cell text is compared"""
+
+    def __init__(self, column: str, op: str, value: Any) -> None:
+        self.column = column
+        self.op = op
+        self.value = value
+        self.columns = (column,)
+        self._fn = _OPS[op]
+        self._numeric = isinstance(value, (int, float)) and not isinstance(value, bool)
+        self._parse = parser_for(column).parse
+
+    def __call__(self, row: Dict[str, Any]) -> bool:
+        cell = row.get(self.column, "")
+        if self._numeric:
+            num = self._parse(cell)
+            return num is not None and self._fn(num, self.value)
+        return self._fn((cell or "").strip() if isinstance(cell, str) else cell, self.value)
+
+    def __repr__(self) -> str:
+        return f"({self.column} {self.op} {self.value!r})"
+
+
+class IsIn(Expr):
+    def __init__(self, column: str, values: Iterable[str]) -> None:
+        self.column = column
+        self.values = frozenset(values)
+        self.columns = (column,)
+
+    def __call__(self, row: Dict[str, Any]) -> bool:
+        return (row.get(self.column) or "").strip() in self.values
+
+    def __repr__(self) -> str:
+        return f"({self.column} in {sorted(self.values)!r})"
+
+
+class And(Expr):
+    def __init__(self, *parts: Expr) -> None:
+        # Flatten nested ANDs so the fused predicate is a single short-circuiting loop
+        flat: List[Expr] = []
+        for p in parts:
+            flat.extend(p.parts if isinstance(p, And) else [p])
+        self.parts = tuple(flat)
+        self.columns = tuple(dict.fromkeys(c for p in self.parts for c in p.columns))
+
+    def __call__(self, row: Dict[str, Any]) -> bool:
+        return all(p(row) for p in self.parts)
+
+    def __repr__(self) -> str:
+        return " AND ".join(map(repr, self.parts))
+
+
+class Or(Expr):
+    def __init__(self, left: Expr, right: Expr) -> None:
+        self.parts = (left, right)
+        self.columns = tuple(dict.fromkeys(left.columns + right.columns))
+
+    def __call__(self, row: Dict[str, Any]) -> bool:
+        return self.parts[0](row) or self.parts[1](row)
+
+    def __repr__(self) -> str:
+        return f"({self.parts[0]!r} OR {self.parts[1]!r})"
+
+
+class Not(Expr):
+    def __init__(self, inner: Expr) -> None:
+        self.inner = inner
+        self.columns = inner.columns
+
+    def __call__(self, row: Dict[str, Any]) -> bool:
+        return not self.inner(row)
+
+    def __repr__(self) -> str:
+        return f"NOT {self.inner!r}"
+
+
+class Col:
+    """col("MaxTemp") > 25 builds a Compare predicate"""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __gt__(self, v): return Compare(self.name, ">", v)
+    def __ge__(self, v): return Compare(self.name, ">=", v)
+    def __lt__(self, v): return Compare(self.name, "<", v)
+    def __le__(self, v): return Compare(self.name, "<=", v)
+    def __eq__(self, v): return Compare(self.name, "==", v)  # type: ignore[override]
+    def __ne__(self, v): return Compare(self.name, "!=", v)  # type: ignore[override]
+
+    def between(self, low: float, high: float) -> Expr:
+        return And(Compare(self.name, ">=", low), Compare(self.name, "<=", high))
+
+    def isin(self, values: Iterable[str]) -> Expr:
+        return IsIn(self.name, values)
+
+
+def col(name: str) -> Col:
+    return Col(name)
+
+#--------------------Aggregates--------------------
+AGGREGATES: Dict[str, Callable[[StreamingStats, List[float]], Any]] = {
+    "count": lambda acc, vals: acc.count,
+    "sum": lambda acc, vals: math.fsum(vals),
+    "mean": lambda acc, vals: acc.mean(),
+    "min": lambda acc, vals: acc.minimum,
+    "max": lambda acc, vals: acc.maximum,
+    "median": lambda acc, vals: acc.median(),
+    "mode": lambda acc, vals: acc.mode(ties="smallest"),
+    "stdev": lambda acc, vals: acc.stdev(),
+}
+
+#--------------------Query--------------------
+class Query:
+    """Immutable, lazily evaluated query; each builder method returns a new Query"""
+
+    def __init__(self, source: Union[PathLike, Iterable[Any]], *, encoding: str = "utf-8",
+                 _steps: Tuple[Tuple[str, Any], ...] = ()) -> None:
+        self.source = source
+        self.encoding = encoding
+        self._steps = _steps
+
+    @classmethod
+    def from_csv(cls, path: PathLike, encoding: str = "utf-8") -> "Query":
+        return cls(Path(path), encoding=encoding)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Any]) -> "Query":
+        return cls(records)
+
+    def _with(self, kind: str, arg: Any) -> "Query":
+        return Query(self.source, encoding=self.encoding, _steps=self._steps + ((kind, arg),))
+
+    # --------------- Building ------------------------------
+    def select(self, *columns: str) -> "Query":
+        return self._with("select", tuple(columns))
+
+    def where(self, predicate: Union[Expr, Callable[[Dict[str, Any]], bool]]) -> "Query":
+        return self._with("where", predicate)
+
+    def group_by(self, *keys: str) -> "Query":
+        return self._with("group_by", tuple(keys))
+
+    def agg(self, **aggregates: Tuple[str, str]) -> "Query":
+        """name=(column, func) with func one of AGGREGATES"""
+        for name, (column, func) in aggregates.items():
+            if func not in AGGREGATES:
+                raise ValueError(f"Unknown aggregate {func!r} for {name}; expected one of {sorted(AGGREGATES)}")
+        return self._with("agg", dict(aggregates))
+
+    def limit(self, n: int) -> "Query":
+        return self._with("limit", n)
+
+    # --------------- Planning ------------------------------
+    def _plan(self) -> Dict[str, Any]:
+        predicates: List[Any] = []
+        # Steps after the first limit run in recorded order: a filter moved past a limit changes the result
+        after_limit: List[Tuple[str, Any]] = []
+        select: Optional[Tuple[str, ...]] = None
+        keys: Tuple[str, ...] = ()
+        aggs: Optional[Dict[str, Tuple[str, str]]] = None
+        limit: Optional[int] = None
+        group_limit: Optional[int] = None
+        for kind, arg in self._steps:
+            if kind == "where":
+                if aggs is not None:
+                    raise ValueError("where() after agg() would filter groups, not rows; call it before agg()")
+                if limit is None:
+                    predicates.append(arg)
+                else:
+                    after_limit.append((kind, arg))
+            elif kind == "select":
+                select = arg
+            elif kind == "group_by":
+                keys = arg
+            elif kind == "agg":
+                aggs = arg
+            elif kind == "limit":
+                if aggs is not None:
+                    group_limit = arg if group_limit is None else min(group_limit, arg)
+                elif limit is None:
+                    limit = arg
+                else:
+                    after_limit.append((kind, arg))
+        if keys and aggs is None:
+            raise ValueError("group_by() needs agg() to say what to compute per group")
+
+        exprs = [p for p in predicates if isinstance(p, Expr)]
+        opaque = [p for p in predicates if not isinstance(p, Expr)]
+        fused: Optional[Callable[[Dict[str, Any]], bool]] = None
+        if exprs or opaque:
+            expr = And(*exprs) if exprs else None
+            if opaque:
+                parts = ([expr] if expr else []) + opaque
+                fused = lambda row, parts=parts: all(p(row) for p in parts)
+            else:
+                fused = expr
+
+        # Plain callables may read any field, so they switch projection pushdown off
+        late = [arg for kind, arg in after_limit if kind == "where"]
+        columns: Optional[List[str]] = None
+        if not opaque and all(isinstance(p, Expr) for p in late) and (select is not None or aggs is not None):
+            needed = list(select or ()) + list(keys) + [c for c, _ in (aggs or {}).values()]
+            needed += [c for e in exprs + late for c in e.columns]
+            columns = list(dict.fromkeys(needed))
+        return {"predicate": fused, "exprs": exprs, "opaque": len(opaque), "columns": columns,
+                "select": select, "keys": keys, "aggs": aggs, "limit": limit,
+                "after_limit": after_limit, "group_limit": group_limit}
+
+    def _is_csv(self) -> bool:
+        return isinstance(self.source, (str, Path))
+
+    def _scan(self, plan: Dict[str, Any]) -> Iterator[Any]:
+        """Source records that pass the predicate, read with the pushed-down columns"""
+        pred = plan["predicate"]
+        if self._is_csv():
+            if is_dataset_path(self.source):
+                rows = DatasetFetcher(self.source, encoding=self.encoding, columns=plan["columns"]).iter_records()
+                return filter(pred, rows) if pred else rows
+            return iter_csv_records(self.source, encoding=self.encoding, columns=plan["columns"], where=pred)
+        if pred is None:
+            return iter(self.source)
+        return (rec for rec in self.source if pred(_row_of(rec)))
+
+    def explain(self) -> str:
+        plan = self._plan()
+        lines = []
+        if self._is_csv():
+            cols = ", ".join(plan["columns"]) if plan["columns"] is not None else "*"
+            lines.append(f"Scan csv {self.source} columns=[{cols}]")
+        else:
+            lines.append("Scan records")
+        if plan["predicate"] is not None:
+            shown = repr(And(*plan["exprs"])) if plan["exprs"] else ""
+            if plan["opaque"]:
+                shown = (shown + " AND " if shown else "") + f"<{plan['opaque']} python predicate(s)>"
+            where = "pushed into scan" if self._is_csv() else "fused"
+            lines.append(f"  Filter {shown} ({where})")
+        if plan["limit"] is not None:
+            lines.append(f"  Limit {plan['limit']}")
+        for kind, arg in plan["after_limit"]:
+            if kind == "where":
+                shown = repr(arg) if isinstance(arg, Expr) else "<python predicate>"
+                lines.append(f"  Filter {shown} (after limit)")
+            else:
+                lines.append(f"  Limit {arg}")
+        if plan["aggs"] is not None:
+            by = ", ".join(plan["keys"]) or "(all rows)"
+            aggs = ", ".join(f"{name}={func}({column})" for name, (column, func) in plan["aggs"].items())
+            lines.append(f"  Aggregate by [{by}]: {aggs}")
+        elif plan["select"] is not None:
+            lines.append(f"  Project [{', '.join(plan['select'])}]")
+        if plan["group_limit"] is not None:
+            lines.append(f"  Limit {plan['group_limit']} groups")
+        return "\n".join(lines)
+
+    # --------------- Executing ------------------------------
+    def records(self) -> List[Any]:
+        """Matching source records, unprojected (WeatherRecords stay WeatherRecords)"""
+        return list(self._limited(self._plan()))
+
+    def values(self, column: str, default: Optional[float] = None) -> List[float]:
+        """One numeric column of the matching rows; unparseable cells are dropped, or replaced by default"""
+        query = self.select(column)
+        parse = parser_for(column).parse
+        out: List[float] = []
+        for rec in query._limited(query._plan()):
+            num = parse(_row_of(rec).get(column, ""))
+            if num is None:
+                if default is None:
+                    continue
+                num = default
+            out.append(num)
+        return out
+
+    def count(self) -> int:
+        return sum(1 for _ in self._limited(self._plan()))
+
+    def _limited(self, plan: Dict[str, Any]) -> Iterator[Any]:
+        rows = self._scan(plan)
+        if plan["limit"] is not None:
+            rows = islice(rows, plan["limit"])
+        for kind, arg in plan["after_limit"]:
+            if kind == "where":
+                rows = filter(lambda r, pred=arg: pred(_row_of(r)), rows)
+            else:
+                rows = islice(rows, arg)
+        return rows
+
+    def collect(self) -> List[Dict[str, Any]]:
+        plan = self._plan()
+        if plan["aggs"] is not None:
+            return self._aggregate(plan)
+        select = plan["select"]
+        out = []
+        for rec in self._limited(plan):
+            row = _row_of(rec)
+            out.append({c: row.get(c, "") for c in select} if select is not None else dict(row))
+        return out
+
+    def _aggregate(self, plan: Dict[str, Any]) -> List[Dict[str, Any]]:
+        keys, aggs = plan["keys"], plan["aggs"]
+        agg_columns = list(dict.fromkeys(c for c, _ in aggs.values()))
+        parsers = [parser_for(c).parse for c in agg_columns]
+        groups: Dict[tuple, List[List[float]]] = {}
+        for rec in self._limited(plan):
+            row = _row_of(rec)
+            key = tuple((row.get(k) or "").strip() for k in keys)
+            vals = groups.get(key)
+            if vals is None:
+                vals = groups[key] = [[] for _ in agg_columns]
+            for lst, c, parse in zip(vals, agg_columns, parsers):
+                num = parse(row.get(c, ""))
+                if num is not None:
+                    lst.append(num)
+        out = []
+        for key in sorted(groups):
+            lists = dict(zip(agg_columns, groups[key]))
+            accs = {c: StreamingStats().update_many(v) for c, v in lists.items()}
+            result: Dict[str, Any] = dict(zip(keys, key))
+            for name, (column, func) in aggs.items():
+                result[name] = AGGREGATES[func](accs[column], lists[column])
+            out.append(result)
+        if plan["group_limit"] is not None:
+            out = out[:plan["group_limit"]]
+        return out
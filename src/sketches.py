@@ -0,0 +1,308 @@
+"""Bounded-memory, mergeable summaries for columns too large to hold in RAM.
+
+KLLSketch estimates quantiles (Karnin, Lang and Liberty, 2016). With the
+default k=200 the normalized rank error is about 1.65% with 99% confidence:
+the value reported for quantile q has a true rank within q +/- 0.0165 of
+the data. Memory is O(k) values whatever the stream length, and sketches
+built on separate chunks or processes merge without losing that guarantee.
+Until the first compaction nothing has been discarded, so small columns
+are answered exactly.
+
+MisraGries keeps at most `capacity` counters for the most frequent values,
+so mode and top-k no longer need a table of every distinct float. Every
+reported count is an underestimate by at most `max_error`, which is never
+more than n / (capacity + 1), and any value seen more often than that is
+guaranteed to be kept. Values can optionally be binned first.
+"""
+import math
+import random
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+try:
+    from .core import OrderStatistics
+except ImportError:
+    from core import OrderStatistics
+
+DEFAULT_K = 200
+DEFAULT_PERCENTILES = (0.05, 0.95, 0.99)
+DEFAULT_HEAVY_HITTERS = 64
+
+
+def rank_error(k: int) -> float:
+    """Normalized rank error of a KLL sketch with parameter k (99% confidence)"""
+    return 2.446 / k ** 0.9433
+
+
+def percentile_name(q: float) -> str:
+    """0.05 -> "p5", 0.995 -> "p99.5" """
+    return "p" + format(q * 100, "g")
+
+
+class KLLSketch:
+    """Quantile sketch: a stack of compactors where an item at level h stands for 2**h values.
+
+    A full level is sorted and every other item (random offset) is promoted
+    to the level above, so the sketch never holds much more than about 3k items.
+    """
+
+    def __init__(self, k: int = DEFAULT_K, seed: Optional[int] = None) -> None:
+        if k < 8:
+            raise ValueError("k must be at least 8")
+        self.k = k
+        self.count = 0
+        self.minimum: Optional[float] = None
+        self.maximum: Optional[float] = None
+        self.levels: List[List[float]] = [[]]
+        self._size = 0
+        self._rng = random.Random(seed)
+
+    @property
+    def is_exact(self) -> bool:
+        """True until the first compaction, while every value is still held"""
+        return len(self.levels) == 1
+
+    def _capacity(self, h: int) -> int:
+        depth = len(self.levels) - h - 1
+        return max(2, math.ceil(self.k * (2 / 3) ** depth))
+
+    def _max_size(self) -> int:
+        return sum(self._capacity(h) for h in range(len(self.levels)))
+
+    def _compress(self) -> None:
+        while self._size >= self._max_size():
+            for h, level in enumerate(self.levels):
+                if len(level) >= self._capacity(h):
+                    if h + 1 == len(self.levels):
+                        self.levels.append([])
+                    level.sort()
+                    keep = [level.pop()] if len(level) % 2 else []
+                    self.levels[h + 1].extend(level[self._rng.random() < 0.5::2])
+                    self.levels[h] = keep
+                    self._size = sum(len(lv) for lv in self.levels)
+                    break
+
+    def update(self, x: float) -> "KLLSketch":
+        self.update_many([x])
+        return self
+
+    def update_many(self, values: Iterable[float]) -> "KLLSketch":
+        vals = values if isinstance(values, list) else list(values)
+        if not vals:
+            return self
+        lo, hi = min(vals), max(vals)
+        self.minimum = lo if self.minimum is None else min(self.minimum, lo)
+        self.maximum = hi if self.maximum is None else max(self.maximum, hi)
+        self.count += len(vals)
+        # Add k values at a time, compacting in between, so the sketch stays bounded
+        for start in range(0, len(vals), self.k):
+            block = vals[start:start + self.k]
+            self.levels[0].extend(block)
+            self._size += len(block)
+            self._compress()
+        return self
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        """Fold another sketch into this one (in place)"""
+        if other.count == 0:
+            return self
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+        for h, level in enumerate(other.levels):
+            self.levels[h].extend(level)
+        self._size = sum(len(lv) for lv in self.levels)
+        self.count += other.count
+        self.minimum = other.minimum if self.minimum is None else min(self.minimum, other.minimum)
+        self.maximum = other.maximum if self.maximum is None else max(self.maximum, other.maximum)
+        self._compress()
+        return self
+
+    # --------------- Results ------------------------------
+    def quantile(self, q: float) -> Optional[float]:
+        """Value at quantile q (0 <= q <= 1); exact while is_exact, else within rank_error(k)"""
+        if not self.count:
+            return None
+        if not 0.0 <= q <= 1.0:
+            raise ValueError("quantile must be between 0 and 1")
+        if self.is_exact:
+            return OrderStatistics(self.levels[0]).quantile(q)
+        if q == 0.0:
+            return self.minimum
+        if q == 1.0:
+            return self.maximum
+        weighted = sorted((x, 1 << h) for h, level in enumerate(self.levels) for x in level)
+        target = q * sum(w for _, w in weighted)
+        seen = 0
+        for x, w in weighted:
+            seen += w
+            if seen > target:
+                return x
+        return self.maximum
+
+    def quantiles(self, qs: Sequence[float]) -> List[Optional[float]]:
+        return [self.quantile(q) for q in qs]
+
+    def median(self) -> Optional[float]:
+        return self.quantile(0.5)
+
+    # --------------- Serializable partial state ------------------------------
+    def to_state(self) -> Dict[str, Any]:
+        return {'k': self.k, 'count': self.count, 'min': self.minimum, 'max': self.maximum,
+                'levels': [list(level) for level in self.levels]}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "KLLSketch":
+        sk = cls(state['k'])
+        sk.count = state['count']
+        sk.minimum = state['min']
+        sk.maximum = state['max']
+        sk.levels = [list(level) for level in state['levels']] or [[]]
+        sk._size = sum(len(lv) for lv in sk.levels)
+        return sk
+
+
+class MisraGries:
+    """Mergeable heavy-hitters summary with at most `capacity` counters.
+
+    With bin_width set, values are counted by the lower edge of their bin.
+    Counts are exact (max_error == 0) until the counters first overflow.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_HEAVY_HITTERS, bin_width: Optional[float] = None) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        if bin_width is not None and bin_width <= 0:
+            raise ValueError("bin_width must be positive")
+        self.capacity = capacity
+        self.bin_width = bin_width
+        self.count = 0
+        self.max_error = 0
+        self.counters: Dict[float, int] = {}
+
+    def _reduce(self) -> None:
+        # Subtract the (capacity+1)-th largest count from every counter and drop the non-positive ones
+        if len(self.counters) <= self.capacity:
+            return
+        cut = sorted(self.counters.values(), reverse=True)[self.capacity]
+        self.counters = {v: c - cut for v, c in self.counters.items() if c > cut}
+        self.max_error += cut
+
+    def update_many(self, values: Iterable[float]) -> "MisraGries":
+        vals = values if isinstance(values, list) else list(values)
+        if self.bin_width is not None:
+            w = self.bin_width
+            vals = [math.floor(x / w) * w for x in vals]
+        self.count += len(vals)
+        counters = self.counters
+        for v, c in Counter(vals).items():
+            counters[v] = counters.get(v, 0) + c
+        self._reduce()
+        return self
+
+    def merge(self, other: "MisraGries") -> "MisraGries":
+        """Fold another summary into this one (in place); bins must match"""
+        if other.bin_width != self.bin_width:
+            raise ValueError("cannot merge summaries with different bin widths")
+        self.count += other.count
+        self.max_error += other.max_error
+        for v, c in other.counters.items():
+            self.counters[v] = self.counters.get(v, 0) + c
+        self._reduce()
+        return self
+
+    @property
+    def is_exact(self) -> bool:
+        return self.max_error == 0 and self.bin_width is None
+
+    def top(self, n: Optional[int] = None) -> List[Dict[str, float]]:
+        """Most frequent values first (ties to the smallest), each with its count bounds"""
+        ranked = sorted(self.counters.items(), key=lambda vc: (-vc[1], vc[0]))[:n]
+        return [{'value': v, 'count_min': c, 'count_max': c + self.max_error} for v, c in ranked]
+
+    def mode(self) -> Optional[float]:
+        return min(self.counters.items(), key=lambda vc: (-vc[1], vc[0]))[0] if self.counters else None
+
+    def to_state(self) -> Dict[str, Any]:
+        return {'capacity': self.capacity, 'bin_width': self.bin_width, 'count': self.count,
+                'max_error': self.max_error, 'counters': [[v, c] for v, c in self.counters.items()]}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "MisraGries":
+        mg = cls(state['capacity'], state['bin_width'])
+        mg.count = state['count']
+        mg.max_error = state['max_error']
+        mg.counters = {v: c for v, c in state['counters']}
+        return mg
+
+
+class ColumnSketch:
+    """Per-column summary in fixed memory: exact count, mean, variance and range,
+    sketched quantiles and heavy hitters (for mode and top-k)."""
+
+    def __init__(self, k: int = DEFAULT_K, heavy_hitters: int = DEFAULT_HEAVY_HITTERS,
+                 bin_width: Optional[float] = None) -> None:
+        self.count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self.minimum: Optional[float] = None
+        self.maximum: Optional[float] = None
+        self.quantiles = KLLSketch(k)
+        self.frequent = MisraGries(heavy_hitters, bin_width)
+
+    def update_many(self, values: Iterable[float]) -> "ColumnSketch":
+        vals = values if isinstance(values, list) else list(values)
+        if not vals:
+            return self
+        batch = ColumnSketch(self.quantiles.k, self.frequent.capacity, self.frequent.bin_width)
+        batch.count = len(vals)
+        batch._mean = math.fsum(vals) / batch.count
+        batch._m2 = math.fsum((x - batch._mean) ** 2 for x in vals)
+        batch.minimum, batch.maximum = min(vals), max(vals)
+        batch.quantiles.update_many(vals)
+        batch.frequent.update_many(vals)
+        return self.merge(batch)
+
+    def merge(self, other: "ColumnSketch") -> "ColumnSketch":
+        """Fold another partial summary into this one (in place)"""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self._mean, self._m2 = other.count, other._mean, other._m2
+            self.minimum, self.maximum = other.minimum, other.maximum
+        else:
+            n = self.count + other.count
+            delta = other._mean - self._mean
+            self._mean += delta * other.count / n
+            self._m2 += other._m2 + delta * delta * self.count * other.count / n
+            self.count = n
+            self.minimum = min(self.minimum, other.minimum)
+            self.maximum = max(self.maximum, other.maximum)
+        self.quantiles.merge(other.quantiles)
+        self.frequent.merge(other.frequent)
+        return self
+
+    def mean(self) -> Optional[float]:
+        return self._mean if self.count else None
+
+    def data_range(self) -> Optional[float]:
+        return self.maximum - self.minimum if self.count else None
+
+    def mode(self) -> Optional[float]:
+        """Most frequent value (or bin) among the heavy hitters, ties to the smallest"""
+        return self.frequent.mode() if self.count else None
+
+    def to_state(self) -> Dict[str, Any]:
+        return {'count': self.count, 'mean': self._mean, 'm2': self._m2, 'min': self.minimum, 'max': self.maximum,
+                'quantiles': self.quantiles.to_state(), 'frequent': self.frequent.to_state()}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "ColumnSketch":
+        sk = cls()
+        sk.count = state['count']
+        sk._mean = state['mean']
+        sk._m2 = state['m2']
+        sk.minimum = state['min']
+        sk.maximum = state['max']
+        sk.quantiles = KLLSketch.from_state(state['quantiles'])
+        sk.frequent = MisraGries.from_state(state['frequent'])
+        return sk
@@ -0,0 +1,116 @@
+"""Opt-in NumPy backend for the descstats core and StatsProcessor.
+
+Columns are held as contiguous float64 arrays where NaN marks a missing
+value, so every statistic is a handful of vectorized calls instead of an
+interpreted loop. NumPy is optional and is only required once a caller
+asks for ``backend="numpy"``.
+"""
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional
+    np = None
+
+try:
+    from .parsing import parse_number, parser_for
+except ImportError:
+    from parsing import parse_number, parser_for
+
+BACKENDS = ("python", "numpy")
+
+
+def require_numpy() -> None:
+    if np is None:
+        raise ImportError("The numpy backend needs numpy installed: pip install numpy")
+
+
+def check_backend(backend: str) -> str:
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend!r}; expected one of {BACKENDS}")
+    if backend == "numpy":
+        require_numpy()
+    return backend
+
+
+def to_float_array(values: Iterable[Any], column: Optional[Any] = None) -> "np.ndarray":
+    """Contiguous float64 array; anything parsing.parse_number calls missing becomes NaN.
+
+    With column= the slow path goes through that column's memoized parser.
+    """
+    require_numpy()
+    vals = values if isinstance(values, (list, tuple)) else list(values)
+    try:
+        # Fast path: numpy parses the whole column in C when every value is a plain number
+        return np.ascontiguousarray(vals, dtype=np.float64)
+    except (TypeError, ValueError):
+        pass
+    # Same rules as the python backend: "1,200" is 1200.0, "NA"/"null" are missing
+    parse = parser_for(column).parse if column is not None else parse_number
+    nan = float("nan")
+    return np.fromiter((nan if (x := parse(v)) is None else x for v in vals), dtype=np.float64, count=len(vals))
+
+
+def missing_mask(arr: "np.ndarray") -> "np.ndarray":
+    return np.isnan(arr)
+
+
+def _present(arr: "np.ndarray") -> "np.ndarray":
+    arr = np.asarray(arr, dtype=np.float64)
+    return arr[~np.isnan(arr)]
+
+# --------------- Same API as core, over float64 arrays ------------------------------
+def mean(values) -> float:
+    arr = _present(to_float_array(values))
+    if arr.size == 0:
+        raise ValueError("mean requires at least one data point")
+    return float(arr.mean())
+
+
+def median(values) -> float:
+    arr = _present(to_float_array(values))
+    if arr.size == 0:
+        raise ValueError("no median for empty data")
+    return float(np.median(arr))
+
+
+def mode(values, ties: str = "first") -> float:
+    """Most common value; ties go to the first seen (like statistics.mode) or the smallest"""
+    arr = _present(to_float_array(values))
+    if arr.size == 0:
+        raise ValueError("no mode for empty data")
+    uniq, first_idx, counts = np.unique(arr, return_index=True, return_counts=True)
+    best = counts == counts.max()
+    if ties == "smallest":
+        return float(uniq[best][0])
+    return float(uniq[best][np.argmin(first_idx[best])])
+
+
+def data_range(values) -> float:
+    arr = _present(to_float_array(values))
+    if arr.size == 0:
+        raise ValueError("data_range requires at least one data point")
+    return float(arr.max() - arr.min())
+
+
+def describe_array(arr: "np.ndarray", ties: str = "first") -> Dict[str, Any]:
+    arr = _present(arr)
+    if arr.size == 0:
+        return {'mean': None, 'median': None, 'mode': None, 'data_range': None, 'count': 0}
+    return {
+        'mean': float(arr.mean()),
+        'median': float(np.median(arr)),
+        'mode': mode(arr, ties=ties),
+        'data_range': float(arr.max() - arr.min()),
+        'count': int(arr.size),
+    }
+
+
+def describe(values) -> Dict[str, Any]:
+    return describe_array(to_float_array(values))
+
+
+def columns_to_arrays(rows: List[Dict[str, str]], columns: List[str]) -> Dict[str, "np.ndarray"]:
+    """Turn row dicts into one float64 array per column (NaN where missing)"""
+    require_numpy()
+    return {c: to_float_array([row.get(c, "") for row in rows], c) for c in columns}
@@ -13,6 +13,7 @@ import time
 # Import both sync and async versions
 from src.data_fetcher import iter_csv_records, async_read_csv_records
 from src.data_processor import summarize_columns, summarize_columns_parallel
+from src.executor import SummaryExecutor
 from src.data_store import FileStore
 from src.models import WeatherRecord, ResultSummary, ColumnStats
 
@@ -102,7 +103,7 @@ class TestParallelProcessing:
             assert abs(seq_stats.mean - par_stats.mean) < 0.001
             assert seq_stats.median == par_stats.median
             
-    def test_parallel_processing_uses_multiple_cores(self, capsys):
+    def test_parallel_processing_uses_multiple_cores(self, capsys, caplog):
         """Verify parallel processing that will use multiprocessing"""
         #test records
         test_data = [{'Col1': str(i), 'Col2': str(i*2)} for i in range(10)]
@@ -110,13 +111,13 @@ class TestParallelProcessing:
         columns = ['Col1', 'Col2']
         
         #parallel version
-        result = summarize_columns_parallel(records, columns)
+        with caplog.at_level("INFO"):
+            result = summarize_columns_parallel(records, columns)
         
-        #capture output
-        captured = capsys.readouterr()
-        
-        assert 'MULTIPROCESSING' in captured.out or 'Multiprocessing' in captured.out
-        assert 'CPU cores' in captured.out or 'cores' in captured.out
+        #progress goes to the log, not stdout
+        assert capsys.readouterr().out == ""
+        assert 'Multiprocessing' in caplog.text
+        assert 'CPU cores' in caplog.text
         
         #processed both columns
         assert len(result.stats_by_column) == 2
@@ -185,6 +186,20 @@ class TestExecutionModes:
         
         elapsed = asyncio.run(test_concurrent())
         assert elapsed < 0.2
-        
+
+
+def test_parallel_chunks_merge_to_exact_order_statistics():
+    """Row chunks summarized in separate workers still give exact median and mode"""
+    rows = [{'A': str(i % 7), 'B': '' if i % 3 else str(i)} for i in range(101)]
+    records = [WeatherRecord(row=row) for row in rows]
+    sequential = summarize_columns(records, ['A', 'B'])
+    with SummaryExecutor(workers=3) as executor:
+        parallel = summarize_columns_parallel(records, ['A', 'B'], executor)
+    for col in ('A', 'B'):
+        seq, par = sequential.stats_by_column[col], parallel.stats_by_column[col]
+        assert (par.count, par.median, par.mode, par.data_range) == (seq.count, seq.median, seq.mode, seq.data_range)
+        assert par.mean == pytest.approx(seq.mean)
+
+
 if __name__ == "__main__":
-    pytest.main([__file__, "-v"])
\ No newline at end of file
+    pytest.main([__file__, "-v"])
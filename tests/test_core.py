@@ -43,4 +43,84 @@ def test_data_range_basic():
 
 def test_data_range_empty_raises():
     with pytest.raises(ValueError):
-        data_range([])
\ No newline at end of file
+        data_range([])
+
+#--------------------------------------Testing the Streaming Accumulator--------------------------------------------------
+from src.core import StreamingStats, describe, describe_partial
+
+def test_describe_streams_generators():
+    result = describe(x for x in [10, 20, 20, 30, 40, 50])
+    assert result["count"] == 6
+    assert result["mean"] == pytest.approx(mean([10, 20, 20, 30, 40, 50]))
+    assert result["median"] == 25
+    assert result["mode"] == 20
+    assert result["data_range"] == 40
+
+def test_describe_generator_memory_is_bounded():
+    import tracemalloc
+    tracemalloc.start()
+    try:
+        result = describe(float(i % 100) for i in range(300_000))
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert result["count"] == 300_000
+    assert result["median"] == 49.5
+    # a list of every value would need about 10 MB
+    assert peak < 2_000_000
+
+def test_describe_empty():
+    assert describe([]) == {'mean': None, 'median': None, 'mode': None, 'data_range': None, 'count': 0}
+
+def test_partials_merge_to_whole():
+    values = [3.5, 1.0, 2.0, 2.0, 9.0, 4.5, 1.0, 2.0]
+    left = describe_partial(values[:3])
+    right = describe_partial(values[3:])
+    merged = left.merge(right)
+    assert merged.describe()["median"] == median(values)
+    assert merged.mode() == mode(values)
+    assert merged.mean() == pytest.approx(mean(values))
+    assert merged.data_range() == data_range(values)
+
+def test_streaming_state_roundtrip():
+    acc = describe_partial([1.0, 2.0, 2.0])
+    restored = StreamingStats.from_state(acc.to_state())
+    assert restored.describe() == acc.describe()
+
+
+#--------------------------------------Testing the Order Statistics--------------------------------------------------
+from src.core import OrderStatistics
+
+def test_order_statistics_single_sort():
+    order = OrderStatistics([5.0, 1.0, 3.0, 3.0, 9.0, 1.0])
+    assert order.values == [1.0, 1.0, 3.0, 3.0, 5.0, 9.0]
+    assert order.median() == median([5.0, 1.0, 3.0, 3.0, 9.0, 1.0])
+    assert order.mode() == 1.0   # ties go to the smallest value
+    assert order.data_range() == 8.0
+    assert order.quantile(0.0) == 1.0
+    assert order.quantile(1.0) == 9.0
+    assert order.quantile(0.5) == order.median()
+
+def test_order_statistics_empty():
+    order = OrderStatistics([])
+    assert order.median() is None and order.mode() is None and order.data_range() is None
+
+def test_order_statistics_leaves_input_unsorted():
+    values = [3.0, 1.0, 2.0]
+    assert OrderStatistics(values).median() == 2.0
+    assert values == [3.0, 1.0, 2.0]
+
+
+def test_rolling_window_matches_brute_force():
+    from src.core import RollingWindow
+    import random
+    rng = random.Random(7)
+    data = [None if rng.random() < 0.2 else rng.randint(-20, 40) / 2 for _ in range(300)]
+    win = RollingWindow(7)
+    for i, x in enumerate(data):
+        win.push(x)
+        present = [v for v in data[max(0, i - 6):i + 1] if v is not None]
+        assert win.count == len(present)
+        assert win.minimum() == (min(present) if present else None)
+        assert win.maximum() == (max(present) if present else None)
+        assert win.total == pytest.approx(sum(present))
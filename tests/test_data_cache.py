@@ -0,0 +1,52 @@
+import os, pickle
+from src.data_cache import ParsedCache
+from src.data_fetcher import CSVFetcher, iter_csv_records
+from src.models import WeatherTable
+
+
+def _write(path, body):
+    path.write_text("MaxTemp,RainToday\n" + body, encoding="utf-8")
+
+def test_cache_hit_memory_maps_same_table(tmp_path):
+    csv_path = tmp_path / "w.csv"
+    _write(csv_path, "30.5,No\n,Yes\n12,No\n")
+    cache = ParsedCache(tmp_path / "cache")
+    first = CSVFetcher(csv_path, cache=cache).fetch_table()
+    assert cache.load(csv_path) is not None
+
+    second = CSVFetcher(csv_path, cache=cache).fetch_table()
+    assert isinstance(second.column("MaxTemp").values, memoryview)
+    assert second.numeric_values("MaxTemp") == first.numeric_values("MaxTemp") == [30.5, 12.0]
+    assert [r.row["RainToday"] for r in second] == ["No", "Yes", "No"]
+    # cached tables still pickle for the multiprocessing paths
+    assert pickle.loads(pickle.dumps(second)).numeric_values("MaxTemp") == [30.5, 12.0]
+
+def test_cache_invalidates_when_source_changes(tmp_path):
+    csv_path = tmp_path / "w.csv"
+    _write(csv_path, "1,No\n")
+    cache = ParsedCache(tmp_path / "cache")
+    assert list(iter_csv_records(csv_path, cache=cache)) == [{"MaxTemp": "1", "RainToday": "No"}]
+
+    _write(csv_path, "1,No\n2,Yes\n")
+    os.utime(csv_path, ns=(1, 1))
+    assert cache.load(csv_path) is None
+    assert len(list(iter_csv_records(csv_path, cache=cache))) == 2
+
+def test_cache_keeps_source_text(tmp_path):
+    csv_path = tmp_path / "w.csv"
+    _write(csv_path, "10.0,No\nNA,Yes\n1,No\n")
+    cache = ParsedCache(tmp_path / "cache")
+    list(iter_csv_records(csv_path, cache=cache))
+    assert cache.load(csv_path) is not None
+    assert [r["MaxTemp"] for r in iter_csv_records(csv_path, cache=cache)] == ["10.0", "NA", "1"]
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = ParsedCache(tmp_path / "cache", max_bytes=1)
+    paths = []
+    for name in ("a.csv", "b.csv"):
+        p = tmp_path / name
+        _write(p, "1,No\n")
+        cache.store(p, WeatherTable.from_rows(iter_csv_records(p)))
+        paths.append(p)
+    assert cache.load(paths[0]) is None      # evicted to make room
+    assert cache.load(paths[1]) is not None  # newest entry is kept
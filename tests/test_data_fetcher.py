@@ -11,4 +11,176 @@ def test_iter_csv_records_reads_rows(tmp_path):
 def test_iter_csv_records_empty_okay(tmp_path):
     path = tmp_path / "empty.csv"
     path.write_text("A,B\n", encoding="utf-8")
-    assert list(iter_csv_records(path)) == []   
\ No newline at end of file
+    assert list(iter_csv_records(path)) == []   
+def test_csv_fetcher_fetch_table(tmp_path):
+    from src.data_fetcher import CSVFetcher
+    path = tmp_path / "demo.csv"
+    path.write_text("A,B\n1, x\n3,y\n", encoding="utf-8")
+    table = CSVFetcher(path).fetch_table()
+    assert len(table) == 2
+    assert table.numeric_values("A") == [1.0, 3.0]
+    assert [r.row["B"] for r in table] == ["x", "y"]
+
+#-----------------------Streaming async reader--------------------------------------------
+import asyncio
+from src.data_fetcher import aiter_csv_records, async_read_csv_records
+
+async def _collect(agen):
+    return [item async for item in agen]
+
+def test_aiter_csv_records_handles_quoted_newlines_across_chunks(tmp_path):
+    path = tmp_path / "quoted.csv"
+    path.write_text('A,Note\r\n1,"two\nlines, with comma"\r\n\r\n2, plain \r\n3,"say ""hi"""\r\n', encoding="utf-8")
+    expected = list(iter_csv_records(path))
+    for chunk_size in (1, 3, 7, 64):
+        rows = asyncio.run(_collect(aiter_csv_records(path, chunk_size=chunk_size)))
+        assert rows == expected
+    assert expected[0]["Note"] == "two\nlines, with comma"
+    assert len(expected) == 3
+
+def test_aiter_csv_records_batches(tmp_path):
+    path = tmp_path / "many.csv"
+    path.write_text("A\n" + "".join(f"{i}\n" for i in range(10)), encoding="utf-8")
+    batches = asyncio.run(_collect(aiter_csv_records(path, chunk_size=5, batch_size=4)))
+    assert [len(b) for b in batches] == [4, 4, 2]
+    assert asyncio.run(async_read_csv_records(path)) == [row for b in batches for row in b]
+
+def test_record_scan_resumes_quote_state_and_reports_real_lines(tmp_path, caplog):
+    from src.data_fetcher import _scan_records
+    text = 'A,"open\nstill open\n'
+    cut, quoted = _scan_records(text, 0, False)
+    assert (cut, quoted) == (0, True)
+    more = text + 'closed"\n2,x\n'
+    assert _scan_records(more, len(text), quoted) == (len(more), False)
+    assert _scan_records(more, 0, False) == (len(more), False)
+
+    path = tmp_path / "blank.csv"
+    path.write_text("A,B\n1,2\n\n\n,\n3,4\n", encoding="utf-8")
+    for read in (lambda: list(iter_csv_records(path)), lambda: list(iter_csv_records(path, columns=["A"])),
+                 lambda: asyncio.run(_collect(aiter_csv_records(path, chunk_size=4)))):
+        caplog.clear()
+        read()
+        assert "Skipping empty row at line 5" in caplog.text
+
+#-----------------------Parallel mmap ingest--------------------------------------------
+from src import data_fetcher
+
+def test_read_csv_table_parallel_matches_sequential(tmp_path, monkeypatch):
+    path = tmp_path / "wide.csv"
+    lines = ["Location,MaxTemp,Rainfall"] + [f"Loc{i % 3}, {i % 40}.5,{'' if i % 7 == 0 else i % 5}" for i in range(500)]
+    path.write_text("\n".join(lines) + "\n\n", encoding="utf-8")
+    monkeypatch.setattr(data_fetcher, "MIN_RANGE_BYTES", 100)
+    table = data_fetcher.read_csv_table_parallel(path, workers=3)
+    expected = data_fetcher.CSVFetcher(path).fetch_table()
+    assert len(table) == 500
+    assert table.numeric_values("MaxTemp") == expected.numeric_values("MaxTemp")
+    assert table.numeric_values("Rainfall") == expected.numeric_values("Rainfall")
+    assert [r.row["Location"] for r in table] == [r.row["Location"] for r in expected]
+
+def test_read_csv_table_parallel_workers_bounds_ranges(tmp_path, monkeypatch, caplog):
+    from src.executor import SummaryExecutor
+    path = tmp_path / "wide.csv"
+    path.write_text("A\n" + "".join(f"{i}\n" for i in range(500)), encoding="utf-8")
+    monkeypatch.setattr(data_fetcher, "MIN_RANGE_BYTES", 100)
+    with caplog.at_level("INFO"), SummaryExecutor(workers=2) as executor:
+        table = data_fetcher.read_csv_table_parallel(path, workers=5, executor=executor)
+    assert "in 2 byte ranges" in caplog.text
+    assert table.numeric_values("A") == [float(i) for i in range(500)]
+
+#-----------------------Column projection--------------------------------------------
+import pytest
+
+def test_iter_csv_records_projects_columns(tmp_path):
+    path = tmp_path / "wide.csv"
+    path.write_text("A,B,C,D\n1, 2 ,3,4\n,,,\n5,6\n", encoding="utf-8")
+    rows = list(iter_csv_records(path, columns=["C", "A"]))
+    assert rows == [{"C": "3", "A": "1"}, {"C": None, "A": "5"}]
+    asyncio_rows = asyncio.run(async_read_csv_records(path, columns=["C", "A"]))
+    assert asyncio_rows == rows
+
+def test_projection_rejects_unknown_columns(tmp_path):
+    path = tmp_path / "demo.csv"
+    path.write_text("A,B\n1,2\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        list(iter_csv_records(path, columns=["Z"]))
+
+def test_csv_fetcher_projection(tmp_path):
+    from src.data_fetcher import CSVFetcher
+    path = tmp_path / "demo.csv"
+    path.write_text("A,B,C\n1,x,3\n", encoding="utf-8")
+    assert CSVFetcher(path).fetch(columns=["B"])[0].row == {"B": "x"}
+    assert CSVFetcher(path).fetch_table(columns=["C"]).column_names == ["C"]
+
+#-----------------------Partitioned datasets--------------------------------------------
+from src.data_fetcher import DatasetFetcher
+from src.data_processor import summarize_columns
+
+def _write_partitions(tmp_path):
+    data = tmp_path / "stations"
+    data.mkdir()
+    (data / "a_sydney.csv").write_text("Location,MaxTemp\nSydney,20\nSydney,22\n", encoding="utf-8")
+    (data / "b_perth.csv").write_text("Location,MaxTemp\nPerth,30\nPerth,\nPerth,22\n", encoding="utf-8")
+    (data / "notes.txt").write_text("not a partition", encoding="utf-8")
+    return data
+
+@pytest.mark.parametrize("use_processes", [False, True])
+def test_dataset_fetcher_streams_partitions_in_order(tmp_path, use_processes):
+    data = _write_partitions(tmp_path)
+    fetcher = DatasetFetcher(data, max_workers=2, use_processes=use_processes)
+    assert [p.name for p in fetcher.partitions] == ["a_sydney.csv", "b_perth.csv"]
+    rows = list(fetcher.iter_records())
+    assert [r["Location"] for r in rows] == ["Sydney", "Sydney", "Perth", "Perth", "Perth"]
+    assert len(DatasetFetcher(str(data / "b_*.csv")).fetch()) == 3
+
+def test_dataset_summary_merges_partitions(tmp_path):
+    data = _write_partitions(tmp_path)
+    fetcher = DatasetFetcher(data, max_workers=2)
+    merged = fetcher.summarize(["MaxTemp"]).to_dict()["MaxTemp"]
+    combined = summarize_columns(list(fetcher.iter_records()), ["MaxTemp"]).to_dict()["MaxTemp"]
+    assert merged["count"] == combined["count"] == 4
+    assert merged["mean"] == pytest.approx(combined["mean"])
+    for key in ("median", "mode", "data_range"):
+        assert merged[key] == combined[key]
+
+def test_dataset_fetcher_runs_on_the_given_executor(tmp_path):
+    from src.executor import SummaryExecutor
+    data = _write_partitions(tmp_path)
+    with SummaryExecutor(workers=2) as executor:
+        fetcher = DatasetFetcher(data, executor=executor)
+        assert len(list(fetcher.iter_records())) == 5
+        assert fetcher.summarize(["MaxTemp"]).to_dict()["MaxTemp"]["count"] == 4
+        assert executor.running
+
+def test_dataset_fetcher_reads_compressed_partitions_and_projects(tmp_path):
+    import gzip
+    data = _write_partitions(tmp_path)
+    with gzip.open(data / "c_hobart.csv.gz", "wt", encoding="utf-8") as f:
+        f.write("Location,MaxTemp\nHobart,12\n")
+    fetcher = DatasetFetcher(data, max_workers=2, columns=["MaxTemp"])
+    assert [p.name for p in fetcher.partitions] == ["a_sydney.csv", "b_perth.csv", "c_hobart.csv.gz"]
+    assert list(fetcher.iter_records())[-1] == {"MaxTemp": "12"}
+    assert fetcher.summarize(["MaxTemp"]).to_dict()["MaxTemp"]["count"] == 5
+
+def test_dataset_fetcher_no_partitions(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        DatasetFetcher(tmp_path).partitions
+
+#-----------------------Compressed inputs--------------------------------------------
+import bz2, gzip, lzma
+from src.data_fetcher import detect_compression
+
+@pytest.mark.parametrize("kind,opener", [("gzip", gzip.open), ("bz2", bz2.open), ("xz", lzma.open)])
+def test_compressed_inputs_stream_into_parser(tmp_path, kind, opener):
+    body = "A,B\n" + "".join(f"{i},{'x' * (i % 5)}\n" for i in range(2000))
+    plain = tmp_path / "plain.csv"
+    plain.write_text(body, encoding="utf-8")
+    packed = tmp_path / f"packed.csv.{kind}"
+    with opener(packed, "wt", encoding="utf-8", newline="") as f:
+        f.write(body)
+
+    assert detect_compression(packed) == kind
+    assert detect_compression(plain) is None
+    expected = list(iter_csv_records(plain))
+    assert list(iter_csv_records(packed)) == expected
+    assert asyncio.run(async_read_csv_records(packed)) == expected
+    assert data_fetcher.read_csv_table_parallel(packed).numeric_values("A") == [float(i) for i in range(2000)]
@@ -121,3 +121,107 @@ def test_summarize_columns_all_blank_becomes_none():
         "mode": None,
         "range": None,
     }
+
+def test_summarize_columns_accepts_weather_table():
+    from src.models import WeatherTable
+    rows = [{"X": "1", "Y": "a"}, {"X": "2", "Y": "3"}, {"X": "", "Y": "b"}, {"X": "2", "Y": "4"}]
+    table = WeatherTable.from_rows(rows)
+    from_table = _col_mapping(_summarize_columns(table, ["X", "Y"]))
+    from_rows = _col_mapping(_summarize_columns(rows, ["X", "Y"]))
+    for col in ("X", "Y"):
+        assert _to_plain_stats(from_table[col]) == _to_plain_stats(from_rows[col])
+
+def test_collect_columns_matches_per_column_iterator():
+    from src.data_processor import _collect_columns
+    dict_rows = [{"X": "1", "Y": "n/a"}, {"X": "", "Y": "2.5"}, {"X": "3", "Y": "nan"}]
+    seq_rows = [["X", "Y"], ["1", "4"], ["x", "5"], ["2"]]
+    for rows, cols in ((dict_rows, ["X", "Y"]), (seq_rows, ["X", "Y", 1]), ([1, "2", None], ["a", "b"])):
+        collected = _collect_columns(iter(rows), cols)
+        for col in cols:
+            assert collected[col] == list(NumericColumnIterator(rows, col))
+
+def _group_rows_fixture():
+    return [
+        {"Location": "Albury", "RainToday": "No", "MaxTemp": "20", "Rainfall": "0"},
+        {"Location": "Albury", "RainToday": "Yes", "MaxTemp": "18", "Rainfall": "4.2"},
+        {"Location": "Sydney", "RainToday": "No", "MaxTemp": "25", "Rainfall": ""},
+        {"Location": "Albury", "RainToday": "No", "MaxTemp": "22", "Rainfall": "0"},
+        {"Location": "Sydney", "RainToday": "Yes", "MaxTemp": "NA", "Rainfall": "12"},
+    ]
+
+def test_summarize_groups_matches_filtered_summaries():
+    from src.data_processor import summarize_groups
+    rows = _group_rows_fixture()
+    grouped = summarize_groups(rows, "Location", ["MaxTemp", "Rainfall"], chunk_rows=2)
+    assert list(grouped.groups) == [("Albury",), ("Sydney",)]
+    for loc in ("Albury", "Sydney"):
+        expected = _summarize_columns([r for r in rows if r["Location"] == loc], ["MaxTemp", "Rainfall"])
+        for col in ("MaxTemp", "Rainfall"):
+            got, want = _to_plain_stats(grouped.get(loc).stats_by_column[col]), _to_plain_stats(expected.stats_by_column[col])
+            assert got.pop("mean") == pytest.approx(want.pop("mean"))
+            assert got == want
+
+def test_summarize_groups_multi_key_spill_and_parallel_agree():
+    from src.data_processor import summarize_groups
+    rows = _group_rows_fixture() * 3
+    serial = summarize_groups(rows, ["Location", "RainToday"], ["MaxTemp"])
+    spilled = summarize_groups(rows, ["Location", "RainToday"], ["MaxTemp"], chunk_rows=1, spill_limit=1)
+    parallel = summarize_groups(rows, ["Location", "RainToday"], ["MaxTemp"], chunk_rows=4, parallel=True)
+    assert len(serial) == 4
+    assert serial.to_dict() == spilled.to_dict() == parallel.to_dict()
+    assert serial.get("Albury", "No").stats_by_column["MaxTemp"].count == 6
+    assert serial.to_dict()["groups"][0]["key"] == {"Location": "Albury", "RainToday": "No"}
+
+def test_numeric_iterator_batches_keep_one_slot_per_row():
+    rows = [{"X": str(i)} if i % 4 else {"X": "n/a"} for i in range(10)]
+    batches = list(NumericColumnIterator(rows, "X").batches(size=4))
+    assert [len(b) for b in batches] == [4, 4, 2]
+    assert [list(b.nulls) for b in batches] == [[1, 0, 0, 0], [1, 0, 0, 0], [1, 0]]
+    present = [v for b in batches for v in b.present()]
+    assert present == list(NumericColumnIterator(rows, "X"))
+
+    seq_rows = [["X", "Y"], ["1,000", "2"], [" 3 ", "nan"]]
+    (batch,) = NumericColumnIterator(seq_rows, "X").batches()
+    assert batch.present() == [1000.0, 3.0]
+
+def test_rolling_stats_per_location_match_sliced_windows():
+    from src.data_processor import rolling_stats
+    rows = _group_rows_fixture() * 4
+    results = list(rolling_stats(rows, ["MaxTemp", "Rainfall"], 3))
+    assert len(results) == len(rows)
+    for i, (key, stats) in enumerate(results):
+        assert key == rows[i]["Location"].strip()
+        window = [r for r in rows[:i + 1] if r["Location"].strip() == key][-3:]
+        expected = _summarize_columns(window, ["MaxTemp", "Rainfall"])
+        for col in ("MaxTemp", "Rainfall"):
+            got, want = stats[col], expected.stats_by_column[col]
+            assert got.count == want.count
+            assert got.data_range == want.data_range
+            assert got.mean == pytest.approx(want.mean)
+            assert got.median is None and got.mode is None
+    assert results[-1][1]["MaxTemp"].asdict().keys() >= {"minimum", "maximum", "total"}
+
+def test_correlation_matrix_handles_missing_pairwise():
+    import statistics
+    from src.data_processor import correlation_matrix, partial_comoments, comoments_matrix
+    from src.models import WeatherTable
+    rows = [
+        {"A": str(a), "B": b, "C": str(c)}
+        for a, b, c in zip(range(40), [str(i * 1.5 % 7) if i % 5 else "NA" for i in range(40)], [i % 3 for i in range(40)])
+    ]
+    m = correlation_matrix(rows, ["A", "B", "C"], batch_rows=7)
+    both = [(float(r["A"]), float(r["B"])) for r in rows if r["B"] != "NA"]
+    xs, ys = zip(*both)
+    assert m.counts[0][1] == m.counts[1][0] == len(both)
+    assert m.counts[0][0] == 40
+    assert m.get("A", "B") == pytest.approx(statistics.correlation(xs, ys))
+    assert m.covariance[0][1] == pytest.approx(statistics.covariance(xs, ys))
+    assert m.covariance[0][0] == pytest.approx(statistics.variance(range(40)))
+    assert m.get("A", "A") == pytest.approx(1.0)
+
+    merged = partial_comoments(rows[:13], ["A", "B", "C"]).merge(partial_comoments(rows[13:], ["A", "B", "C"]))
+    table = WeatherTable.from_rows(rows)
+    for other in (comoments_matrix(merged), correlation_matrix(table, ["A", "B", "C"], parallel=True, batch_rows=9)):
+        assert other.counts == m.counts
+        for got, want in zip(other.correlation, m.correlation):
+            assert got == pytest.approx(want)
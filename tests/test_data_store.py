@@ -11,4 +11,88 @@ def test_filestore_writes_json(tmp_path):
     out_path = store.save_summary(summary)
     assert out_path.exists()
     payload = json.loads(out_path.read_text())
-    assert "A" in payload and payload["A"]["count"] == 2
\ No newline at end of file
+    assert "A" in payload and payload["A"]["count"] == 2
+
+
+#-------------------------Incremental state-------------------------------
+import pytest
+from src.data_processor import summarize_incremental, summarize_columns
+from src.data_fetcher import iter_csv_records
+
+
+def _write(path, rows, mode="w"):
+    with path.open(mode, encoding="utf-8", newline="") as f:
+        if mode == "w":
+            f.write("A,B\n")
+        for a, b in rows:
+            f.write(f"{a},{b}\n")
+
+
+def test_incremental_folds_only_the_appended_tail(tmp_path, caplog):
+    csv_path = tmp_path / "w.csv"
+    _write(csv_path, [(i, i % 3) for i in range(50)])
+    store = FileStore(tmp_path / "out")
+    summarize_incremental(csv_path, store)
+    assert store.state_file.exists()
+
+    _write(csv_path, [(i, "") for i in range(50, 80)], mode="a")
+    # a last line without a line break is counted but re-read on the next run
+    with csv_path.open("a", encoding="utf-8") as f:
+        f.write("999")
+    with caplog.at_level("INFO"):
+        summary = summarize_incremental(csv_path, store)
+    assert "Folded 30 new rows" in caplog.text
+    _assert_matches_full(summary, csv_path)
+
+    # once the line is finished it is folded in exactly once
+    with csv_path.open("a", encoding="utf-8") as f:
+        f.write(",1\n")
+    caplog.clear()
+    with caplog.at_level("INFO"):
+        summary = summarize_incremental(csv_path, store)
+    assert "Folded 1 new rows" in caplog.text
+    _assert_matches_full(summary, csv_path)
+
+
+def _assert_matches_full(summary, csv_path):
+    full = summarize_columns(iter_csv_records(csv_path), ["A", "B"])
+    for col in ("A", "B"):
+        got, want = summary.stats_by_column[col], full.stats_by_column[col]
+        assert (got.count, got.median, got.mode, got.data_range) == (want.count, want.median, want.mode, want.data_range)
+        assert got.mean == pytest.approx(want.mean)
+
+
+def test_incremental_reads_the_tail_in_chunks(tmp_path):
+    from src.data_fetcher import read_csv_tail
+    csv_path = tmp_path / "q.csv"
+    csv_path.write_text('A,B\n1,"two\nlines"\n2,é\n3,"open', encoding="utf-8")
+    header, chunks = read_csv_tail(csv_path, chunk_size=5)
+    chunks = list(chunks)
+    assert header == ["A", "B"]
+    assert [row for rows, _ in chunks for row in rows] == [{"A": "1", "B": "two\nlines"}, {"A": "2", "B": "é"}]
+    # the open quoted field is not consumed
+    assert chunks[-1][1] == len('A,B\n1,"two\nlines"\n2,é\n'.encode("utf-8"))
+
+
+def test_incremental_rebuilds_when_the_prefix_changed(tmp_path):
+    csv_path = tmp_path / "w.csv"
+    _write(csv_path, [(1, 1), (2, 2)])
+    store = FileStore(tmp_path / "out")
+    assert summarize_incremental(csv_path, store, sketch=True).stats_by_column["A"].count == 2
+    _write(csv_path, [(5, 5), (6, 6), (7, 7)])  # rewritten, not appended
+    summary = summarize_incremental(csv_path, store, sketch=True)
+    assert summary.stats_by_column["A"].count == 3
+    assert summary.stats_by_column["A"].median == 6
+    assert store.load_state()["kind"] == "sketch"
+
+
+def test_filestore_saves_correlation_matrix(tmp_path):
+    from src.data_processor import correlation_matrix
+    store = FileStore(tmp_path / "summary.json")
+    rows = [{"A": "1", "B": "2"}, {"A": "2", "B": "4"}, {"A": "3", "B": ""}]
+    out = store.save_correlation(correlation_matrix(rows, ["A", "B"]))
+    assert out.name == "summary.correlation.json"
+    payload = json.loads(out.read_text())
+    assert payload["columns"] == ["A", "B"]
+    assert payload["counts"] == [[3, 2], [2, 2]]
+    assert payload["correlation"][0][1] == pytest.approx(1.0)
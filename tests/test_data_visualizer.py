@@ -130,3 +130,22 @@ def test_missing_data_handling():
     temps = extract_max_temps(records_with_missing)
     assert temps[0] == 0.0
     assert temps[1] == 25.0
+    odd = [WeatherRecord(row={'MaxTemp': '1,200'}), WeatherRecord(row={'MaxTemp': 'nan'})]
+    assert extract_max_temps(odd) == [1200.0, 0.0]
+    assert filter_hot_days(odd) == odd[:1]
+
+def test_analysis_view_matches_filters_and_extractors(sample_records):
+    from src.data_visualizer import AnalysisView
+    from src.models import WeatherTable
+    records = sample_records + [
+        WeatherRecord(row={'MaxTemp': 'NA', 'MinTemp': '', "Rainfall": '', 'RainToday': ' Yes '}),
+    ]
+    for source in (records, WeatherTable.from_rows(r.row for r in records)):
+        view = AnalysisView(source)
+        assert len(view) == 6
+        assert view.select(view.max_temps) == extract_max_temps(records)
+        assert view.select(view.min_temps) == extract_min_temps(records)
+        assert view.select(view.max_temps, view.hot) == extract_max_temps(filter_hot_days(records))
+        assert view.select(view.max_temps, view.cold) == extract_max_temps(filter_cold_days(records))
+        assert view.select(view.rainfall, view.rainy) == extract_rainfall(filter_rainy_days(records))
+        assert view.select(view.max_temps, view.dry) == extract_max_temps(filter_dry_days(records))
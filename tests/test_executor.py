@@ -0,0 +1,94 @@
+import os
+import time
+
+import pytest
+
+from src.executor import SummaryExecutor, CostModel, default_executor, default_workers
+from src.data_processor import summarize_columns, summarize_columns_parallel, summarize_auto
+from src.models import WeatherRecord
+
+
+def test_pool_is_reused_across_calls():
+    with SummaryExecutor(workers=2) as executor:
+        first = executor.starmap(os.getpid, [()] * 8)
+        second = executor.starmap(os.getpid, [()] * 8)
+        # A fresh pool per call would show new worker pids
+        assert len(set(first) | set(second)) <= 2
+        assert executor.running
+    assert not executor.running
+
+
+def test_timeout_raises_and_pool_restarts():
+    executor = SummaryExecutor(workers=1)
+    try:
+        with pytest.raises(TimeoutError):
+            executor.apply(time.sleep, (5,), timeout=0.2)
+        assert not executor.running
+        assert executor.apply(abs, (-3,)) == 3
+    finally:
+        executor.close()
+
+
+def test_lazy_starmaps_pull_tasks_in_a_bounded_window():
+    pulled = []
+
+    def tasks():
+        for i in range(10):
+            pulled.append(i)
+            yield (-i,)
+
+    with SummaryExecutor(workers=1) as executor:
+        results = executor.starmap_unordered(abs, tasks(), window=2)
+        first = next(results)
+        assert len(pulled) == 2
+        assert sorted([first, *results]) == list(range(10))
+        with pytest.raises(TypeError):
+            list(executor.starmap_unordered(abs, [("x",)]))
+        pulled.clear()
+        ordered = executor.istarmap(abs, tasks(), window=3)
+        assert next(ordered) == 0
+        assert len(pulled) == 4  # the finished task's slot is refilled before it is yielded
+        assert list(ordered) == list(range(1, 10))
+
+
+def test_default_executor_is_shared_and_sized_from_cpu_count():
+    assert default_executor() is default_executor()
+    assert default_executor().workers == default_workers()
+    with pytest.raises(ValueError):
+        SummaryExecutor(workers=0)
+
+
+def test_summarize_columns_parallel_accepts_executor():
+    records = [WeatherRecord(row={'A': str(i)}) for i in range(20)]
+    with SummaryExecutor(workers=3) as executor:
+        summary = summarize_columns_parallel(records, ['A'], executor)
+        again = summarize_columns_parallel(records, ['A'], executor)
+    assert summary.stats_by_column['A'].count == again.stats_by_column['A'].count == 20
+    assert summary.stats_by_column['A'].median == 9.5
+
+
+def test_cost_model_picks_serial_for_small_data_and_processes_for_large():
+    model = CostModel(value_cost=1e-6, thread_efficiency=0.0)
+    assert model.choose(1_000, 3, cores=8).kind == "serial"
+    big = model.choose(50_000_000, 3, cores=8)
+    assert (big.kind, big.workers) == ("process", 7)
+    # Without the GIL, threads win over a cold process pool for mid-sized work
+    assert CostModel(value_cost=1e-6, thread_efficiency=1.0).choose(200_000, 4, cores=4).kind == "thread"
+    assert model.choose(50_000_000, 3, cores=1).kind == "serial"
+
+
+@pytest.mark.parametrize("model, kind", [
+    (CostModel(value_cost=0.0), "serial"),
+    (CostModel(value_cost=1.0, thread_efficiency=1.0, process_startup=1e9), "thread"),
+    (CostModel(value_cost=1.0, process_startup=0.0), "process"),
+])
+def test_summarize_auto_matches_summarize_columns_on_every_plan(model, kind, caplog):
+    records = [WeatherRecord(row={'A': str(i % 7), 'B': str(i * 0.5), 'C': ''}) for i in range(300)]
+    expected = summarize_columns(records, ['A', 'B', 'C']).to_dict()
+    with caplog.at_level("INFO"), SummaryExecutor(workers=2) as executor:
+        got = summarize_auto(records, ['A', 'B', 'C'], executor=executor, cost_model=model, cores=4).to_dict()
+    assert f"with plan {kind} x" in caplog.text
+    assert got.keys() == expected.keys()
+    for col in expected:
+        assert got[col].pop('mean') == pytest.approx(expected[col].pop('mean'))
+        assert got[col] == expected[col]
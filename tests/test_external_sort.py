@@ -0,0 +1,46 @@
+import random
+
+import pytest
+
+from src.core import OrderStatistics
+from src.external_sort import ExternalSorter
+from src.data_processor import StatsProcessor, summarize_columns
+from src.models import WeatherRecord
+
+
+def test_external_sorter_matches_in_memory_sort(tmp_path):
+    rng = random.Random(3)
+    values = [rng.randint(0, 400) / 4 for _ in range(5000)]
+    with ExternalSorter(memory_limit=40 * 300, tmp_dir=str(tmp_path)) as sorter:
+        for i in range(0, len(values), 700):
+            sorter.update_many(values[i:i + 700])
+        assert sorter.spilled == 16
+        assert list(sorter) == sorted(values)
+        desc = sorter.describe([0.05, 0.5, 0.99])
+    order = OrderStatistics(values)
+    assert desc['count'] == 5000
+    assert desc['median'] == order.median()
+    assert desc['mode'] == order.mode()
+    assert desc['data_range'] == order.data_range()
+    assert desc['percentiles'] == {q: order.quantile(q) for q in (0.05, 0.5, 0.99)}
+    assert desc['mean'] == pytest.approx(sum(values) / len(values))
+
+
+def test_memory_limited_summary_equals_exact_summary():
+    rng = random.Random(11)
+    rows = [{"A": str(rng.randint(0, 50)), "B": "" if i % 3 else f"{rng.random():.3f}"} for i in range(999)]
+    exact = summarize_columns(rows, ["A", "B"], percentiles=[0.25, 0.75])
+    capped = summarize_columns(rows, ["A", "B"], percentiles=[0.25, 0.75], memory_limit=4000)
+    assert capped.to_dict() == exact.to_dict()
+
+    records = [WeatherRecord(row=r) for r in rows]
+    proc = StatsProcessor(columns=["A", "B"], percentiles=[0.25, 0.75], memory_limit=4000)
+    assert proc.summarize(records).to_dict() == exact.to_dict()
+
+
+def test_empty_and_single_value_columns():
+    sorter = ExternalSorter(memory_limit=40)
+    assert sorter.describe()['count'] == 0
+    sorter.update_many([2.5])
+    assert sorter.describe([0.9])['percentiles'] == {0.9: 2.5}
+    sorter.close()
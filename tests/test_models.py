@@ -13,4 +13,49 @@ def test_models_to_dict_with_none_values():
     summary = ResultSummary(stats_by_column={"Empty": stats})
     d = summary.to_dict()
     assert d["Empty"]["count"] == 0
-    assert d["Empty"]["mean"] is None    
\ No newline at end of file
+    assert d["Empty"]["mean"] is None    
+
+#-------------------------Columnar table-------------------------------
+from src.models import WeatherRecord, WeatherTable, NumericColumn, StringColumn
+
+def _table():
+    return WeatherTable.from_rows([
+        {"MaxTemp": "30.0", "Rainfall": "", "RainToday": "No"},
+        WeatherRecord(row={"MaxTemp": "10", "Rainfall": "5.5", "RainToday": "Yes"}),
+        {"MaxTemp": "NA", "Rainfall": "1,200", "RainToday": "No"},
+    ])
+
+def test_table_parses_each_column_once_into_types():
+    table = _table()
+    assert len(table) == 3
+    assert isinstance(table.column("MaxTemp"), NumericColumn)
+    assert isinstance(table.column("RainToday"), StringColumn)
+    assert table.column("RainToday").categories == ["No", "Yes"]
+    assert table.numeric_values("MaxTemp") == [30.0, 10.0]
+    assert table.numeric_values("Rainfall") == [5.5, 1200.0]
+    assert table.numeric_values("Missing") == []
+
+def test_table_row_view_is_backward_compatible():
+    records = list(_table())
+    assert all(isinstance(r, WeatherRecord) for r in records)
+    assert records[1].row.get("MaxTemp", "") == "10"
+    assert records[2].row["MaxTemp"] == "NA"
+    assert records[2].row["Rainfall"] == "1,200"
+    assert records[1].row.get("RainToday", "").strip() == "Yes"
+    assert dict(records[0].row) == {"MaxTemp": "30.0", "Rainfall": "", "RainToday": "No"}
+
+def test_numeric_columns_keep_only_the_text_they_cannot_render():
+    table = _table()
+    assert table.column("MaxTemp").raw == {0: "30.0", 2: "NA"}
+    assert table.column("Rainfall").raw == {2: "1,200"}
+    # A word after numeric rows turns the column into text without losing them
+    mixed = WeatherTable.from_rows([{"A": "1"}, {"A": "2.50"}, {"A": ""}, {"A": "n/a"}])
+    assert isinstance(mixed.column("A"), StringColumn)
+    assert [r.row["A"] for r in mixed] == ["1", "2.50", "", "n/a"]
+
+def test_concat_mixed_kinds_keeps_numeric_text():
+    numeric = WeatherTable.from_rows([{"A": "10"}, {"A": "2.50"}, {"A": "10"}])
+    text = WeatherTable.from_rows([{"A": "windy"}, {"A": "10"}])
+    merged = WeatherTable.concat([numeric, text])
+    assert [r.row["A"] for r in merged] == ["10", "2.50", "10", "windy", "10"]
+    assert merged.column("A").categories == ["10", "2.50", "windy"]
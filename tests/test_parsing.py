@@ -0,0 +1,36 @@
+from src.parsing import ColumnParser, parse_number, parser_for, parse_stats, reset_parsers
+
+
+def test_parse_number_rules():
+    assert parse_number(" 12.5 ") == 12.5
+    assert parse_number("1,024") == 1024.0
+    assert parse_number(3) == 3.0
+    for missing in ("", "NA", "nan", " Null ", "NaN", "windy", None):
+        assert parse_number(missing) is None
+
+
+def test_parse_many_memoizes_repeated_strings():
+    parser = ColumnParser("MinTemp")
+    values, nulls = parser.parse_many(["12.5", "NA", "12.5", "3", "12.5", ""])
+    assert list(values) == [12.5, 0.0, 12.5, 3.0, 12.5, 0.0]
+    assert list(nulls) == [0, 1, 0, 0, 0, 1]
+    assert parser.calls == 6
+    assert parser.misses == 4
+    assert parser.hit_rate == 2 / 6
+
+
+def test_memo_is_bounded():
+    parser = ColumnParser("Rainfall", max_size=2)
+    assert [parser.parse(str(i)) for i in range(5)] == [0.0, 1.0, 2.0, 3.0, 4.0]
+    assert parser.stats()["memo_size"] == 2
+    assert parser.parse("4") == 4.0
+
+
+def test_shared_parsers_report_stats():
+    reset_parsers()
+    assert parser_for("MaxTemp") is parser_for("MaxTemp")
+    parser_for("MaxTemp").parse_many(["30", "30"])
+    parser_for("Unused")
+    stats = parse_stats()
+    assert list(stats) == ["MaxTemp"]
+    assert stats["MaxTemp"]["hits"] == 1
@@ -0,0 +1,79 @@
+import pytest
+
+from src import data_fetcher
+from src.query import Expr, Query, col
+from src.models import WeatherRecord
+
+CSV = (
+    "Location,MaxTemp,MinTemp,Rainfall,RainToday,Pressure9am\n"
+    "Albury,30.5,20,0,No,1010\n"
+    "Albury,12,5,5.5,Yes,1012\n"
+    "Sydney,27,18,,No,1008\n"
+    "Sydney,NA,10,12.3,Yes,1001\n"
+    "Perth,33,21,0,No,1015\n"
+)
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "w.csv"
+    path.write_text(CSV, encoding="utf-8")
+    return path
+
+
+def test_where_and_select_are_fused_and_pushed_into_the_scan(csv_path, monkeypatch):
+    calls = []
+    real = data_fetcher.iter_csv_records
+
+    def spy(path, **kwargs):
+        calls.append(kwargs)
+        return real(path, **kwargs)
+
+    monkeypatch.setattr("src.query.iter_csv_records", spy)
+    q = Query.from_csv(csv_path).where(col("MaxTemp") > 25).select("Location").where(col("RainToday") == "No")
+    assert calls == []  # nothing runs until collect
+    assert q.collect() == [{"Location": "Albury"}, {"Location": "Sydney"}, {"Location": "Perth"}]
+    assert calls[0]["columns"] == ["Location", "MaxTemp", "RainToday"]
+    assert calls[0]["where"] is not None
+    plan = q.explain()
+    assert "columns=[Location, MaxTemp, RainToday]" in plan
+    assert "(MaxTemp > 25) AND (RainToday == 'No') (pushed into scan)" in plan
+
+
+def test_group_by_agg(csv_path):
+    rows = (Query.from_csv(csv_path)
+            .where(col("Pressure9am").between(1005, 1013))
+            .group_by("Location")
+            .agg(n=("MaxTemp", "count"), hottest=("MaxTemp", "max"), rain=("Rainfall", "sum"))
+            .collect())
+    assert rows == [
+        {"Location": "Albury", "n": 2, "hottest": 30.5, "rain": 5.5},
+        {"Location": "Sydney", "n": 1, "hottest": 27.0, "rain": 0.0},
+    ]
+    with pytest.raises(ValueError):
+        Query.from_csv(csv_path).agg(x=("MaxTemp", "p42"))
+
+
+def test_in_memory_records_keep_their_type_and_python_predicates():
+    records = [WeatherRecord(row={"MaxTemp": t, "RainToday": r}) for t, r in [("30", "Yes"), ("", "No"), ("9", " Yes ")]]
+    rainy = Query(records).where(col("RainToday").isin(["Yes"])).records()
+    assert rainy == [records[0], records[2]]
+    assert Query(records).values("MaxTemp") == [30.0, 9.0]
+    assert Query(records).values("MaxTemp", default=0.0) == [30.0, 0.0, 9.0]
+    assert Query(records).where(lambda row: row["MaxTemp"] == "9").count() == 1
+    assert Query(records).where(~(col("MaxTemp") > 10) | (col("RainToday") == "No")).limit(1).records() == [records[1]]
+    with pytest.raises(TypeError):
+        Expr()
+
+
+def test_limit_keeps_its_place_among_the_steps():
+    rows = [{"A": str(i)} for i in range(10)]
+    assert Query(rows).limit(3).where(col("A") > 5).records() == []
+    assert Query(rows).where(col("A") > 5).limit(3).records() == rows[6:9]
+    assert Query(rows).limit(8).where(col("A") > 5).limit(1).records() == rows[6:7]
+    assert "Filter (A > 5) (after limit)" in Query(rows).limit(3).where(col("A") > 5).explain()
+    assert Query(rows).limit(4).agg(n=("A", "count")).collect() == [{"n": 4}]
+    with pytest.raises(ValueError):
+        Query(rows).group_by("A").collect()
+    with pytest.raises(ValueError):
+        Query(rows).agg(n=("A", "count")).where(col("A") > 5).collect()
@@ -0,0 +1,85 @@
+import random
+from bisect import bisect_left
+
+import pytest
+
+from src.sketches import KLLSketch, MisraGries, rank_error
+from src.data_processor import summarize_columns, StatsProcessor
+from src.models import WeatherRecord
+
+
+def _true_rank(sorted_vals, v):
+    return bisect_left(sorted_vals, v) / len(sorted_vals)
+
+
+def test_kll_small_input_is_exact():
+    sk = KLLSketch().update_many([5.0, 1.0, 3.0, 2.0])
+    assert sk.is_exact
+    assert sk.median() == 2.5
+    assert sk.quantile(0.0) == 1.0 and sk.quantile(1.0) == 5.0
+
+
+def test_kll_merged_chunks_stay_within_rank_error():
+    rng = random.Random(7)
+    data = [rng.expovariate(1.0) for _ in range(60_000)]
+    merged = KLLSketch(seed=1)
+    for i in range(0, len(data), 7_000):
+        merged.merge(KLLSketch(seed=i).update_many(data[i:i + 7_000]))
+    assert merged.count == len(data)
+    assert not merged.is_exact
+    assert sum(len(level) for level in merged.levels) < 4 * merged.k
+    ordered = sorted(data)
+    for q in (0.05, 0.5, 0.95, 0.99):
+        assert abs(_true_rank(ordered, merged.quantile(q)) - q) <= rank_error(merged.k)
+
+
+def test_kll_state_roundtrip():
+    sk = KLLSketch(k=50).update_many(range(1000))
+    again = KLLSketch.from_state(sk.to_state())
+    assert again.quantiles([0.1, 0.5, 0.9]) == sk.quantiles([0.1, 0.5, 0.9])
+
+
+def test_sketch_mode_flags_estimates_and_keeps_exact_moments():
+    rows = [{"X": str(i % 997), "Y": "1" if i < 3 else ""} for i in range(5_000)]
+    exact = summarize_columns(rows, ["X"]).stats_by_column["X"]
+    approx = summarize_columns(rows, ["X", "Y"], sketch=True).stats_by_column
+    x = approx["X"]
+    assert x.count == exact.count and x.data_range == exact.data_range
+    assert x.mean == pytest.approx(exact.mean)
+    # 997 distinct values overflow the heavy-hitter counters, so mode is an estimate too
+    assert x.approximate == ("median", "p5", "p95", "p99", "mode")
+    assert abs(x.median - exact.median) <= rank_error(200) * 997
+    # a tiny column never compacts, so nothing is marked approximate
+    assert approx["Y"].approximate == () and approx["Y"].percentiles["p99"] == 1.0
+    assert "approximate" in x.asdict() and "approximate" not in exact.asdict()
+
+
+def test_stats_processor_sketch_mode():
+    records = [WeatherRecord(row={"A": str(i), "B": ""}) for i in range(10)]
+    summary = StatsProcessor(sketch=True, percentiles=[0.5]).summarize(records)
+    assert list(summary.stats_by_column) == ["A"]
+    assert summary.stats_by_column["A"].percentiles == {"p50": 4.5}
+
+
+def test_misra_gries_keeps_heavy_hitters_within_bounds():
+    rng = random.Random(3)
+    data = [1.5] * 3_000 + [2.5] * 1_500 + [rng.random() for _ in range(10_000)]
+    rng.shuffle(data)
+    merged = MisraGries(capacity=16)
+    for i in range(0, len(data), 2_000):
+        merged.merge(MisraGries(capacity=16).update_many(data[i:i + 2_000]))
+    assert merged.max_error <= len(data) / 17
+    assert merged.mode() == 1.5
+    top = merged.top(2)
+    assert [t["value"] for t in top] == [1.5, 2.5]
+    assert top[0]["count_min"] <= 3_000 <= top[0]["count_max"]
+    assert len(merged.counters) <= 16
+
+
+def test_binned_mode_and_top_values_on_column_stats():
+    rows = [{"P": str(1010 + (i % 7) / 10)} for i in range(700)] + [{"P": "1020.0"}] * 50
+    stats = summarize_columns(rows, ["P"], sketch=True, top_k=2, bin_width=1.0).stats_by_column["P"]
+    assert stats.mode == 1010.0
+    assert stats.top_values[0] == {"value": 1010.0, "count_min": 700, "count_max": 700}
+    assert "mode" in stats.approximate  # binned counts describe bins, not exact values
+    assert stats.asdict()["top_values"][1]["value"] == 1020.0
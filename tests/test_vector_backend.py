@@ -0,0 +1,54 @@
+import pytest
+from src.core import describe
+from src.data_processor import StatsProcessor
+from src.models import WeatherRecord
+
+np = pytest.importorskip("numpy")
+from src import vector_backend
+
+
+def test_to_float_array_marks_missing_as_nan():
+    arr = vector_backend.to_float_array(["1.5", "", "abc", "2"])
+    assert arr.dtype == np.float64
+    assert list(vector_backend.missing_mask(arr)) == [False, True, True, False]
+
+@pytest.mark.parametrize("values", [
+    [10, 20, 20, 30, 40, 50],
+    [1.0, 1.0, 2.0, 2.0],
+    [7.5],
+])
+def test_numpy_describe_matches_python(values):
+    fast = describe(values, backend="numpy")
+    slow = describe(values)
+    assert fast["count"] == slow["count"]
+    assert fast["mean"] == pytest.approx(slow["mean"])
+    assert fast["median"] == slow["median"]
+    assert fast["mode"] == slow["mode"]
+    assert fast["data_range"] == slow["data_range"]
+
+def test_stats_processor_numpy_matches_python():
+    records = [
+        WeatherRecord(row={"A": "3", "B": "x", "C": "2.5"}),
+        WeatherRecord(row={"A": "1", "B": "", "C": "2.5"}),
+        WeatherRecord(row={"A": "1", "B": "y", "C": ""}),
+        WeatherRecord(row={"A": "3", "B": "z", "C": "4.0"}),
+    ]
+    slow = StatsProcessor().summarize(records).to_dict()
+    fast = StatsProcessor(backend="numpy").summarize(records).to_dict()
+    assert fast.keys() == slow.keys() == {"A", "C"}
+    for col in slow:
+        assert fast[col]["mean"] == pytest.approx(slow[col]["mean"])
+        for key in ("median", "mode", "data_range", "count"):
+            assert fast[col][key] == slow[col][key]
+
+def test_unknown_backend_rejected():
+    with pytest.raises(ValueError):
+        StatsProcessor(backend="gpu")
+
+def test_backends_parse_cells_the_same_way():
+    records = [WeatherRecord(row={"A": a}) for a in ("1,200", "3", "NA", "5", " null ", "4")]
+    slow = StatsProcessor().summarize(records).to_dict()["A"]
+    fast = StatsProcessor(backend="numpy").summarize(records).to_dict()["A"]
+    assert fast["count"] == slow["count"] == 4
+    assert fast["mean"] == pytest.approx(slow["mean"]) == 303.0
+    assert (fast["median"], fast["mode"], fast["data_range"]) == (slow["median"], slow["mode"], slow["data_range"])
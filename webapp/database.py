@@ -3,12 +3,22 @@ Module 9 Phase 9
 Load data from CSV into SQLite
 """
 
-import csv
+import os, sys
 from pathlib import Path
 from models import WeatherRecord, UserQuery, get_session, init_database
 
-# Path to the CSV file
-CSV_PATH = Path(__file__).parent.parent / "archive" / "Weather Training Data.csv"
+# Reuse the project's CSV reader from src/
+ROOT = Path(__file__).parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+from src.data_fetcher import DatasetFetcher
+from src.parsing import parser_for, log_parse_stats
+
+# Path to the CSV file (or a directory / glob of per-station or per-month CSVs)
+CSV_PATH = Path(os.environ.get("WEATHER_DATA", ROOT / "archive" / "Weather Training Data.csv"))
+
+# The only columns stored in the database; everything else is never parsed
+WEB_COLUMNS = ('Location', 'MinTemp', 'MaxTemp', 'Rainfall', 'RainToday')
 
 def load_weather_data(limit=1000):
     """ 
@@ -16,7 +26,10 @@ def load_weather_data(limit=1000):
     """
     print(f"Loading data from: {CSV_PATH}")
     
-    if not CSV_PATH.exists():
+    fetcher = DatasetFetcher(CSV_PATH, columns=WEB_COLUMNS)
+    try:
+        fetcher.partitions
+    except FileNotFoundError:
         print(f"❌ CSV file not found: {CSV_PATH}")
         return
     
@@ -32,36 +45,35 @@ def load_weather_data(limit=1000):
     
     # Read CSV and insert the records
     count = 0
+    min_temp, max_temp, rainfall = (parser_for(c).parse for c in ('MinTemp', 'MaxTemp', 'Rainfall'))
     
-    with open(CSV_PATH, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
+    for row in fetcher.iter_records():
+        if count >= limit:
+            break
         
-        for row in reader:
-            if count >= limit:
-                break
+        try:
+            # Create WeatherRecord from CSV row
+            record = WeatherRecord(
+                location=row.get('Location', ''),
+                min_temp=min_temp(row.get('MinTemp')),
+                max_temp=max_temp(row.get('MaxTemp')),
+                rainfall=rainfall(row.get('Rainfall')),
+                rain_today=row.get('RainToday', '')
+            )
             
-            try:
-                # Create WeatherRecord from CSV row
-                record = WeatherRecord(
-                    location=row.get('Location', ''),
-                    min_temp=float(row['MinTemp']) if row.get('MinTemp') else None,
-                    max_temp=float(row['MaxTemp']) if row.get('MaxTemp') else None,
-                    rainfall=float(row['Rainfall']) if row.get('Rainfall') else None,
-                    rain_today=row.get('RainToday', '')
-                )
-                
-                session.add(record)
-                count += 1
-                
-                if count % 100 == 0:
-                    print(f"   Loaded {count} records --->")
+            session.add(record)
+            count += 1
             
-            except (ValueError, KeyError) as e:
-                # skip over rows with bad data
-                continue
+            if count % 100 == 0:
+                print(f"   Loaded {count} records --->")
+        
+        except (ValueError, KeyError) as e:
+            # skip over rows with bad data
+            continue
     # save all records to database
     session.commit()
     session.close()
+    log_parse_stats()
     
     print(f"✅ Loaded {count} weather records into database")
 